@@ -0,0 +1,188 @@
+"""
+Activity Segments
+Run-length encoded view of activity_tracking_log.csv: consecutive samples
+with the same activity collapse into one segment (start, end, activity,
+samples, falls, max risk). Segments are derived incrementally from rows
+appended to the log and saved next to it (<log>.segments.npz), so the
+timeline and time-per-activity queries work on runs instead of samples.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tracking_log import TRACKING_LOG_PATH, LogTail
+
+# Tracker sampling period; a segment's end is its last sample plus one period
+SAMPLE_PERIOD = pd.Timedelta(milliseconds=100)
+# A gap longer than this between samples starts a new segment
+MAX_GAP = pd.Timedelta(seconds=5)
+
+RISK_LEVELS = ['Low', 'Medium', 'High']
+
+FIELDS = ['start_ns', 'last_ns', 'activity', 'samples', 'falls', 'max_risk']
+
+
+class SegmentStore:
+    """Activity runs of the tracking log, extended as the log grows"""
+
+    def __init__(self, log_path=TRACKING_LOG_PATH, segments_path=None):
+        self.log_path = log_path
+        self.segments_path = segments_path or f"{log_path}.segments.npz"
+        self._tail = LogTail(log_path)
+        self.version = 0
+        # Shared by every session of the process: refresh updates the tail and
+        # the run arrays under this lock, and readers take their snapshot under it
+        self._lock = threading.Lock()
+        self._clear()
+        self._load()
+
+    def _clear(self):
+        self.activities = []
+        self._activity_ids = {}
+        self.columns = {name: np.empty(0, dtype=np.int64) for name in FIELDS}
+
+    def __len__(self):
+        return len(self.columns['start_ns'])
+
+    def _load(self):
+        try:
+            saved = np.load(self.segments_path)
+            meta = json.loads(str(saved['meta']))
+            columns = {name: saved[name] for name in FIELDS}
+        except (OSError, KeyError, ValueError):
+            return
+        self._tail.offset = meta['offset']
+        self._tail.header = meta['header'].encode()
+        self._tail.identity = tuple(meta['identity'])
+        self.activities = meta['activities']
+        self._activity_ids = {name: i for i, name in enumerate(self.activities)}
+        self.columns = columns
+
+    def _save(self):
+        meta = {
+            'offset': self._tail.offset,
+            'header': self._tail.header.decode(),
+            'identity': list(self._tail.identity),
+            'activities': self.activities
+        }
+        tmp_path = f"{self.segments_path}.tmp.npz"
+        np.savez(tmp_path, meta=json.dumps(meta), **self.columns)
+        os.replace(tmp_path, self.segments_path)
+
+    def _activity_codes(self, values):
+        codes, names = pd.factorize(values)
+        mapping = np.empty(len(names), dtype=np.int64)
+        for i, name in enumerate(names):
+            if name not in self._activity_ids:
+                self._activity_ids[name] = len(self.activities)
+                self.activities.append(name)
+            mapping[i] = self._activity_ids[name]
+        return mapping[codes]
+
+    def _ingest(self, frame):
+        if frame.empty or "timestamp" not in frame.columns or "predicted_activity" not in frame.columns:
+            return
+        ts = frame["timestamp"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        activity = self._activity_codes(frame["predicted_activity"])
+        falls = frame["fall_detected"].to_numpy(dtype=np.int64) if "fall_detected" in frame.columns \
+            else np.zeros(len(frame), dtype=np.int64)
+        risk = np.full(len(frame), -1, dtype=np.int64)
+        if "risk_level" in frame.columns:
+            for level, name in enumerate(RISK_LEVELS):
+                risk[(frame["risk_level"] == name).to_numpy()] = level
+
+        # A new run starts where the activity changes or the stream has a gap
+        breaks = np.ones(len(frame), dtype=bool)
+        breaks[1:] = (activity[1:] != activity[:-1]) | (np.diff(ts) > MAX_GAP.value)
+        # The first run may continue the last stored segment
+        cols = self.columns
+        continues = bool(len(self)) and activity[0] == cols['activity'][-1] \
+            and ts[0] - cols['last_ns'][-1] <= MAX_GAP.value
+        breaks[0] = True
+
+        starts = np.flatnonzero(breaks)
+        ends = np.append(starts[1:], len(frame)) - 1
+        runs = {
+            'start_ns': ts[starts],
+            'last_ns': ts[ends],
+            'activity': activity[starts],
+            'samples': np.diff(np.append(starts, len(frame))),
+            'falls': np.add.reduceat(falls, starts),
+            'max_risk': np.maximum.reduceat(risk, starts)
+        }
+
+        if continues:
+            cols['last_ns'][-1] = runs['last_ns'][0]
+            cols['samples'][-1] += runs['samples'][0]
+            cols['falls'][-1] += runs['falls'][0]
+            cols['max_risk'][-1] = max(cols['max_risk'][-1], runs['max_risk'][0])
+            runs = {name: values[1:] for name, values in runs.items()}
+        self.columns = {name: np.concatenate([cols[name], runs[name]]) for name in FIELDS}
+
+    def refresh(self):
+        """Fold rows appended to the log into the segments; returns rows read"""
+        rows = 0
+        with self._lock:
+            while True:
+                frame, reset = self._tail.read_new()
+                if reset:
+                    self._clear()
+                if frame is None:
+                    break
+                self._ingest(frame)
+                rows += len(frame)
+            if rows:
+                self.version += 1
+                self._save()
+        return rows
+
+    def segments(self, start=None, end=None):
+        """
+        Segments overlapping [start, end) as a DataFrame, clipped to the
+        range; samples and falls of a clipped segment are kept whole
+        """
+        with self._lock:
+            cols = self.columns
+            seg_start = cols['start_ns']
+            seg_end = cols['last_ns'] + SAMPLE_PERIOD.value
+            lo, hi = 0, len(self)
+            if start is not None:
+                # Segments are in time order, so their ends are sorted too
+                lo = int(np.searchsorted(seg_end, pd.Timestamp(start).value, side='right'))
+            if end is not None:
+                hi = int(np.searchsorted(seg_start, pd.Timestamp(end).value, side='left'))
+            hi = max(lo, hi)
+            # _ingest extends the last segment in place, so copy the rows read here
+            runs = {name: values[lo:hi].copy() for name, values in cols.items()}
+            activities = np.array(self.activities, dtype=object)
+
+        clipped_start = runs['start_ns']
+        clipped_end = runs['last_ns'] + SAMPLE_PERIOD.value
+        if start is not None:
+            clipped_start = np.maximum(clipped_start, pd.Timestamp(start).value)
+        if end is not None:
+            clipped_end = np.minimum(clipped_end, pd.Timestamp(end).value)
+
+        risk_names = np.array(RISK_LEVELS + ['Unknown'], dtype=object)
+        return pd.DataFrame({
+            'start': pd.to_datetime(clipped_start),
+            'end': pd.to_datetime(clipped_end),
+            'activity': activities[runs['activity']],
+            'samples': runs['samples'],
+            'falls': runs['falls'],
+            'max_risk': risk_names[runs['max_risk']]
+        })
+
+    def time_per_activity(self, start=None, end=None):
+        """Time spent, segment count and share per activity over [start, end)"""
+        runs = self.segments(start, end)
+        if runs.empty:
+            return pd.DataFrame(columns=['seconds', 'segments', 'share'])
+        runs['seconds'] = (runs['end'] - runs['start']).dt.total_seconds()
+        spent = runs.groupby('activity').agg(seconds=('seconds', 'sum'), segments=('seconds', 'size'))
+        spent['share'] = spent['seconds'] / spent['seconds'].sum()
+        return spent.sort_values('seconds', ascending=False)
@@ -120,6 +120,29 @@ class SafetyAlertSystem:
         
         return alert
     
+    def generate_wellness_alert(self, activity, inactive_seconds, risk_score=0,
+                                motion_intensity=0.0, subject=None, sample_index=None):
+        """
+        Generate a WELLNESS alert for prolonged inactivity (see inactivity_monitor.py)
+        
+        Returns: dict with alert information
+        """
+        minutes = inactive_seconds / 60
+        who = f'Subject {subject}' if subject is not None else 'Subject'
+        alert = {
+            'timestamp': datetime.now().isoformat(),
+            'severity': 'INFO',
+            'alert_type': 'WELLNESS',
+            'activity': activity,
+            'risk_score': risk_score,
+            'motion_intensity': motion_intensity,
+            'message': f'🧘 WELLNESS: {who} inactive for {minutes:.1f} min ({activity})',
+            'action_required': 'Check in and encourage movement',
+            'sample_index': sample_index
+        }
+        self.current_session_alerts.append(alert)
+        return alert
+    
     def save_alert_to_log(self, alert):
         """Save alert to persistent log file"""
         if alert is None:
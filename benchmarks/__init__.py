@@ -0,0 +1,4 @@
+"""
+Benchmarks and measurement scripts
+Run from the repository root, e.g. `python -m benchmarks.float32_pipeline`.
+"""
@@ -0,0 +1,141 @@
+"""
+Model Cold-Start Benchmark
+Loads the activity model in fresh interpreter processes from the joblib
+pickle and from the memory-mapped forest artifact (forest_artifact.py),
+timing library imports, model load and the first prediction, and
+recording each process's resident and private (non-shared) memory.
+Also checks both formats predict the same labels.
+
+Usage: python -m benchmarks.cold_start [--model activity_model.pkl] [--json cold_start.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from dataset import find_dataset, load_har_dataset
+from forest_artifact import forest_artifact_path, load_forest, save_forest
+from model_registry import REGISTRY_DIR, ModelRegistry
+
+# Runs in a fresh interpreter; prints one JSON line of timings
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+import numpy as np
+if sys.argv[1] == 'pickle':
+    import joblib
+    load = joblib.load
+else:
+    from forest_artifact import load_forest as load
+imported = time.perf_counter()
+model = load(sys.argv[2])
+loaded = time.perf_counter()
+model.predict(np.load(sys.argv[3]))
+predicted = time.perf_counter()
+
+# Linux only; ru_maxrss is no use here as it includes the forked parent
+rss_kb = private_kb = None
+try:
+    with open('/proc/self/smaps_rollup') as f:
+        fields = {k: int(v.split()[0]) for k, v in (line.split(':', 1) for line in f if ':' in line and 'kB' in line)}
+    rss_kb = fields['Rss']
+    private_kb = fields['Private_Clean'] + fields['Private_Dirty']
+except (OSError, KeyError, ValueError):
+    pass
+print(json.dumps({
+    'import_s': imported - start,
+    'load_s': loaded - imported,
+    'first_predict_s': predicted - loaded,
+    'rss_mb': rss_kb / 1024 if rss_kb is not None else None,
+    'private_mb': private_kb / 1024 if private_kb is not None else None
+}))
+"""
+
+
+def run_child(kind, path, sample_path):
+    repo_root = str(Path(__file__).resolve().parent.parent)
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [repo_root, os.environ.get('PYTHONPATH')]))}
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", CHILD, kind, str(Path(path).resolve()), str(sample_path)],
+        check=True, capture_output=True, text=True, env=env
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    """Median of each timing/memory field across runs"""
+    return {key: statistics.median(run[key] for run in runs) if runs[0][key] is not None else None
+            for key in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=None, help="Pickled model (default: promoted registry version)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    model_path = args.model
+    if model_path is None:
+        registry = ModelRegistry(REGISTRY_DIR)
+        version = registry.current_version("activity")
+        model_path = registry.model_path("activity", version) if version is not None else "activity_model.pkl"
+    model_path = Path(model_path)
+    if not model_path.exists():
+        print(f"❌ Model not found: {model_path}")
+        return 1
+
+    print("=" * 60)
+    print("Model Cold-Start Benchmark")
+    print("=" * 60)
+
+    X_test, _, _, _ = load_har_dataset(find_dataset("test.csv"))
+    model = joblib.load(model_path)
+    if 'verbose' in model.get_params():
+        model.set_params(verbose=0)
+    features = list(getattr(model, "feature_names_in_", X_test.columns))
+    X = X_test[features]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        forest_path = forest_artifact_path(model_path)
+        if not forest_path.exists():
+            forest_path = save_forest(model, Path(tmp) / "model.forest")
+        sample_path = Path(tmp) / "sample.npy"
+        np.save(sample_path, X.to_numpy()[:1])
+
+        forest = load_forest(forest_path)
+        identical = bool(np.array_equal(forest.predict(X), model.predict(X)))
+
+        results = {}
+        for kind, path in (('pickle', model_path), ('forest', forest_path)):
+            runs = [run_child(kind, path, sample_path) for _ in range(args.repeats)]
+            size = path.stat().st_size if path.is_file() else sum(p.stat().st_size for p in path.iterdir())
+            results[kind] = {'path': str(path), 'size_kb': size / 1024, **summarize(runs)}
+
+    print(f"\n📦 {model_path} ({len(features)} features), median of {args.repeats} fresh processes")
+    print(f"\n   {'':<8} {'size':>10} {'import':>9} {'load':>9} {'1st pred':>9} {'RSS':>9} {'private':>9}")
+    for kind, r in results.items():
+        memory = " ".join(f"{r[key]:>7.1f}MB" if r[key] is not None else f"{'n/a':>9}"
+                          for key in ('rss_mb', 'private_mb'))
+        print(f"   {kind:<8} {r['size_kb']:>8,.0f}KB {r['import_s'] * 1000:>7.0f}ms {r['load_s'] * 1000:>7.1f}ms "
+              f"{r['first_predict_s'] * 1000:>7.1f}ms {memory}")
+    speedup = results['pickle']['load_s'] / results['forest']['load_s']
+    print(f"\n   Load {speedup:,.0f}x faster from the forest artifact")
+    print(f"   {'✅ Identical predictions' if identical else '❌ Predictions differ'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'config': vars(args), 'identical': identical, 'results': results}, f, indent=2)
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
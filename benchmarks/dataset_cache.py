@@ -0,0 +1,90 @@
+"""
+Dataset Cache Timing Report
+Times loading train.csv/test.csv as a default pd.read_csv, with the
+float32 schema, building the binary dataset cache (cache miss) and
+memory-mapping it (cache hit), and checks the cached arrays match the
+parsed CSV.
+
+Usage: python -m benchmarks.dataset_cache [--json dataset_cache.json]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset import find_dataset, load_har_dataset, read_har_csv, split_features
+
+
+def timed(func, *args, repeats=1, **kwargs):
+    """Run func and return (result, best wall time in seconds)"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    paths = [find_dataset("train.csv"), find_dataset("test.csv")]
+    for path in paths:
+        if not path.exists():
+            print(f"❌ Dataset not found: {path}")
+            return 1
+
+    print("=" * 60)
+    print("Dataset Cache Timing Report")
+    print("=" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for path in paths:
+            _, t_default = timed(pd.read_csv, path, repeats=args.repeats)
+            parsed, t_float32 = timed(read_har_csv, path, repeats=args.repeats)
+            (_, _, _, hit), t_miss = timed(load_har_dataset, path, cache_dir=cache_dir)
+            (X, y, subject, hit), t_hit = timed(load_har_dataset, path, cache_dir=cache_dir,
+                                                repeats=args.repeats)
+            # Touch every page of the memory map, as a training run would
+            _, t_touch = timed(lambda: float(X.to_numpy().sum()), repeats=args.repeats)
+
+            X_csv, y_csv, subject_csv = split_features(parsed)
+            identical = (np.array_equal(X.to_numpy(), X_csv.to_numpy()) and list(X.columns) == list(X_csv.columns)
+                         and (y is None or y.equals(y_csv.astype(y.dtype)))
+                         and (subject is None or np.array_equal(subject.to_numpy(), subject_csv.to_numpy())))
+
+            results[path.name] = {
+                'rows': len(X),
+                'features': X.shape[1],
+                'read_csv_default_s': t_default,
+                'read_csv_float32_s': t_float32,
+                'cache_miss_s': t_miss,
+                'cache_hit_s': t_hit,
+                'cache_hit_and_scan_s': t_hit + t_touch,
+                'identical': bool(identical and hit)
+            }
+            r = results[path.name]
+            print(f"\n📂 {path.name}: {r['rows']} rows × {r['features']} features")
+            print(f"   pd.read_csv (float64):      {t_default:8.3f}s")
+            print(f"   read_har_csv (float32):     {t_float32:8.3f}s")
+            print(f"   cache miss (parse + write): {t_miss:8.3f}s")
+            print(f"   cache hit (memory map):     {t_hit:8.3f}s  ({t_default / t_hit:,.0f}x faster)")
+            print(f"   cache hit + full scan:      {t_hit + t_touch:8.3f}s")
+            print(f"   {'✅ Identical to the parsed CSV' if r['identical'] else '❌ Cached data differs'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+    return 0 if all(r['identical'] for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,158 @@
+"""
+Fall Detection Evaluation
+Compares the streaming fall state machine (fall_state_machine.py) with the
+motion heuristic in motion_analysis.py on test.csv. The HAR recordings
+contain no falls, so fall episodes are spliced into every subject's stream
+from that subject's own rows: the strongest-impact window followed by a run
+of LAYING windows. Reports recall on the spliced episodes, false alarms per
+activity on the untouched recordings, and state machine throughput with
+many concurrent subjects.
+
+Usage: python -m benchmarks.fall_detection_eval [--episodes 10] [--subjects 5000]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset import find_dataset, read_har_csv, LABEL_COLUMN, SUBJECT_COLUMN
+from fall_state_machine import POSTURE_WINDOW, INACTIVITY_WINDOW, FallStateMachine, \
+    detect_falls_streaming
+from motion_analysis import MAGNITUDE_COLS, GRAVITY_COLS, add_motion_features, detect_falls_heuristic
+
+# A detection this many samples after a spliced impact counts as a hit
+TOLERANCE = POSTURE_WINDOW + INACTIVITY_WINDOW + 1
+LAYING_RUN = INACTIVITY_WINDOW + 2
+
+
+def splice_falls(df, episodes, seed=0):
+    """
+    Rebuild each subject's stream with `episodes` fall episodes inserted at
+    random points. Returns: (frame, boolean array marking the impact rows)
+    """
+    rng = np.random.default_rng(seed)
+    magnitude = np.sqrt((df[MAGNITUDE_COLS].to_numpy(dtype=np.float64) ** 2).sum(axis=1))
+    rows, impacts = [], []
+    for _, group in df.groupby(SUBJECT_COLUMN, sort=False):
+        positions = group.index.to_numpy()
+        laying = positions[(group[LABEL_COLUMN] == "LAYING").to_numpy()]
+        if len(laying) < LAYING_RUN or len(positions) < 2 * episodes:
+            rows.extend(positions)
+            impacts.extend([False] * len(positions))
+            continue
+        impact_row = positions[np.argmax(magnitude[positions])]
+        cuts = np.sort(rng.choice(np.arange(1, len(positions)), size=episodes, replace=False))
+        for piece, cut in zip(np.split(positions, cuts), np.append(cuts, -1)):
+            rows.extend(piece)
+            impacts.extend([False] * len(piece))
+            if cut < 0:
+                break
+            start = rng.integers(0, len(laying) - LAYING_RUN + 1)
+            rows.extend([impact_row, *laying[start:start + LAYING_RUN]])
+            impacts.extend([True] + [False] * LAYING_RUN)
+    return df.loc[rows].reset_index(drop=True), np.array(impacts)
+
+
+def score(flags, impacts):
+    """Recall over impacts (a flag within TOLERANCE samples after one) and unmatched flags"""
+    impact_rows = np.flatnonzero(impacts)
+    flag_rows = np.flatnonzero(flags)
+    # First flag at or after each impact
+    nearest = np.searchsorted(flag_rows, impact_rows)
+    hit = nearest < len(flag_rows)
+    hit[hit] = flag_rows[nearest[hit]] - impact_rows[hit] <= TOLERANCE
+    # Flags not explained by any impact
+    previous = np.searchsorted(impact_rows, flag_rows, side='right') - 1
+    explained = previous >= 0
+    explained[explained] = flag_rows[explained] - impact_rows[previous[explained]] <= TOLERANCE
+    return {
+        'episodes': int(len(impact_rows)),
+        'recall': float(hit.mean()) if len(hit) else 0.0,
+        'false_alarms': int((~explained).sum()),
+        'flags': int(len(flag_rows))
+    }
+
+
+def run_detectors(frame):
+    """Returns: {name: boolean flags} for the heuristic and the state machine"""
+    frame = frame.copy()
+    mean_mag, _ = add_motion_features(frame)
+    return {
+        'heuristic': detect_falls_heuristic(frame["acc_mag"], frame["Possible_Fall"], mean_mag),
+        'state_machine': detect_falls_streaming(frame["acc_mag"], frame[GRAVITY_COLS], frame[SUBJECT_COLUMN])
+    }
+
+
+def throughput(frame, n_subjects, steps):
+    """Samples per second with n_subjects streams advanced together"""
+    magnitude = np.sqrt((frame[MAGNITUDE_COLS].to_numpy(dtype=np.float64) ** 2).sum(axis=1))
+    gravity = frame[GRAVITY_COLS].to_numpy(dtype=np.float64)
+    subjects = np.arange(n_subjects)
+    machine = FallStateMachine(capacity=n_subjects)
+    # Every subject replays the recording from its own offset
+    offsets = np.random.default_rng(0).integers(0, len(frame), n_subjects)
+    start = time.perf_counter()
+    for step in range(steps):
+        rows = (offsets + step) % len(frame)
+        machine.step(subjects, magnitude[rows], gravity[rows])
+    elapsed = time.perf_counter() - start
+    return {
+        'subjects': n_subjects,
+        'steps': steps,
+        'samples_per_second': n_subjects * steps / elapsed,
+        'step_ms': elapsed / steps * 1000,
+        'state_bytes_per_subject': sum(getattr(machine, name).nbytes for name in machine.FIELDS) / n_subjects
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the fall state machine against the heuristic")
+    parser.add_argument("--episodes", type=int, default=10, help="Fall episodes spliced into each subject")
+    parser.add_argument("--subjects", type=int, default=5000, help="Concurrent subjects for the throughput run")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    test_path = find_dataset("test.csv")
+    if not test_path.exists():
+        print("❌ test.csv not found!")
+        return 1
+    df = read_har_csv(test_path, usecols=MAGNITUDE_COLS + GRAVITY_COLS + [LABEL_COLUMN, SUBJECT_COLUMN])
+
+    print("=" * 60)
+    print(f"Fall Detection Evaluation: {len(df)} samples, {df[SUBJECT_COLUMN].nunique()} subjects")
+    print("=" * 60)
+
+    results = {'recorded': {}, 'spliced': {}}
+    print("\n📊 Flags on the recordings (no real falls) per activity")
+    for name, flags in run_detectors(df).items():
+        per_activity = pd.Series(flags).groupby(df[LABEL_COLUMN].to_numpy()).sum()
+        results['recorded'][name] = {'flags': int(flags.sum()),
+                                     'per_activity': {k: int(v) for k, v in per_activity.items()}}
+        print(f"   {name:14s} {int(flags.sum()):5d}  " +
+              ", ".join(f"{k}: {v}" for k, v in per_activity.items() if v))
+
+    spliced, impacts = splice_falls(df, args.episodes, seed=args.seed)
+    print(f"\n🎯 Spliced fall episodes ({int(impacts.sum())} impacts, tolerance {TOLERANCE} samples)")
+    for name, flags in run_detectors(spliced).items():
+        results['spliced'][name] = score(flags, impacts)
+        r = results['spliced'][name]
+        print(f"   {name:14s} recall {r['recall']:.1%}   false alarms {r['false_alarms']}")
+
+    results['throughput'] = throughput(df, args.subjects, args.steps)
+    r = results['throughput']
+    print(f"\n⚡ State machine: {r['samples_per_second']:,.0f} samples/s with {r['subjects']} subjects "
+          f"({r['step_ms']:.2f} ms per step, {r['state_bytes_per_subject']:.0f} bytes of state each)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
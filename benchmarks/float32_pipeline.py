@@ -0,0 +1,109 @@
+"""
+float32 Pipeline Verification
+Loads train.csv/test.csv with the default float64 parser and with the
+float32 schema from dataset.py, then checks that activity and fall-model
+predictions are unchanged and reports the memory and throughput gain.
+
+Usage: python -m benchmarks.float32_pipeline [--model activity_model.pkl]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from dataset import find_dataset, read_har_csv, split_features
+from motion_analysis import FALL_FEATURE_COLS
+
+
+def timed(func, *args, repeats=1, **kwargs):
+    """Run func and return (result, best wall time in seconds)"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def feature_mb(X):
+    return X.memory_usage(index=False).sum() / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="activity_model.pkl",
+                        help="Activity model to verify (a small forest is trained if missing)")
+    parser.add_argument("--fall-model", default="fall_detection_model.pkl")
+    args = parser.parse_args()
+
+    train_path, test_path = find_dataset("train.csv"), find_dataset("test.csv")
+    for path in (train_path, test_path):
+        if not path.exists():
+            print(f"❌ Dataset not found: {path}")
+            return 1
+
+    print("=" * 60)
+    print("float32 Pipeline Verification")
+    print("=" * 60)
+
+    print("\n📂 Parsing")
+    frames = {}
+    for name, path in (("train", train_path), ("test", test_path)):
+        df64, t64 = timed(pd.read_csv, path)
+        df32, t32 = timed(read_har_csv, path)
+        X64, _, _ = split_features(df64)
+        X32, _, _ = split_features(df32)
+        frames[name] = (df64, df32)
+
+        print(f"   {name}.csv: parse {t64:.2f}s → {t32:.2f}s, "
+              f"features {feature_mb(X64):.1f} MB → {feature_mb(X32):.1f} MB "
+              f"({feature_mb(X64) / feature_mb(X32):.2f}x smaller)")
+
+        max_error = np.abs(X64.to_numpy() - X32.to_numpy(dtype=np.float64)).max()
+        print(f"      max |float64 - float32| = {max_error:.2e}")
+
+    if Path(args.model).exists():
+        model = joblib.load(args.model)
+        if hasattr(model, "verbose"):
+            model.set_params(verbose=0)
+        print(f"\n🤖 Verifying {args.model}")
+    else:
+        X_train, y_train, _ = split_features(frames["train"][0])
+        model = RandomForestClassifier(n_estimators=30, max_depth=20, random_state=42, n_jobs=-1)
+        model.fit(X_train, y_train)
+        print(f"\n🤖 {args.model} not found, verifying a 30-tree forest trained on float64 input")
+
+    df64, df32 = frames["test"]
+    X64, _, _ = split_features(df64)
+    X32, _, _ = split_features(df32)
+    features = list(getattr(model, "feature_names_in_", X64.columns))
+    X64, X32 = X64[features], X32[features]
+
+    pred64, t64 = timed(model.predict, X64, repeats=3)
+    pred32, t32 = timed(model.predict, X32, repeats=3)
+    mismatches = int((pred64 != pred32).sum())
+
+    print(f"   Prediction mismatches: {mismatches} / {len(pred64)}")
+    print(f"   Batch throughput: {len(X64) / t64:,.0f} → {len(X32) / t32:,.0f} samples/s "
+          f"({t64 / t32:.2f}x)")
+
+    if Path(args.fall_model).exists():
+        fall_model = joblib.load(args.fall_model)
+        cols = [col for col in FALL_FEATURE_COLS if col in df64.columns]
+        fall64 = fall_model.predict(df64[cols].values)
+        fall32 = fall_model.predict(df32[cols].to_numpy(dtype=np.float32))
+        fall_mismatches = int((fall64 != fall32).sum())
+        mismatches += fall_mismatches
+        print(f"   Fall model mismatches: {fall_mismatches} / {len(fall64)}")
+
+    print("\n" + ("✅ Predictions unchanged" if mismatches == 0 else "❌ Predictions differ"))
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
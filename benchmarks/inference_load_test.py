@@ -0,0 +1,131 @@
+"""
+Inference Server Load Test
+Runs many concurrent clients against the micro-batching inference server
+and against per-client model.predict calls, and reports throughput and
+p50/p99 latency for both.
+
+Usage: python -m benchmarks.inference_load_test --clients 200 --requests 10
+"""
+
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset import find_dataset, read_har_csv, split_features
+from inference_server import InferenceClient, serve
+
+
+def run_clients(n_clients, n_requests, request_fn):
+    """Start n_clients threads that each issue n_requests; returns (latencies, wall seconds)"""
+    latencies = [[] for _ in range(n_clients)]
+    errors = []
+    start_barrier = threading.Barrier(n_clients + 1)
+
+    def client(idx):
+        state = {}
+        try:
+            request_fn(idx, state, warmup=True)
+            start_barrier.wait()
+            for _ in range(n_requests):
+                start = time.perf_counter()
+                request_fn(idx, state)
+                latencies[idx].append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            if 'client' in state:
+                state['client'].close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(n_clients)]
+    for t in threads:
+        t.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    if errors:
+        raise errors[0]
+    return np.concatenate([np.asarray(l) for l in latencies]), wall
+
+
+def summarize(latencies, wall):
+    return {
+        'requests': int(len(latencies)),
+        'throughput_rps': float(len(latencies) / wall),
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the inference server")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10, help="Requests per client")
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument("--model", default="activity", choices=["activity", "fall"])
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    server, service = serve(port=0, max_latency_ms=args.max_latency_ms)
+    if args.model not in service.handles:
+        print(f"❌ No {args.model} model found! Train or promote a model first.")
+        return 1
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    _, model, _ = service.handles[args.model].get()
+    features = list(getattr(model, "feature_names_in_", []))
+    test_path = find_dataset("test.csv")
+    if test_path.exists() and features:
+        X, _, _ = split_features(read_har_csv(test_path, usecols=features))
+        rows = X[features].to_numpy(dtype=np.float32)
+    else:
+        rows = np.random.default_rng(0).uniform(-1, 1, (1000, model.n_features_in_)).astype(np.float32)
+
+    print("=" * 60)
+    print(f"Inference Load Test: {args.clients} clients x {args.requests} requests")
+    print("=" * 60)
+
+    def via_server(idx, state, warmup=False):
+        if 'client' not in state:
+            state['client'] = InferenceClient(f"http://127.0.0.1:{port}")
+            state['client'].health()
+        state['client'].predict(args.model, rows[idx % len(rows)][None, :])
+
+    def per_client_predict(idx, state, warmup=False):
+        row = rows[idx % len(rows)][None, :]
+        model.predict(pd.DataFrame(row, columns=features) if features else row)
+
+    results = {}
+    for name, request_fn in (("per_client_predict", per_client_predict), ("micro_batched_server", via_server)):
+        latencies, wall = run_clients(args.clients, args.requests, request_fn)
+        results[name] = summarize(latencies, wall)
+        r = results[name]
+        print(f"\n📊 {name}")
+        print(f"   Throughput: {r['throughput_rps']:,.0f} requests/s")
+        print(f"   Latency p50: {r['p50_ms']:.1f} ms   p99: {r['p99_ms']:.1f} ms")
+
+    batcher = service.batchers[args.model]
+    results['micro_batched_server']['batches'] = batcher.batches
+    results['micro_batched_server']['mean_batch_rows'] = batcher.rows / max(batcher.batches, 1)
+    print(f"   Batches: {batcher.batches} (mean {results['micro_batched_server']['mean_batch_rows']:.1f} rows)")
+
+    speedup = results['micro_batched_server']['throughput_rps'] / results['per_client_predict']['throughput_rps']
+    print(f"\n🚀 Throughput gain: {speedup:.1f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,385 @@
+"""
+Hot Path Benchmark Suite
+Times the alert, inference, fall detection, health history, Health
+Trend Dashboard, tracking log rollup / range query, chart rendering and
+inactivity timer hot paths on synthetic data and
+writes the results as JSON. Comparing against a previous results file flags regressions.
+
+Usage:
+    python -m benchmarks.run_benchmarks                 # full run
+    python -m benchmarks.run_benchmarks --quick         # smaller sizes
+    python -m benchmarks.run_benchmarks --baseline bench_results.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from alert_system import SafetyAlertSystem
+from dataset import split_features
+from downsampling import downsample, background_positions
+from figure_cache import figure_to_png
+from health_trends import (
+    HealthHistory, health_summary, alert_severity_counts, activity_distribution,
+    HealthAggregates
+)
+from fatigue_detector import FatigueDetector
+from fall_state_machine import FallStateMachine, detect_falls_streaming
+from inactivity_monitor import InactivityMonitor
+from motion_analysis import add_motion_features, detect_falls_heuristic
+from rollups import RollupStore
+from log_index import LogIndex
+from activity_segments import SegmentStore
+
+from benchmarks.synthetic import make_alert_log, make_har_frame, make_health_history, make_tracking_log
+
+BATCH_SIZES = [1, 4, 16, 64, 256, 1024, 4096]
+
+
+def timeit(func, repeats=5, number=1, setup=None):
+    """
+    Call func `number` times per repeat
+
+    Returns: dict with median/min/mean seconds per call
+    """
+    per_call = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number)
+    return {
+        'median_s': statistics.median(per_call),
+        'min_s': min(per_call),
+        'mean_s': statistics.fmean(per_call),
+        'repeats': repeats,
+        'number': number
+    }
+
+
+def sizes_up_to(limit, start=3):
+    """Powers of ten from 10**start up to limit"""
+    return [10 ** e for e in range(start, 7) if 10 ** e <= limit]
+
+
+class BenchmarkRunner:
+    def __init__(self):
+        self.results = []
+
+    def record(self, name, params, stats):
+        self.results.append({'name': name, 'params': params, **stats})
+        label = ", ".join(f"{k}={v}" for k, v in params.items())
+        print(f"   {name:<32} {label:<22} {stats['median_s'] * 1000:>12.3f} ms")
+
+
+def bench_alerts(runner, workdir, max_log_size):
+    print("\n🚨 Alert system")
+    system = SafetyAlertSystem(alert_log_file=str(workdir / "alerts.csv"))
+    scenarios = [
+        dict(activity='WALKING', risk_score=20, motion_intensity=0.1),
+        dict(activity='WALKING_UPSTAIRS', risk_score=65, motion_intensity=0.3, is_anomaly=True),
+        dict(activity='STANDING', risk_score=90, motion_intensity=0.8, is_high_alert=True),
+        dict(activity='WALKING_DOWNSTAIRS', risk_score=100, motion_intensity=0.9, is_fall=True)
+    ]
+
+    def generate():
+        for i, scenario in enumerate(scenarios):
+            system.generate_alert(sample_index=i, **scenario)
+
+    runner.record("alert.generate_alert", {'calls': len(scenarios)},
+                  timeit(generate, repeats=5, number=2500, setup=system.clear_session_alerts))
+
+    alert = system.generate_alert(sample_index=0, **scenarios[-1])
+    for n_rows in sizes_up_to(max_log_size):
+        log_path = workdir / f"alerts_{n_rows}.csv"
+        make_alert_log(log_path, n_rows)
+        system.alert_log_file = str(log_path)
+        repeats = 3 if n_rows <= 10 ** 4 else 1
+
+        runner.record("alert.save_alert_to_log", {'log_rows': n_rows},
+                      timeit(lambda: system.save_alert_to_log(alert), repeats=repeats))
+        runner.record("alert.get_alert_statistics", {'log_rows': n_rows},
+                      timeit(system.get_alert_statistics, repeats=repeats))
+        log_path.unlink()
+
+
+def bench_inference(runner, model_path=None):
+    print("\n🤖 Activity model inference")
+    frame = make_har_frame(max(BATCH_SIZES) + 2000, seed=1)
+    X, y, _ = split_features(frame)
+
+    if model_path and Path(model_path).exists():
+        import joblib
+        model = joblib.load(model_path)
+        model.set_params(verbose=0)
+        X = X[list(getattr(model, "feature_names_in_", X.columns))]
+    else:
+        # Same hyperparameters as train_model.py, fit on a synthetic sample
+        model = RandomForestClassifier(n_estimators=100, max_depth=20, min_samples_split=10,
+                                       min_samples_leaf=4, random_state=42, n_jobs=-1)
+        model.fit(X.iloc[:2000], y.iloc[:2000])
+
+    X_eval = X.iloc[2000:]
+    for batch in BATCH_SIZES:
+        rows = X_eval.iloc[:batch]
+        repeats = 20 if batch <= 64 else 5
+        runner.record("model.predict", {'batch': batch}, timeit(lambda: model.predict(rows), repeats=repeats))
+
+
+def bench_fall_detection(runner, max_rows):
+    print("\n🚨 Fall detection: heuristic and streaming state machine")
+    for n_rows in sizes_up_to(max_rows):
+        rng = np.random.default_rng(n_rows)
+        df = pd.DataFrame(rng.normal(0, 0.2, (n_rows, 3)).astype(np.float32),
+                          columns=["tBodyAcc-mean()-X", "tBodyAcc-mean()-Y", "tBodyAcc-mean()-Z"])
+
+        def detect():
+            mean_mag, _ = add_motion_features(df)
+            detect_falls_heuristic(df["acc_mag"], df["Possible_Fall"], mean_mag)
+
+        runner.record("fall.heuristic", {'samples': n_rows}, timeit(detect, repeats=5))
+
+        # Live Simulation's path when gravity columns are present: subjects in
+        # contiguous runs, as in the HAR recordings
+        acc_mag = np.sqrt((df.to_numpy(dtype=np.float64) ** 2).sum(axis=1))
+        gravity = rng.normal(0, 0.1, (n_rows, 3)) + [0.0, 0.0, 1.0]
+        subjects = np.sort(rng.integers(1, 31, size=n_rows))
+        runner.record("fall.streaming", {'samples': n_rows},
+                      timeit(lambda: detect_falls_streaming(acc_mag, gravity, subjects), repeats=5))
+
+    # One step of the state machine across a fleet of subjects
+    for n_subjects in sizes_up_to(max_rows):
+        rng = np.random.default_rng(n_subjects)
+        machine = FallStateMachine(capacity=n_subjects)
+        subjects = np.arange(n_subjects)
+        magnitude = rng.gamma(2.0, 0.1, n_subjects)
+        gravity = rng.normal(0, 0.1, (n_subjects, 3)) + [0.0, 0.0, 1.0]
+        runner.record("fall_state_machine.step", {'subjects': n_subjects},
+                      timeit(lambda: machine.step(subjects, magnitude, gravity), repeats=5, number=10))
+
+
+def bench_health(runner, max_history):
+    print("\n📅 Health history and dashboard aggregations")
+    entry = {'timestamp': pd.Timestamp.now(), 'activity': 'WALKING', 'risk': 30,
+             'motion': 0.2, 'fall': False, 'alert': False, 'anomaly': False}
+
+    for n_rows in sizes_up_to(max_history):
+        history = make_health_history(n_rows)
+        params = {'history_rows': n_rows}
+        repeats = 5 if n_rows <= 10 ** 4 else 3
+
+        health_history = HealthHistory(history)
+        runner.record("health.append", params, timeit(lambda: health_history.append(entry), repeats=5, number=1000))
+        runner.record("dashboard.health_summary", params, timeit(lambda: health_summary(history), repeats=repeats))
+        runner.record("dashboard.alert_severity_counts", params,
+                      timeit(lambda: alert_severity_counts(history), repeats=1 if n_rows > 10 ** 4 else repeats))
+        runner.record("dashboard.activity_distribution", params,
+                      timeit(lambda: activity_distribution(history), repeats=repeats))
+
+        runner.record("aggregates.from_history", params,
+                      timeit(lambda: HealthAggregates.from_history(history), repeats=repeats))
+        aggregates = HealthAggregates.from_history(history)
+        runner.record("aggregates.update", params, timeit(lambda: aggregates.update(entry), repeats=5, number=1000))
+
+        detector = FatigueDetector.from_history(history)
+        runner.record("fatigue_detector.update", params,
+                      timeit(lambda: detector.update(entry), repeats=5, number=1000))
+
+        def dashboard_reads():
+            aggregates.summary()
+            aggregates.severity_counts()
+            aggregates.activity_counts()
+            aggregates.recent_stats()
+            detector.state()
+
+        runner.record("aggregates.dashboard_reads", params, timeit(dashboard_reads, repeats=repeats))
+
+
+def bench_rollups(runner, workdir, max_log_size):
+    print("\n📆 Tracking log rollups")
+    for n_rows in sizes_up_to(max_log_size, start=4):
+        log_path = workdir / f"tracking_{n_rows}.csv"
+        make_tracking_log(log_path, n_rows)
+        params = {'log_rows': n_rows}
+        repeats = 3 if n_rows <= 10 ** 5 else 1
+
+        runner.record("rollup.build", params, timeit(lambda: RollupStore(str(log_path)).refresh(), repeats=repeats))
+
+        store = RollupStore(str(log_path))
+        store.refresh()
+        runner.record("rollup.totals", params, timeit(store.totals, repeats=20))
+        runner.record("rollup.series", params, timeit(store.series, repeats=20))
+        runner.record("raw.value_counts", params,
+                      timeit(lambda: pd.read_csv(log_path)["predicted_activity"].value_counts(), repeats=repeats))
+
+        index_path = workdir / f"tracking_{n_rows}.idx.npz"
+        runner.record("log_index.build", params,
+                      timeit(lambda: LogIndex(str(log_path), index_path=str(index_path)).refresh(),
+                             repeats=repeats, setup=lambda: index_path.unlink(missing_ok=True)))
+        index = LogIndex(str(log_path), index_path=str(index_path))
+        runner.record("log_index.open_saved", params,
+                      timeit(lambda: LogIndex(str(log_path), index_path=str(index_path)).refresh(), repeats=5))
+        runner.record("log_index.read_last_5min", params, timeit(lambda: index.read_last("5min"), repeats=5))
+
+        segments_path = workdir / f"tracking_{n_rows}.segments.npz"
+        runner.record("segments.build", params,
+                      timeit(lambda: SegmentStore(str(log_path), segments_path=str(segments_path)).refresh(),
+                             repeats=repeats, setup=lambda: segments_path.unlink(missing_ok=True)))
+        segment_store = SegmentStore(str(log_path), segments_path=str(segments_path))
+        runner.record("segments.time_per_activity", {**params, 'segments': len(segment_store)},
+                      timeit(segment_store.time_per_activity, repeats=5))
+
+        with open(log_path, 'a') as f:
+            f.write("2027-01-01 00:00:00.000,WALKING,False,Low\n" * 10)
+        runner.record("rollup.refresh_10_rows", params, timeit(store.refresh, repeats=1))
+        runner.record("log_index.refresh_10_rows", params, timeit(index.refresh, repeats=1))
+        log_path.unlink()
+
+
+def bench_inactivity(runner, max_subjects):
+    print("\n🧘 Prolonged-inactivity timers")
+    for n_subjects in sizes_up_to(max_subjects):
+        params = {'subjects': n_subjects}
+        monitor = InactivityMonitor(threshold=300)
+        rng = np.random.default_rng(n_subjects)
+        starts = rng.uniform(0, 600, n_subjects)
+        for subject, start in enumerate(starts):
+            monitor.observe(subject, 'SITTING', 0.0, start)
+        clock = iter(range(1, 10 ** 9))
+
+        runner.record("inactivity.poll_tick", params, timeit(lambda: monitor.poll(next(clock)), repeats=5, number=100))
+        # What the wheel replaces: scanning every subject's start time each tick
+        runner.record("inactivity.scan_tick", params,
+                      timeit(lambda: np.flatnonzero(starts + 300 <= next(clock)), repeats=5, number=100))
+
+
+def bench_charts(runner, max_history):
+    print("\n📉 Full-range timeline charts (LTTB downsampling)")
+    for n_rows in sizes_up_to(max_history, start=4):
+        history = make_health_history(n_rows)
+        risk = history['risk'].to_numpy()
+        fall = history['fall'].to_numpy()
+        params = {'history_rows': n_rows}
+
+        runner.record("chart.downsample", params, timeit(lambda: downsample(risk, keep=fall | (risk > 75))))
+
+        def render():
+            positions = downsample(risk, keep=fall | (risk > 75))
+            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
+            ax1.plot(positions, risk[positions], linewidth=2)
+            critical = np.flatnonzero(risk > 75)
+            ax1.scatter(critical, risk[critical], color='red', s=100, marker='X')
+            background = background_positions(n_rows)
+            ax2.scatter(background, [0.5] * len(background), color='lightgray', s=10)
+            falls = np.flatnonzero(fall)
+            ax2.scatter(falls, [0.5] * len(falls), color='red', s=200, marker='X')
+            figure_to_png(fig)
+
+        runner.record("chart.render_risk_and_falls", params, timeit(render, repeats=3))
+
+
+def compare(results, baseline_path, tolerance):
+    """Return the results that are slower than the baseline by more than tolerance"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r['name'], json.dumps(r['params'], sort_keys=True)): r for r in baseline['results']}
+
+    regressions = []
+    for r in results:
+        old = previous.get((r['name'], json.dumps(r['params'], sort_keys=True)))
+        if old and r['median_s'] > old['median_s'] * (1 + tolerance):
+            regressions.append((r, old))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the monitoring hot paths")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--quick", action="store_true", help="Cap log/history/chart/stream sizes at 10^4")
+    parser.add_argument("--max-log-size", type=int, default=10 ** 6)
+    parser.add_argument("--max-history-size", type=int, default=10 ** 5)
+    parser.add_argument("--max-chart-size", type=int, default=10 ** 6,
+                        help="Largest timeline downsampled in the charts group")
+    parser.add_argument("--max-stream-size", type=int, default=10 ** 6,
+                        help="Largest sample stream (fall detection) and subject count (inactivity, up to 10^5)")
+    parser.add_argument("--model", default=None, help="Benchmark this model instead of a synthetic forest")
+    parser.add_argument("--only", nargs="+", choices=["alerts", "inference", "fall", "health", "rollups", "charts",
+                                                        "inactivity"])
+    parser.add_argument("--baseline", default=None, help="Previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown vs baseline before a case counts as a regression")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.max_log_size = min(args.max_log_size, 10 ** 4)
+        args.max_history_size = min(args.max_history_size, 10 ** 4)
+        args.max_stream_size = min(args.max_stream_size, 10 ** 4)
+        args.max_chart_size = min(args.max_chart_size, 10 ** 4)
+    groups = set(args.only or ["alerts", "inference", "fall", "health", "rollups", "charts", "inactivity"])
+
+    print("=" * 60)
+    print("Hot Path Benchmarks")
+    print("=" * 60)
+
+    runner = BenchmarkRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        if "alerts" in groups:
+            bench_alerts(runner, Path(tmp), args.max_log_size)
+        if "rollups" in groups:
+            bench_rollups(runner, Path(tmp), args.max_log_size)
+    if "inference" in groups:
+        bench_inference(runner, args.model)
+    if "fall" in groups:
+        bench_fall_detection(runner, args.max_stream_size)
+    if "health" in groups:
+        bench_health(runner, args.max_history_size)
+    if "charts" in groups:
+        bench_charts(runner, args.max_chart_size)
+    if "inactivity" in groups:
+        bench_inactivity(runner, min(args.max_stream_size, 10 ** 5))
+
+    output = {
+        'meta': {
+            'created_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__
+        },
+        'results': runner.results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(runner.results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) vs {args.baseline}:")
+            for new, old in regressions:
+                print(f"   {new['name']} {new['params']}: "
+                      f"{old['median_s'] * 1000:.3f} ms → {new['median_s'] * 1000:.3f} ms")
+            return 1
+        print(f"\n✅ No regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
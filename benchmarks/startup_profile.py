@@ -0,0 +1,121 @@
+"""
+Dashboard Startup Profile
+For each dashboard mode, starts a fresh interpreter, opens app.py in
+that mode with Streamlit's AppTest and reports:
+  - first paint: the first script run (sidebar plus the mode)
+  - how much of it was importing the mode's module (profiler stage
+    startup.import.<module>)
+  - which heavy libraries the process had loaded by then
+
+Run from the directory holding the data files, like the app itself.
+
+Usage: python -m benchmarks.startup_profile [--app app.py] [--json startup.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from modes import MODES
+
+HEAVY_MODULES = ['pandas', 'pyarrow', 'matplotlib', 'joblib', 'sklearn']
+
+# Runs in a fresh interpreter; opens the app directly in the given mode
+# (through the sidebar radio's session_state key) and prints one JSON line
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_s = time.perf_counter() - start
+
+app_path, label, heavy, module = sys.argv[1], sys.argv[2], sys.argv[3].split(','), sys.argv[4]
+loaded = lambda: [name for name in heavy if name in sys.modules]
+
+at = AppTest.from_file(app_path, default_timeout=600)
+at.session_state['mode'] = label
+start = time.perf_counter()
+at.run()
+first_paint_s = time.perf_counter() - start
+
+import_s = None
+try:
+    from profiling import profiler
+    import_s = next((s['total_s'] for s in profiler.snapshot() if s['stage'] == f"startup.import.{module}"), None)
+except ImportError:
+    pass
+
+print(json.dumps({
+    'streamlit_import_s': streamlit_s,
+    'rendered_mode': at.sidebar.radio[0].value,
+    'first_paint_s': first_paint_s,
+    'mode_import_s': import_s,
+    'exceptions': [str(e.value) for e in at.exception],
+    'loaded': loaded()
+}))
+"""
+
+
+def run_child(app_path, label, module):
+    repo_root = str(Path(__file__).resolve().parent.parent)
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [repo_root, os.environ.get('PYTHONPATH')]))}
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", CHILD, str(app_path), label, ",".join(HEAVY_MODULES), module],
+        check=True, capture_output=True, text=True, env=env
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median(runs, key):
+    values = [run[key] for run in runs if run[key] is not None]
+    return statistics.median(values) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default=str(Path(__file__).resolve().parent.parent / "app.py"))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Dashboard Startup Profile")
+    print("=" * 60)
+
+    results = {}
+    for label, module in MODES.items():
+        runs = [run_child(args.app, label, module) for _ in range(args.repeats)]
+        results[label] = {
+            'rendered_mode': runs[0]['rendered_mode'],
+            'first_paint_s': median(runs, 'first_paint_s'),
+            'mode_import_s': median(runs, 'mode_import_s'),
+            'streamlit_import_s': median(runs, 'streamlit_import_s'),
+            'exceptions': runs[0]['exceptions'],
+            'loaded': runs[0]['loaded']
+        }
+
+    def ms(value):
+        return f"{value * 1000:>8.0f}ms" if value is not None else f"{'n/a':>10}"
+
+    print(f"\n📄 {args.app}, median of {args.repeats} fresh processes")
+    print(f"\n   {'mode':<28} {'1st paint':>10} {'import':>10}  libraries loaded")
+    for label, r in results.items():
+        if r['exceptions']:
+            status = f"❌ {r['exceptions'][0][:40]}"
+        elif r['rendered_mode'] != label:
+            status = f"⚠️ app opened {r['rendered_mode']} instead"
+        else:
+            status = ", ".join(r['loaded']) or "none"
+        print(f"   {label:<28} {ms(r['first_paint_s'])} {ms(r['mode_import_s'])}  {status}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+    return 0 if not any(r['exceptions'] for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+Synthetic Benchmark Data
+Generates data shaped like the real inputs (HAR feature rows, health
+history, safety alert logs, activity tracking logs) so benchmarks can run offline. The feature
+schema is taken from test.csv when it is available.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dataset import LABEL_COLUMN, SUBJECT_COLUMN, NON_FEATURE_COLUMNS, find_dataset, read_columns
+from motion_analysis import FALL_FEATURE_COLS
+
+ACTIVITIES = ['WALKING', 'WALKING_UPSTAIRS', 'WALKING_DOWNSTAIRS', 'SITTING', 'STANDING', 'LAYING']
+
+N_HAR_FEATURES = 561
+
+# Columns the pipeline reads by name; always part of the synthetic schema
+NAMED_FEATURES = FALL_FEATURE_COLS
+
+
+def feature_columns():
+    """Feature names from test.csv's header, or a 561-column stand-in schema"""
+    test_path = find_dataset("test.csv")
+    if test_path.exists():
+        return [col for col in read_columns(test_path) if col not in NON_FEATURE_COLUMNS]
+    return NAMED_FEATURES + [f"feature-{i}" for i in range(N_HAR_FEATURES - len(NAMED_FEATURES))]
+
+
+def make_har_frame(n_rows, columns=None, seed=0):
+    """HAR-like frame: class-dependent features in [-1, 1] plus subject/Activity"""
+    rng = np.random.default_rng(seed)
+    columns = columns or feature_columns()
+
+    centers = rng.uniform(-0.6, 0.6, (len(ACTIVITIES), len(columns))).astype(np.float32)
+    labels = rng.integers(len(ACTIVITIES), size=n_rows)
+    X = centers[labels] + rng.normal(0, 0.3, (n_rows, len(columns))).astype(np.float32)
+    np.clip(X, -1, 1, out=X)
+
+    df = pd.DataFrame(X, columns=columns)
+    df[SUBJECT_COLUMN] = np.sort(rng.integers(1, 31, size=n_rows)).astype(np.int16)
+    df[LABEL_COLUMN] = np.array(ACTIVITIES)[labels]
+    return df
+
+
+def make_health_history(n_rows, seed=0):
+    """Health Trend history as accumulated by Live Simulation (10 Hz timestamps)"""
+    rng = np.random.default_rng(seed)
+    motion = rng.gamma(2.0, 0.1, n_rows)
+    anomaly = motion > np.quantile(motion, 0.95) if n_rows else np.zeros(0, dtype=bool)
+    alert = motion > np.quantile(motion, 0.99) if n_rows else np.zeros(0, dtype=bool)
+    fall = anomaly & (rng.random(n_rows) < 0.2)
+    risk = np.minimum(np.minimum(motion / motion.mean() * 25, 25) + 25 * (anomaly + alert + fall), 100).astype(int) \
+        if n_rows else np.zeros(0, dtype=int)
+
+    return pd.DataFrame({
+        'timestamp': pd.date_range("2026-01-01", periods=n_rows, freq="100ms"),
+        'activity': np.array(ACTIVITIES)[rng.integers(len(ACTIVITIES), size=n_rows)],
+        'risk': risk,
+        'motion': motion,
+        'fall': fall,
+        'alert': alert,
+        'anomaly': anomaly
+    })
+
+
+def make_alert_log(path, n_rows, seed=0):
+    """Write a safety_alerts.csv-style log with n_rows alerts"""
+    rng = np.random.default_rng(seed)
+    severities = np.array(['INFO', 'WARNING', 'CRITICAL', 'EMERGENCY'])
+    alert_types = np.array(['ELEVATED_RISK', 'ANOMALY_DETECTED', 'HIGH_RISK_MOTION', 'FALL_DETECTED'])
+    level = rng.integers(4, size=n_rows)
+    activity = np.array(ACTIVITIES)[rng.integers(len(ACTIVITIES), size=n_rows)]
+
+    pd.DataFrame({
+        'timestamp': pd.date_range("2026-01-01", periods=n_rows, freq="100ms").strftime("%Y-%m-%dT%H:%M:%S.%f"),
+        'severity': severities[level],
+        'alert_type': alert_types[level],
+        'activity': activity,
+        'risk_score': rng.integers(0, 101, size=n_rows),
+        'motion_intensity': rng.gamma(2.0, 0.1, n_rows),
+        'message': [f"Synthetic alert during {a}" for a in activity],
+        'action_required': 'Continue monitoring',
+        'sample_index': np.arange(n_rows)
+    }).to_csv(path, index=False)
+
+
+def make_tracking_log(path, n_rows, seed=0):
+    """
+    Write an activity_tracking_log.csv-style log with n_rows 10 Hz samples;
+    activities come in runs of ~10 s like a real recording
+    """
+    rng = np.random.default_rng(seed)
+    fall = rng.random(n_rows) < 0.005
+    run_lengths = rng.geometric(1 / 100, size=n_rows // 50 + 1)
+    activity = np.repeat(rng.integers(len(ACTIVITIES), size=len(run_lengths)), run_lengths)[:n_rows]
+
+    pd.DataFrame({
+        'timestamp': pd.date_range("2026-01-01", periods=n_rows, freq="100ms").strftime("%Y-%m-%d %H:%M:%S.%f").str[:-3],
+        'predicted_activity': np.array(ACTIVITIES)[activity],
+        'fall_detected': fall,
+        'risk_level': np.where(fall, 'High', 'Low')
+    }).to_csv(path, index=False)
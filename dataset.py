@@ -0,0 +1,161 @@
+"""
+HAR Dataset Loading
+Reads the UCI HAR train/test CSVs with a float32 feature schema.
+All ~561 features are normalized to [-1, 1], so single precision is
+enough and halves the memory of every feature matrix.
+
+Parsed files are cached as .npy arrays under dataset_cache/, keyed by the
+CSV's SHA-256, so repeated runs memory-map the features instead of
+parsing text.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+LABEL_COLUMN = "Activity"
+SUBJECT_COLUMN = "subject"
+NON_FEATURE_COLUMNS = [LABEL_COLUMN, SUBJECT_COLUMN]
+
+FEATURE_DTYPE = np.float32
+
+DATASET_CACHE_DIR = "dataset_cache"
+
+
+def find_dataset(name):
+    """Return data/<name> if it exists, otherwise <name> in the working directory"""
+    data_path = Path("data") / name
+    return data_path if data_path.exists() else Path(name)
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_columns(path):
+    """Read only the CSV header"""
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def schema_dtypes(columns, feature_dtype=FEATURE_DTYPE):
+    """Explicit dtypes for a HAR CSV: float32 features, int subject, string label"""
+    dtypes = {col: feature_dtype for col in columns if col not in NON_FEATURE_COLUMNS}
+    if SUBJECT_COLUMN in columns:
+        dtypes[SUBJECT_COLUMN] = np.int16
+    return dtypes
+
+
+def read_har_csv(path, usecols=None, feature_dtype=FEATURE_DTYPE, nrows=None):
+    """
+    Load a HAR CSV with float32 features
+
+    usecols: optional iterable of column names to keep (others are skipped
+    by the parser rather than dropped afterwards)
+    nrows: optional number of leading rows to read (the rest is not parsed)
+    """
+    columns = read_columns(path)
+    if usecols is not None:
+        wanted = set(usecols)
+        columns = [col for col in columns if col in wanted]
+
+    return pd.read_csv(path, usecols=columns, dtype=schema_dtypes(columns, feature_dtype), nrows=nrows)
+
+
+def split_features(df):
+    """Split a HAR frame into (X, y, subject); y/subject are None if absent"""
+    X = df.drop(columns=NON_FEATURE_COLUMNS, errors='ignore')
+    y = df[LABEL_COLUMN] if LABEL_COLUMN in df.columns else None
+    subject = df[SUBJECT_COLUMN] if SUBJECT_COLUMN in df.columns else None
+    return X, y, subject
+
+
+def _cached_fingerprint(path, cache_dir):
+    """
+    file_fingerprint, memoized in <cache_dir>/fingerprints.json by path,
+    size and mtime so an unchanged file is not re-hashed
+    """
+    stat = os.stat(path)
+    index_path = Path(cache_dir) / "fingerprints.json"
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    key = str(Path(path).resolve())
+    entry = index.get(key)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha256']
+
+    fingerprint = file_fingerprint(path)
+    index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': fingerprint}
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(".json.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+    return fingerprint
+
+
+def dataset_cache_path(path, cache_dir=DATASET_CACHE_DIR, feature_dtype=FEATURE_DTYPE):
+    """Cache directory for a CSV: <cache_dir>/<stem>-<sha256 prefix>-<dtype>"""
+    fingerprint = _cached_fingerprint(path, cache_dir)
+    return Path(cache_dir) / f"{Path(path).stem}-{fingerprint[:16]}-{np.dtype(feature_dtype).name}"
+
+
+def write_dataset_cache(df, target, feature_dtype=FEATURE_DTYPE):
+    """Save a HAR frame as X.npy / y.npy / subject.npy plus meta.json, atomically"""
+    target = Path(target)
+    tmp_dir = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    X, y, subject = split_features(df)
+    np.save(tmp_dir / "X.npy", np.ascontiguousarray(X.to_numpy(dtype=feature_dtype)))
+    if y is not None:
+        np.save(tmp_dir / "y.npy", y.to_numpy(dtype=str))
+    if subject is not None:
+        np.save(tmp_dir / "subject.npy", subject.to_numpy())
+    with open(tmp_dir / "meta.json", 'w') as f:
+        json.dump({'columns': list(X.columns), 'rows': len(X), 'dtype': np.dtype(feature_dtype).name}, f)
+
+    try:
+        os.replace(tmp_dir, target)
+    except OSError:
+        # Another process cached the same file first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def read_dataset_cache(target):
+    """(X, y, subject) from a cache directory; X wraps a read-only memory map without copying"""
+    target = Path(target)
+    with open(target / "meta.json") as f:
+        meta = json.load(f)
+    X = pd.DataFrame(np.load(target / "X.npy", mmap_mode='r'), columns=meta['columns'], copy=False)
+    y = pd.Series(np.load(target / "y.npy"), name=LABEL_COLUMN) if (target / "y.npy").exists() else None
+    subject = pd.Series(np.load(target / "subject.npy", mmap_mode='r'), name=SUBJECT_COLUMN) \
+        if (target / "subject.npy").exists() else None
+    return X, y, subject
+
+
+def load_har_dataset(path, cache_dir=DATASET_CACHE_DIR, feature_dtype=FEATURE_DTYPE):
+    """
+    (X, y, subject) of a HAR CSV, from the binary cache when the file is
+    unchanged; a miss parses the CSV once with the float32 schema and caches it
+
+    Returns: (X, y, subject, from_cache)
+    """
+    target = dataset_cache_path(path, cache_dir, feature_dtype)
+    from_cache = (target / "meta.json").exists()
+    if not from_cache:
+        write_dataset_cache(read_har_csv(path, feature_dtype=feature_dtype), target, feature_dtype)
+    return (*read_dataset_cache(target), from_cache)
@@ -0,0 +1,63 @@
+"""
+Timeline Downsampling
+Reduces long series to roughly the display resolution before plotting.
+Lines use Largest-Triangle-Three-Buckets (LTTB), which keeps the visual
+shape (peaks, dips, level changes) in linear time; event points such as
+falls can be forced into the output so they are never dropped.
+"""
+
+import numpy as np
+
+# About one point per horizontal pixel of a full-width dashboard chart
+DISPLAY_POINTS = 2000
+
+
+def lttb_indices(y, n_out=DISPLAY_POINTS, x=None):
+    """
+    Positions of the points LTTB keeps out of y (sorted, first and last
+    always included). x defaults to the sample position.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Average point of every bucket, used as the third triangle vertex
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    widths = np.diff(edges)
+    avg_x = np.append(sums_x / widths, x[-1])
+    avg_y = np.append(sums_y / widths, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        next_x, next_y = avg_x[b + 1], avg_y[b + 1]
+        # Twice the triangle area (prev point, candidate, next bucket average)
+        area = np.abs((x[prev] - next_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (next_y - y[prev]))
+        prev = lo + int(np.argmax(area))
+        selected[b + 1] = prev
+    return selected
+
+
+def downsample(y, n_out=DISPLAY_POINTS, keep=None, x=None):
+    """
+    LTTB positions for y, plus every position where the boolean mask keep
+    is set (e.g. fall events), sorted
+    """
+    indices = lttb_indices(y, n_out, x)
+    if keep is not None:
+        indices = np.union1d(indices, np.flatnonzero(np.asarray(keep, dtype=bool)))
+    return indices
+
+
+def background_positions(n, n_out=DISPLAY_POINTS):
+    """Evenly spaced positions standing in for a constant background of n samples"""
+    if n <= n_out:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, n_out).astype(np.int64))
@@ -0,0 +1,258 @@
+"""
+Evaluate Activity Model
+Subject-grouped k-fold cross-validation of the activity model's
+configuration on train.csv, a held-out test.csv evaluation, and inference
+latency, model size and load time, written as one JSON report so model
+versions can be compared.
+
+Folds run in a process pool. Workers memory-map the feature matrix from
+the binary dataset cache (dataset.py) instead of receiving a pickled
+copy, so all of them share one copy of X through the page cache.
+
+Usage:
+    python evaluate_model.py                          # promoted registry version, else activity_model.pkl
+    python evaluate_model.py --version 3 --folds 5
+    python evaluate_model.py --compare evaluation_v0002.json
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import GroupKFold
+
+from dataset import (
+    DATASET_CACHE_DIR, dataset_cache_path, file_fingerprint, find_dataset, load_har_dataset
+)
+from model_registry import REGISTRY_DIR, ModelRegistry
+
+LATENCY_REPEATS = 200
+BATCH_SIZES = [1, 32, 256]
+
+
+def _fit_fold(cache_target, feature_idx, estimator, fold, train_idx, test_idx):
+    """Fit and score one fold in a worker; X is a memory map of the dataset cache"""
+    # Index the map directly: only the fold's rows and features are copied
+    features = np.load(Path(cache_target) / "X.npy", mmap_mode='r')
+    labels = np.load(Path(cache_target) / "y.npy")
+
+    start = time.perf_counter()
+    estimator.fit(features[np.ix_(train_idx, feature_idx)], labels[train_idx])
+    fit_seconds = time.perf_counter() - start
+    y_pred = estimator.predict(features[np.ix_(test_idx, feature_idx)])
+    return {
+        'fold': fold,
+        'train_rows': len(train_idx),
+        'test_rows': len(test_idx),
+        'fit_seconds': fit_seconds,
+        'accuracy': float(accuracy_score(labels[test_idx], y_pred)),
+        'y_pred': y_pred
+    }
+
+
+def cross_validate(model, train_path, features, n_folds, workers):
+    """Subject-grouped k-fold CV of an unfitted clone of `model`; returns the report section"""
+    X, y, subject, _ = load_har_dataset(train_path)
+    if subject is None:
+        raise ValueError(f"{train_path} has no subject column to group folds by")
+    cache_target = dataset_cache_path(train_path, DATASET_CACHE_DIR)
+    column_index = {name: i for i, name in enumerate(X.columns)}
+    feature_idx = np.array([column_index[name] for name in features])
+
+    estimator = clone(model)
+    if 'n_jobs' in estimator.get_params():
+        # Parallelism comes from the folds
+        estimator.set_params(n_jobs=1)
+    if 'verbose' in estimator.get_params():
+        estimator.set_params(verbose=0)
+
+    splits = list(GroupKFold(n_splits=n_folds).split(X, y, groups=subject))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_fit_fold, cache_target, feature_idx, estimator, fold, train_idx, test_idx)
+                   for fold, (train_idx, test_idx) in enumerate(splits)]
+        folds = [future.result() for future in futures]
+
+    y_true = np.concatenate([y.to_numpy()[test_idx] for _, test_idx in splits])
+    y_pred = np.concatenate([fold.pop('y_pred') for fold in folds])
+    accuracies = [fold['accuracy'] for fold in folds]
+    return {
+        'folds': n_folds,
+        'grouped_by': 'subject',
+        'accuracy_mean': float(np.mean(accuracies)),
+        'accuracy_std': float(np.std(accuracies)),
+        'per_fold': folds,
+        'per_class': classification_report(y_true, y_pred, output_dict=True, zero_division=0)
+    }
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000)
+
+
+def measure_latency(model, X_test):
+    """Per-sample latency percentiles and batched throughput of model.predict"""
+    rows = [X_test.iloc[[i % len(X_test)]] for i in range(LATENCY_REPEATS)]
+    model.predict(rows[0])
+    single = []
+    for row in rows:
+        start = time.perf_counter()
+        model.predict(row)
+        single.append(time.perf_counter() - start)
+
+    batched = {}
+    for batch in BATCH_SIZES + [len(X_test)]:
+        frame = X_test.iloc[:batch]
+        repeats = max(3, min(50, 2000 // batch))
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.predict(frame)
+            best = min(best, time.perf_counter() - start)
+        batched[str(len(frame))] = {'seconds': best, 'samples_per_second': len(frame) / best}
+
+    return {
+        'per_sample_p50_ms': percentile_ms(single, 50),
+        'per_sample_p99_ms': percentile_ms(single, 99),
+        'batched': batched
+    }
+
+
+def compare_reports(report, baseline_path):
+    """Print headline metric deltas against a previous report"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    rows = [
+        ("CV accuracy", ('cross_validation', 'accuracy_mean'), "{:.2%}"),
+        ("Test accuracy", ('test', 'accuracy'), "{:.2%}"),
+        ("Latency p50 (ms)", ('latency', 'per_sample_p50_ms'), "{:.2f}"),
+        ("Latency p99 (ms)", ('latency', 'per_sample_p99_ms'), "{:.2f}"),
+        ("Model size (KB)", ('model', 'size_kb'), "{:.0f}"),
+        ("Load time (s)", ('model', 'load_seconds'), "{:.3f}")
+    ]
+    print(f"\n🔁 Compared with {baseline_path} ({baseline['model'].get('label', '?')})")
+    for label, (section, key), fmt in rows:
+        old, new = baseline.get(section, {}).get(key), report.get(section, {}).get(key)
+        if old is None or new is None:
+            continue
+        print(f"   {label:<18} {fmt.format(old):>10} → {fmt.format(new):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validate and benchmark the activity model")
+    parser.add_argument("--model", default=None, help="Model file (default: promoted registry version)")
+    parser.add_argument("--version", type=int, default=None, help="Registry version of 'activity' to evaluate")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: one per fold)")
+    parser.add_argument("--output", default=None, help="Report path (default: evaluation_<model>.json)")
+    parser.add_argument("--compare", default=None, help="Previous report to compare against")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(REGISTRY_DIR)
+    version = args.version if args.version is not None else (
+        None if args.model else registry.current_version("activity"))
+    if version is not None:
+        model_path = registry.model_path("activity", version)
+        label = f"activity v{version:04d}"
+    else:
+        model_path = Path(args.model or "activity_model.pkl")
+        label = model_path.stem
+    if not Path(model_path).exists():
+        print(f"❌ Model not found: {model_path}")
+        return 1
+
+    train_path, test_path = find_dataset("train.csv"), find_dataset("test.csv")
+    for path in (train_path, test_path):
+        if not path.exists():
+            print(f"❌ Dataset not found: {path}")
+            return 1
+
+    print("=" * 60)
+    print(f"Model Evaluation: {label}")
+    print("=" * 60)
+
+    load_times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        model = joblib.load(model_path)
+        load_times.append(time.perf_counter() - start)
+    if 'verbose' in model.get_params():
+        model.set_params(verbose=0)
+
+    X_test, y_test, _, _ = load_har_dataset(test_path)
+    features = list(getattr(model, "feature_names_in_", X_test.columns))
+    X_test = X_test[features]
+
+    print(f"\n📦 {model_path}: {Path(model_path).stat().st_size / 1024:.0f} KB, "
+          f"load {min(load_times):.3f}s, {len(features)} features")
+
+    print(f"\n🔀 {args.folds}-fold cross-validation grouped by subject...")
+    start = time.perf_counter()
+    cv = cross_validate(model, train_path, features, args.folds, args.workers or args.folds)
+    cv['wall_seconds'] = time.perf_counter() - start
+    for fold in cv['per_fold']:
+        print(f"   Fold {fold['fold'] + 1}: {fold['accuracy']:.2%} "
+              f"({fold['test_rows']} rows, fit {fold['fit_seconds']:.1f}s)")
+    print(f"   Mean: {cv['accuracy_mean']:.2%} ± {cv['accuracy_std']:.2%} in {cv['wall_seconds']:.1f}s")
+
+    print("\n🎯 Held-out test set...")
+    y_pred = model.predict(X_test)
+    test = {
+        'rows': len(X_test),
+        'accuracy': float(accuracy_score(y_test, y_pred)),
+        'per_class': classification_report(y_test, y_pred, output_dict=True, zero_division=0)
+    }
+    print(f"   Accuracy: {test['accuracy']:.2%}")
+    print(f"\n   {'class':<20} {'precision':>9} {'recall':>8} {'f1':>8}")
+    for name, metrics in test['per_class'].items():
+        if isinstance(metrics, dict) and name not in ('macro avg', 'weighted avg'):
+            print(f"   {name:<20} {metrics['precision']:>9.2%} {metrics['recall']:>8.2%} {metrics['f1-score']:>8.2%}")
+
+    print("\n⏱️ Inference latency...")
+    latency = measure_latency(model, X_test)
+    print(f"   Per sample: p50 {latency['per_sample_p50_ms']:.2f} ms, p99 {latency['per_sample_p99_ms']:.2f} ms")
+    for batch, result in latency['batched'].items():
+        print(f"   Batch {batch:>5}: {result['samples_per_second']:>10,.0f} samples/s")
+
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'model': {
+            'label': label,
+            'path': str(model_path),
+            'registry_version': version,
+            'sha256': file_fingerprint(model_path),
+            'size_kb': Path(model_path).stat().st_size / 1024,
+            'load_seconds': min(load_times),
+            'features': len(features),
+            'params': {k: v for k, v in model.get_params().items() if isinstance(v, (int, float, str, bool, type(None)))}
+        },
+        'data': {
+            'train': {'path': str(train_path), 'sha256': file_fingerprint(train_path)},
+            'test': {'path': str(test_path), 'sha256': file_fingerprint(test_path)}
+        },
+        'cross_validation': cv,
+        'test': test,
+        'latency': latency
+    }
+
+    output = args.output or f"evaluation_{label.replace(' ', '_')}.json"
+    tmp_output = f"{output}.tmp"
+    with open(tmp_output, 'w') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_output, output)
+    print(f"\n💾 Report written to {output}")
+
+    if args.compare:
+        compare_reports(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
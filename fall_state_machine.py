@@ -0,0 +1,177 @@
+"""
+Fall State Machine
+Streaming, per-subject version of the fall logic in decision_logic.md §5:
+an impact spike in body acceleration magnitude, then a sudden change of
+the gravity (orientation) vector, then low acceleration variance for a
+while after the impact. Each subject's state lives in a row of flat numpy
+arrays, so one step advances thousands of subjects at O(1) cost each.
+
+    IDLE ──impact──▶ IMPACT ──orientation change──▶ POST_IMPACT ──low variance──▶ fall
+      ▲                 │ no change in time             │ movement resumes
+      └─────────────────┴───────────────────────────────┘
+"""
+
+import numpy as np
+
+IDLE, IMPACT, POST_IMPACT = 0, 1, 2
+
+# Impact: magnitude this many baseline standard deviations above the baseline mean
+IMPACT_STD = 2.0
+# Samples after the impact in which the orientation change must happen
+POSTURE_WINDOW = 3
+# Angle (degrees) between the pre-impact and current gravity vector
+ORIENTATION_DEGREES = 45.0
+# Samples of post-impact inactivity required to confirm a fall
+INACTIVITY_WINDOW = 4
+# Post-impact magnitude std, relative to the baseline std, that counts as inactive
+INACTIVITY_STD_RATIO = 0.5
+# Smoothing of the per-subject magnitude baseline and reference orientation
+BASELINE_ALPHA = 0.05
+# Samples before a subject's baseline is trusted
+WARMUP_SAMPLES = 10
+
+
+class FallStateMachine:
+    """Impact → posture change → inactivity detector for many subjects at once"""
+
+    def __init__(self, capacity=1024, impact_std=IMPACT_STD, posture_window=POSTURE_WINDOW,
+                 orientation_degrees=ORIENTATION_DEGREES, inactivity_window=INACTIVITY_WINDOW,
+                 inactivity_std_ratio=INACTIVITY_STD_RATIO, baseline_alpha=BASELINE_ALPHA,
+                 warmup=WARMUP_SAMPLES):
+        self.impact_std = impact_std
+        self.posture_window = posture_window
+        self.min_cosine = np.cos(np.radians(orientation_degrees))
+        self.inactivity_window = inactivity_window
+        self.inactivity_std_ratio = inactivity_std_ratio
+        self.baseline_alpha = baseline_alpha
+        self.warmup = warmup
+        self.capacity = 0
+        self._allocate(capacity)
+
+    # Per-subject arrays: name -> (trailing shape, dtype)
+    FIELDS = {
+        'state': ((), np.int8),
+        'timer': ((), np.int32),
+        'count': ((), np.int64),
+        # EWMA mean / mean square of the magnitude while idle
+        'mag_mean': ((), np.float64),
+        'mag_sq': ((), np.float64),
+        # Gravity direction: smoothed while idle, frozen at the impact
+        'reference': ((3,), np.float64),
+        # Welford mean / M2 of the magnitude over the post-impact window
+        'post_mean': ((), np.float64),
+        'post_m2': ((), np.float64),
+        'falls': ((), np.int64)
+    }
+
+    def _allocate(self, capacity):
+        """Grow every per-subject array to hold subject ids < capacity"""
+        for name, (shape, dtype) in self.FIELDS.items():
+            fresh = np.zeros((capacity,) + shape, dtype=dtype)
+            if self.capacity:
+                fresh[:self.capacity] = getattr(self, name)
+            setattr(self, name, fresh)
+        self.capacity = capacity
+
+    def step(self, subjects, magnitude, gravity):
+        """
+        Advance each subject in `subjects` (unique non-negative ints) by one
+        sample. magnitude: (n,) acceleration magnitude, gravity: (n, 3).
+
+        Returns: boolean array, True where the sample completes a fall
+        """
+        subjects = np.asarray(subjects, dtype=np.int64)
+        magnitude = np.asarray(magnitude, dtype=np.float64)
+        gravity = np.asarray(gravity, dtype=np.float64)
+        if len(subjects) and subjects.max() >= self.capacity:
+            self._allocate(max(int(subjects.max()) + 1, 2 * self.capacity))
+
+        norm = np.linalg.norm(gravity, axis=1, keepdims=True)
+        direction = np.divide(gravity, norm, out=np.zeros_like(gravity), where=norm > 0)
+        state = self.state[subjects]
+        timer = self.timer[subjects] + 1
+        count = self.count[subjects] + 1
+        mean, sq = self.mag_mean[subjects], self.mag_sq[subjects]
+        std = np.sqrt(np.maximum(sq - mean * mean, 0.0))
+        falls = np.zeros(len(subjects), dtype=bool)
+
+        # IDLE: an impact freezes the reference orientation, otherwise keep learning the baseline
+        idle = state == IDLE
+        impact = idle & (count > self.warmup) & (magnitude > mean + self.impact_std * std)
+        learn = idle & ~impact
+        first = learn & (count == 1)
+        alpha = np.where(first, 1.0, self.baseline_alpha)[learn]
+        mean[learn] += alpha * (magnitude[learn] - mean[learn])
+        sq[learn] += alpha * (magnitude[learn] ** 2 - sq[learn])
+        reference = self.reference[subjects]
+        reference[learn] += alpha[:, None] * (direction[learn] - reference[learn])
+        state[impact] = IMPACT
+        timer[impact] = 0
+
+        # IMPACT: wait up to posture_window samples for the orientation to change
+        waiting = state == IMPACT
+        ref_norm = np.linalg.norm(reference, axis=1)
+        cosine = np.einsum('ij,ij->i', reference, direction) / np.where(ref_norm > 0, ref_norm, 1.0)
+        turned = waiting & (cosine < self.min_cosine)
+        state[turned] = POST_IMPACT
+        timer[turned] = 0
+        post_mean, post_m2 = self.post_mean[subjects], self.post_m2[subjects]
+        post_mean[turned] = 0.0
+        post_m2[turned] = 0.0
+        state[waiting & ~turned & (timer >= self.posture_window)] = IDLE
+
+        # POST_IMPACT: magnitude variance of the samples after the turn, until the window closes
+        lying = self.state[subjects] == POST_IMPACT
+        delta = magnitude[lying] - post_mean[lying]
+        post_mean[lying] += delta / timer[lying]
+        post_m2[lying] += delta * (magnitude[lying] - post_mean[lying])
+        closed = lying & (timer >= self.inactivity_window)
+        post_std = np.sqrt(post_m2 / np.maximum(timer, 1))
+        falls[closed] = post_std[closed] < self.inactivity_std_ratio * std[closed]
+        state[closed] = IDLE
+
+        self.state[subjects] = state
+        self.timer[subjects] = timer
+        self.count[subjects] = count
+        self.mag_mean[subjects] = mean
+        self.mag_sq[subjects] = sq
+        self.reference[subjects] = reference
+        self.post_mean[subjects] = post_mean
+        self.post_m2[subjects] = post_m2
+        self.falls[subjects] += falls
+        return falls
+
+    def reset(self, subjects):
+        """Forget everything about these subjects"""
+        for name in self.FIELDS:
+            getattr(self, name)[subjects] = 0
+
+
+def detect_falls_streaming(acc_mag, gravity, subjects=None, **params):
+    """
+    Replay recorded samples through a FallStateMachine, one step per sample
+    position with every subject advanced together (rows of a subject must be
+    in time order). Each fall is reported on the sample that confirms it.
+
+    Returns: boolean numpy array aligned with acc_mag
+    """
+    acc_mag = np.asarray(acc_mag, dtype=np.float64)
+    gravity = np.asarray(gravity, dtype=np.float64)
+    if subjects is None:
+        subjects = np.zeros(len(acc_mag), dtype=np.int64)
+    ids, subjects = np.unique(np.asarray(subjects), return_inverse=True)
+
+    # Position of each row within its subject's stream
+    order = np.argsort(subjects, kind='stable')
+    starts = np.searchsorted(subjects[order], np.arange(len(ids)))
+    position = np.empty(len(acc_mag), dtype=np.int64)
+    position[order] = np.arange(len(acc_mag)) - np.repeat(starts, np.bincount(subjects, minlength=len(ids)))
+
+    machine = FallStateMachine(capacity=max(len(ids), 1), **params)
+    falls = np.zeros(len(acc_mag), dtype=bool)
+    by_position = np.argsort(position, kind='stable')
+    bounds = np.searchsorted(position[by_position], np.arange(position.max() + 2 if len(position) else 1))
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        rows = by_position[lo:hi]
+        falls[rows] = machine.step(subjects[rows], acc_mag[rows], gravity[rows])
+    return falls
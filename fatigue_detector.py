@@ -0,0 +1,173 @@
+"""
+Streaming Fatigue Detector
+Online change-point detection on the motion and risk streams. Each stream
+keeps a fast EWMA (the current level), a slow EWMA mean/variance (the
+baseline) and a two-sided CUSUM on the standardized deviation from that
+baseline. Every update is O(1); shifts become timestamped events:
+
+    FATIGUE        motion and risk both shift up within PAIR_WINDOW samples
+    OVEREXERTION   motion shifts up to well above its baseline
+    INACTIVITY     motion shifts down to well below its baseline
+"""
+
+import math
+from collections import deque
+
+FAST_ALPHA = 0.2
+SLOW_ALPHA = 0.02
+# CUSUM slack and decision threshold, in baseline standard deviations
+CUSUM_SLACK = 1.0
+CUSUM_THRESHOLD = 8.0
+# Floor on the baseline standard deviation (relative to the baseline, and
+# absolute), so a constant stretch cannot switch the CUSUM off for good
+STD_FLOOR_RATIO = 0.05
+MIN_STD = 1e-3
+# Samples before the baseline is trusted
+WARMUP_SAMPLES = 100
+# Motion and risk up-shifts this close together count as one fatigue episode
+PAIR_WINDOW = 50
+OVEREXERTION_RATIO = 1.5
+INACTIVITY_RATIO = 0.5
+# A condition is reported active for this many samples after its event
+ACTIVE_SAMPLES = 300
+HISTORY_SAMPLES = 200
+MAX_EVENTS = 100
+
+
+class StreamMonitor:
+    """EWMA level, slow baseline and two-sided CUSUM for one signal"""
+
+    def __init__(self, fast_alpha=FAST_ALPHA, slow_alpha=SLOW_ALPHA,
+                 slack=CUSUM_SLACK, threshold=CUSUM_THRESHOLD, warmup=WARMUP_SAMPLES):
+        self.fast_alpha = fast_alpha
+        self.slow_alpha = slow_alpha
+        self.slack = slack
+        self.threshold = threshold
+        self.warmup = warmup
+        self.count = 0
+        self.level = None
+        self.baseline = None
+        self.variance = 0.0
+        self.upper = 0.0
+        self.lower = 0.0
+        self.baseline_before = None
+
+    def update(self, x):
+        """Returns +1 on an upward shift, -1 on a downward shift, else 0"""
+        self.count += 1
+        if self.level is None:
+            self.level = self.baseline = float(x)
+            return 0
+
+        self.level += self.fast_alpha * (x - self.level)
+        std = max(math.sqrt(self.variance), STD_FLOOR_RATIO * abs(self.baseline), MIN_STD)
+        z = (x - self.baseline) / std
+
+        # Baseline tracks slowly so a sustained shift accumulates in the CUSUM first;
+        # during warm-up 1/count makes it the plain running mean/variance
+        alpha = max(self.slow_alpha, 1 / self.count)
+        delta = x - self.baseline
+        self.baseline += alpha * delta
+        self.variance = (1 - alpha) * (self.variance + alpha * delta * delta)
+
+        if self.count <= self.warmup:
+            return 0
+        self.upper = max(0.0, self.upper + z - self.slack)
+        self.lower = max(0.0, self.lower - z - self.slack)
+
+        if self.upper > self.threshold or self.lower > self.threshold:
+            direction = 1 if self.upper > self.threshold else -1
+            # Re-anchor on the new level so the shift is reported once
+            self.upper = self.lower = 0.0
+            self.baseline_before = self.baseline
+            self.baseline = self.level
+            return direction
+        return 0
+
+    def state(self):
+        return {
+            'level': self.level,
+            'baseline': self.baseline,
+            'std': math.sqrt(self.variance),
+            'cusum_up': self.upper / self.threshold,
+            'cusum_down': self.lower / self.threshold
+        }
+
+
+class FatigueDetector:
+    """Fatigue / overexertion / inactivity events from the health sample stream"""
+
+    def __init__(self):
+        self.motion = StreamMonitor()
+        self.risk = StreamMonitor()
+        self.samples = 0
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.history = deque(maxlen=HISTORY_SAMPLES)
+        self._last_motion_up = None
+        self._last_risk_up = None
+        self._last_event = {}
+
+    @classmethod
+    def from_history(cls, df_health, replay=2000):
+        """Warm a detector up on the tail of an existing history"""
+        detector = cls()
+        if len(df_health) and {'motion', 'risk'} <= set(df_health.columns):
+            for entry in df_health.tail(replay).to_dict('records'):
+                detector.update(entry)
+        return detector
+
+    def _emit(self, kind, entry, baseline):
+        event = {
+            'type': kind,
+            'timestamp': entry.get('timestamp'),
+            'sample': self.samples,
+            'motion': self.motion.level,
+            'risk': self.risk.level,
+            'baseline_motion': baseline
+        }
+        self.events.append(event)
+        self._last_event[kind] = self.samples
+        return event
+
+    def update(self, entry):
+        """Fold one health sample (dict with motion, risk, timestamp); returns new events"""
+        self.samples += 1
+        motion_shift = self.motion.update(entry.get('motion', 0.0))
+        risk_shift = self.risk.update(entry.get('risk', 0))
+        self.history.append((entry.get('motion', 0.0), entry.get('risk', 0), self.motion.level, self.risk.level))
+
+        new_events = []
+        if motion_shift > 0:
+            self._last_motion_up = self.samples
+            baseline = self.motion.baseline_before
+            if self.motion.level > baseline * OVEREXERTION_RATIO:
+                new_events.append(self._emit('OVEREXERTION', entry, baseline))
+        elif motion_shift < 0:
+            baseline = self.motion.baseline_before
+            if self.motion.level < baseline * INACTIVITY_RATIO:
+                new_events.append(self._emit('INACTIVITY', entry, baseline))
+        if risk_shift > 0:
+            self._last_risk_up = self.samples
+
+        if (motion_shift > 0 or risk_shift > 0) and self._last_motion_up and self._last_risk_up \
+                and abs(self._last_motion_up - self._last_risk_up) <= PAIR_WINDOW:
+            new_events.append(self._emit('FATIGUE', entry, self.motion.baseline))
+            self._last_motion_up = self._last_risk_up = None
+        return new_events
+
+    def active(self, kind):
+        """True if a `kind` event fired within the last ACTIVE_SAMPLES samples"""
+        last = self._last_event.get(kind)
+        return last is not None and self.samples - last < ACTIVE_SAMPLES
+
+    def state(self):
+        """Everything the dashboard shows, without touching the history"""
+        return {
+            'samples': self.samples,
+            'motion': self.motion.state(),
+            'risk': self.risk.state(),
+            'fatigue': self.active('FATIGUE'),
+            'overexertion': self.active('OVEREXERTION'),
+            'inactivity': self.active('INACTIVITY'),
+            'events': list(self.events)
+        }
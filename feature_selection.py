@@ -0,0 +1,129 @@
+"""
+Importance-Driven Feature Selection
+Ranks features by Random Forest importance, evaluates reduced-feature
+variants and stores the selected feature list next to the reduced model.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FULL_MODEL_PATH = "activity_model.pkl"
+REDUCED_MODEL_PATH = "activity_model_reduced.pkl"
+REDUCED_FEATURES_PATH = "activity_model_reduced.features.json"
+REPORT_PATH = "feature_selection_report.csv"
+
+# Candidate subset sizes evaluated when no explicit --top-k list is given
+DEFAULT_K_VALUES = [10, 25, 50, 100, 200]
+
+
+def rank_features(model, feature_names):
+    """Return feature names sorted by descending importance"""
+    order = np.argsort(model.feature_importances_)[::-1]
+    return [feature_names[i] for i in order]
+
+
+def measure_inference(model, X, single_repeats=50):
+    """
+    Measure per-sample and batched prediction cost
+
+    Returns: dict with single-sample latency (ms), batch throughput
+    (samples/s) and the memory footprint of the feature matrix
+    """
+    single_row = X.iloc[:1]
+    model.predict(single_row)  # warm up
+
+    timings = []
+    for _ in range(single_repeats):
+        start = time.perf_counter()
+        model.predict(single_row)
+        timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    model.predict(X)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'latency_ms_p50': float(np.median(timings) * 1000),
+        'batch_samples_per_s': float(len(X) / batch_seconds) if batch_seconds > 0 else float('inf'),
+        'feature_bytes_per_sample': int(X.shape[1] * X.dtypes.iloc[0].itemsize),
+        'feature_matrix_mb': float(X.memory_usage(index=False).sum() / 1024 ** 2)
+    }
+
+
+def evaluate_feature_subsets(base_model, ranked_features, X_train, y_train,
+                             X_test, y_test, k_values):
+    """
+    Retrain the base model configuration on the top-k features for each k
+
+    Returns: (report DataFrame sorted by k, dict of k -> fitted model)
+    """
+    # Imported here: the dashboard imports this module for its paths only
+    from sklearn.base import clone
+    from sklearn.metrics import accuracy_score
+
+    rows = []
+    models = {}
+
+    for k in sorted(set(k_values)):
+        k = min(k, len(ranked_features))
+        features = ranked_features[:k]
+
+        model = clone(base_model).set_params(verbose=0)
+        start = time.perf_counter()
+        model.fit(X_train[features], y_train)
+        fit_seconds = time.perf_counter() - start
+
+        accuracy = accuracy_score(y_test, model.predict(X_test[features]))
+        cost = measure_inference(model, X_test[features])
+
+        rows.append({'k': k, 'test_accuracy': accuracy, 'fit_seconds': fit_seconds, **cost})
+        models[k] = model
+
+    return pd.DataFrame(rows).drop_duplicates('k').sort_values('k').reset_index(drop=True), models
+
+
+def choose_subset(report, full_accuracy, max_accuracy_loss):
+    """
+    Pick the smallest k whose accuracy is within max_accuracy_loss of the
+    full model; falls back to the most accurate k if none qualifies
+    """
+    within_budget = report[full_accuracy - report['test_accuracy'] <= max_accuracy_loss]
+    if not within_budget.empty:
+        return int(within_budget['k'].iloc[0])
+    return int(report.loc[report['test_accuracy'].idxmax(), 'k'])
+
+
+def save_feature_list(features, path=REDUCED_FEATURES_PATH, **metadata):
+    """Write the ordered feature list (plus optional metadata) as JSON"""
+    with open(path, 'w') as f:
+        json.dump({'features': list(features), **metadata}, f, indent=2)
+
+
+def load_feature_list(path=REDUCED_FEATURES_PATH):
+    """Load a feature list written by save_feature_list, or None if missing"""
+    if not Path(path).exists():
+        return None
+
+    with open(path) as f:
+        return json.load(f)['features']
+
+
+def fallback_model(full_path=FULL_MODEL_PATH, reduced_path=REDUCED_MODEL_PATH,
+                   features_path=REDUCED_FEATURES_PATH):
+    """
+    Model file to serve when no registry version is promoted: the reduced
+    variant if it was derived from the current full model (saved no
+    earlier than it), else the full model. A later full or incremental
+    retrain makes the reduced variant stale.
+
+    Returns: (model path, tuple of feature names or None)
+    """
+    full, reduced = Path(full_path), Path(reduced_path)
+    if reduced.exists() and Path(features_path).exists() and (
+            not full.exists() or reduced.stat().st_mtime >= full.stat().st_mtime):
+        return str(reduced), tuple(load_feature_list(features_path))
+    return str(full), None
@@ -0,0 +1,92 @@
+"""
+Feature Statistics
+Per-feature summary statistics of a HAR dataset (count, mean, std,
+quartiles, min/max and the mean per activity), computed in one
+vectorized pass and stored next to the dataset's binary cache, so each
+dataset version is summarized once. Helpers filter and paginate the
+resulting one-row-per-feature table for the Dataset Explorer.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset import DATASET_CACHE_DIR, dataset_cache_path, load_har_dataset
+
+STATS_FILE = "feature_stats.parquet"
+
+SUMMARY_COLUMNS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def activity_column(activity):
+    return f"mean[{activity}]"
+
+
+def compute_feature_stats(X, y=None):
+    """
+    One row per feature column of X: SUMMARY_COLUMNS (as in
+    DataFrame.describe) plus mean[<activity>] for each label in y
+    """
+    values = np.asarray(X, dtype=np.float64)
+    count = np.sum(~np.isnan(values), axis=0)
+    quartiles = np.nanpercentile(values, [0, 25, 50, 75, 100], axis=0)
+    stats = pd.DataFrame({
+        'count': count,
+        'mean': np.nanmean(values, axis=0),
+        'std': np.nanstd(values, axis=0, ddof=1),
+        'min': quartiles[0],
+        '25%': quartiles[1],
+        '50%': quartiles[2],
+        '75%': quartiles[3],
+        'max': quartiles[4]
+    }, index=pd.Index(X.columns, name='feature'))
+
+    if y is not None:
+        labels = np.asarray(y)
+        for activity in sorted(pd.unique(labels)):
+            stats[activity_column(activity)] = np.nanmean(values[labels == activity], axis=0)
+    return stats
+
+
+def load_feature_stats(path, cache_dir=DATASET_CACHE_DIR):
+    """
+    Feature statistics of a HAR CSV, read from the dataset cache when this
+    version of the file was already summarized
+
+    Returns: (stats DataFrame, from_cache)
+    """
+    target = dataset_cache_path(path, cache_dir)
+    stats_path = target / STATS_FILE
+    if stats_path.exists():
+        return pd.read_parquet(stats_path), True
+
+    X, y, _, _ = load_har_dataset(path, cache_dir)
+    stats = compute_feature_stats(X, y)
+    tmp_path = stats_path.with_name(f"{STATS_FILE}.tmp-{os.getpid()}")
+    stats.to_parquet(tmp_path)
+    os.replace(tmp_path, stats_path)
+    return stats, False
+
+
+def filter_features(stats, query):
+    """Rows whose feature name contains every whitespace-separated term of query (case-insensitive)"""
+    terms = query.lower().split()
+    if not terms:
+        return stats
+    names = stats.index.str.lower()
+    mask = np.ones(len(stats), dtype=bool)
+    for term in terms:
+        mask &= names.str.contains(term, regex=False)
+    return stats[mask]
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def paginate(frame, page, page_size):
+    """Rows of 1-based `page`; page is clamped to the valid range"""
+    page = min(max(page, 1), page_count(len(frame), page_size))
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size]
@@ -0,0 +1,65 @@
+"""
+Rendered Figure Cache
+Keeps rendered matplotlib figures as PNG bytes keyed by panel name, a
+version counter of the underlying data and the widget parameters, so a
+dashboard rerun only re-renders panels whose inputs actually changed.
+"""
+
+import io
+import threading
+from collections import OrderedDict
+
+# Same savefig settings st.pyplot uses, so cached panels look identical
+SAVEFIG_KWARGS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+MAX_ENTRIES = 64
+
+
+def figure_to_png(fig):
+    """Render a figure to PNG bytes and release it"""
+    # Imported here so creating a cache does not pull in matplotlib at app startup
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **SAVEFIG_KWARGS)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+class FigureCache:
+    """LRU cache of rendered panels"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, panel, data_version, render, **params):
+        """
+        Return the PNG for (panel, data_version, params), calling render()
+        (which must return a matplotlib figure) only on a miss
+        """
+        key = (panel, data_version, tuple(sorted(params.items())))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        png = figure_to_png(render())
+
+        with self._lock:
+            self.misses += 1
+            # Older versions of the same panel can never be hit again
+            for stale in [k for k in self._entries if k[0] == panel and k[1] != data_version]:
+                del self._entries[stale]
+            self._entries[key] = png
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return png
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,192 @@
+"""
+Memory-Mapped Forest Artifact
+A startup-optimized on-disk format for fitted RandomForestClassifier
+models: every tree's node arrays are concatenated into flat arrays stored
+uncompressed at page-aligned offsets in one binary file, described by a
+small JSON manifest. Loading memory-maps the file instead of unpickling
+thousands of objects, so it takes milliseconds regardless of forest size
+and every process serving the model shares the same page-cache pages.
+
+Layout:
+    activity_model.forest/manifest.json
+    activity_model.forest/trees.bin
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+FORMAT_VERSION = 1
+PAGE_SIZE = 4096
+
+MANIFEST_NAME = "manifest.json"
+DATA_NAME = "trees.bin"
+
+# Flat per-node arrays; children hold global node indices (-1 for leaves)
+ARRAYS = {
+    'left': np.int32,
+    'right': np.int32,
+    'feature': np.int32,
+    'threshold': np.float64,
+    'value': np.float64
+}
+
+
+def forest_artifact_path(model_path):
+    """activity_model.pkl -> activity_model.forest"""
+    return Path(model_path).with_suffix(".forest")
+
+
+def _flatten(model):
+    """Concatenate the trees' node arrays, rebasing child indices"""
+    left, right, feature, threshold, value, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        roots.append(offset)
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        # Leaf class distributions, normalized as in DecisionTreeClassifier.predict_proba
+        leaf_value = tree.value[:, 0, :]
+        totals = leaf_value.sum(axis=1, keepdims=True)
+        value.append(leaf_value / np.where(totals == 0, 1, totals))
+        offset += tree.node_count
+    arrays = {
+        'left': np.concatenate(left),
+        'right': np.concatenate(right),
+        'feature': np.concatenate(feature),
+        'threshold': np.concatenate(threshold),
+        'value': np.concatenate(value)
+    }
+    return arrays, np.array(roots)
+
+
+def save_forest(model, path):
+    """
+    Write a fitted RandomForestClassifier as a forest artifact directory
+    (atomic replace)
+
+    Returns: the artifact path
+    """
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("only single-output forests are supported")
+    path = Path(path)
+    arrays, roots = _flatten(model)
+    arrays['roots'] = roots.astype(np.int32)
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir(parents=True)
+
+    layout = {}
+    position = 0
+    with open(tmp_path / DATA_NAME, 'wb') as f:
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array, dtype=ARRAYS.get(name, np.int32))
+            padding = -position % PAGE_SIZE
+            f.write(b"\0" * padding)
+            position += padding
+            layout[name] = {'offset': position, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            f.write(array.tobytes())
+            position += array.nbytes
+
+    feature_names = getattr(model, "feature_names_in_", None)
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'n_trees': len(model.estimators_),
+        'n_nodes': int(len(arrays['left'])),
+        'max_depth': int(max(estimator.tree_.max_depth for estimator in model.estimators_)),
+        'n_features': int(model.n_features_in_),
+        'feature_names': [str(name) for name in feature_names] if feature_names is not None else None,
+        'classes': [c.item() if isinstance(c, np.generic) else c for c in model.classes_],
+        'arrays': layout
+    }
+    with open(tmp_path / MANIFEST_NAME, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    if path.exists():
+        shutil.rmtree(path)
+    os.rename(tmp_path, path)
+    return path
+
+
+class ForestArtifact:
+    """
+    Read-only forest backed by a memory map; predict() traverses all trees
+    for all rows at once, one tree level per step
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / MANIFEST_NAME) as f:
+            manifest = json.load(f)
+        if manifest['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"unsupported forest artifact version {manifest['format_version']}")
+        self.manifest = manifest
+
+        self._buffer = np.memmap(self.path / DATA_NAME, dtype=np.uint8, mode='r')
+        for name, spec in manifest['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape']))
+            start = spec['offset']
+            view = self._buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+            setattr(self, name, view)
+
+        self.classes_ = np.array(manifest['classes'], dtype=object if isinstance(
+            manifest['classes'][0], str) else None)
+        self.n_features_in_ = manifest['n_features']
+        self.n_estimators = manifest['n_trees']
+        if manifest['feature_names'] is not None:
+            self.feature_names_in_ = np.array(manifest['feature_names'], dtype=object)
+
+    def _as_array(self, X):
+        # DataFrames are duck-typed: importing pandas would dominate cold start
+        if hasattr(X, "columns"):
+            names = getattr(self, "feature_names_in_", None)
+            if names is not None:
+                X = X[list(names)]
+            X = X.to_numpy()
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"expected {self.n_features_in_} features, got shape {X.shape}")
+        # Compare at the precision the trees were fitted at (sklearn casts X to float32)
+        return X.astype(np.float32, copy=False)
+
+    def apply(self, X):
+        """(n_samples, n_trees) leaf index reached in each tree"""
+        X = self._as_array(X)
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        rows = np.arange(len(X))[:, None]
+        for _ in range(self.manifest['max_depth']):
+            left = self.left[nodes]
+            internal = left != -1
+            if not internal.any():
+                break
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(go_left, left, self.right[nodes]), nodes)
+        return nodes
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        proba = np.zeros((len(leaves), len(self.classes_)))
+        # Accumulate tree by tree, in the same order as RandomForestClassifier
+        for t in range(leaves.shape[1]):
+            proba += self.value[leaves[:, t]]
+        return proba / leaves.shape[1]
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def nbytes(self):
+        return self._buffer.nbytes
+
+
+def load_forest(path):
+    return ForestArtifact(path)
@@ -0,0 +1,293 @@
+"""
+Health History Store
+Durable, append-only columnar storage for the Health Trend history.
+Samples are buffered and written as Arrow IPC record batches to an active
+segment file; full segments are sealed, small sealed segments are
+compacted together and segments past the retention policy are dropped.
+Each sealed segment records its row count and newest timestamp in its
+schema metadata, so compaction plans from metadata alone and reads only
+the segments it merges. Reads memory-map only the newest segments needed
+for the requested window and convert only its rows.
+
+Layout (under health_store/):
+    00000012.active             segment currently being appended to
+    00000003-00000011.arrow     sealed segment covering sequences 3..11
+"""
+
+import os
+import threading
+from collections import deque
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+HEALTH_STORE_DIR = "health_store"
+
+# Rows buffered in memory before a record batch is written
+FLUSH_ROWS = 100
+# Rows after which the active segment is sealed
+SEGMENT_ROWS = 50_000
+# Record batch size inside sealed segments
+SEALED_BATCH_ROWS = 4096
+# Retention: drop sealed segments whose newest sample is older than this
+RETENTION_DAYS = 30
+# Samples restored into a new dashboard session
+RESTORE_ROWS = 100_000
+
+SCHEMA = pa.schema([
+    ('timestamp', pa.timestamp('us')),
+    ('activity', pa.string()),
+    ('risk', pa.float64()),
+    ('motion', pa.float64()),
+    ('fall', pa.bool_()),
+    ('alert', pa.bool_()),
+    ('anomaly', pa.bool_())
+])
+
+
+def read_segment(path):
+    """All complete record batches of a segment (a torn last batch is ignored)"""
+    return read_segment_tail(path, None)
+
+
+def read_segment_tail(path, n_rows):
+    """
+    The last n_rows of a segment (all rows if n_rows is None). Batches are
+    zero-copy views of the memory map; earlier ones are dropped unconverted.
+    """
+    batches = deque()
+    rows = 0
+    with pa.memory_map(str(path)) as source:
+        try:
+            reader = ipc.open_stream(source)
+            for batch in reader:
+                batches.append(batch)
+                rows += batch.num_rows
+                while n_rows is not None and batches and rows - batches[0].num_rows >= n_rows:
+                    rows -= batches.popleft().num_rows
+        except pa.ArrowInvalid:
+            # Crash mid-write: keep what was fully written
+            pass
+    table = pa.Table.from_batches(list(batches), schema=SCHEMA)
+    return table if n_rows is None else table.slice(max(table.num_rows - n_rows, 0))
+
+
+def segment_info(table):
+    """(rows, newest timestamp or None) of a segment's table"""
+    newest = pc.max(table.column('timestamp')).as_py() if table.num_rows else None
+    return table.num_rows, newest
+
+
+def read_segment_info(path):
+    """(rows, newest timestamp) from a sealed segment's schema metadata; None if it has none"""
+    with pa.memory_map(str(path)) as source:
+        metadata = ipc.open_stream(source).schema.metadata or {}
+    if b'rows' not in metadata:
+        return None
+    newest = metadata[b'newest'].decode()
+    return int(metadata[b'rows']), pd.Timestamp(newest).to_pydatetime() if newest else None
+
+
+def write_segment(path, table):
+    """Write a sealed segment atomically; returns its segment_info"""
+    rows, newest = segment_info(table)
+    schema = SCHEMA.with_metadata({'rows': str(rows), 'newest': newest.isoformat() if newest else ''})
+    tmp_path = f"{path}.tmp"
+    with ipc.new_stream(tmp_path, schema) as writer:
+        writer.write_table(table.cast(schema), max_chunksize=SEALED_BATCH_ROWS)
+    os.replace(tmp_path, path)
+    return rows, newest
+
+
+def _sealed_range(path):
+    first, last = path.stem.split("-")
+    return int(first), int(last)
+
+
+class HealthStore:
+    """Append-only segment store for health samples, shared by all sessions in the process"""
+
+    def __init__(self, root=HEALTH_STORE_DIR, flush_rows=FLUSH_ROWS, segment_rows=SEGMENT_ROWS,
+                 retention_days=RETENTION_DAYS):
+        self.root = Path(root)
+        self.flush_rows = flush_rows
+        self.segment_rows = segment_rows
+        self.retention_days = retention_days
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Sealed segments are immutable: file name -> (rows, newest timestamp)
+        self._info = {}
+        self._buffer = []
+        self._writer = None
+        self._active_path = None
+        self._active_rows = 0
+
+        # An active segment left by a previous process is sealed as-is
+        for path in sorted(self.root.glob("*.active")):
+            self._seal_file(path)
+        self.compact()
+
+    def _sealed_segments(self):
+        """Sealed segment paths in sequence order, skipping ranges a compaction superseded"""
+        segments = sorted(self.root.glob("*.arrow"), key=_sealed_range)
+        live = []
+        for path in segments:
+            first, last = _sealed_range(path)
+            if live and first <= _sealed_range(live[-1])[1]:
+                # Left behind by an interrupted compaction: the wider segment wins
+                if last - first > _sealed_range(live[-1])[1] - _sealed_range(live[-1])[0]:
+                    live[-1].unlink()
+                    live[-1] = path
+                else:
+                    path.unlink()
+                continue
+            live.append(path)
+        return live
+
+    def _next_sequence(self):
+        sequences = [_sealed_range(p)[1] for p in self.root.glob("*.arrow")]
+        sequences += [int(p.stem) for p in self.root.glob("*.active")]
+        return max(sequences, default=-1) + 1
+
+    def _seal_file(self, path):
+        sequence = int(path.stem)
+        table = read_segment(path)
+        if table.num_rows:
+            sealed = self.root / f"{sequence:08d}-{sequence:08d}.arrow"
+            self._info[sealed.name] = write_segment(sealed, table)
+        path.unlink()
+
+    def _segment_info(self, path):
+        """(rows, newest timestamp) of a sealed segment, reading at most its schema"""
+        info = self._info.get(path.name)
+        if info is None:
+            # Segments written before metadata was recorded are scanned once
+            info = read_segment_info(path) or segment_info(read_segment(path))
+            self._info[path.name] = info
+        return info
+
+    def append(self, entry):
+        """Buffer one sample (the dict passed to HealthHistory.append)"""
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) >= self.flush_rows:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return 0
+        frame = pd.DataFrame(self._buffer).reindex(columns=SCHEMA.names)
+        batch = pa.RecordBatch.from_pandas(frame, schema=SCHEMA, preserve_index=False)
+        if self._writer is None:
+            self._active_path = self.root / f"{self._next_sequence():08d}.active"
+            self._writer = ipc.new_stream(str(self._active_path), SCHEMA)
+            self._active_rows = 0
+        self._writer.write_batch(batch)
+        written = len(self._buffer)
+        self._active_rows += written
+        self._buffer = []
+        if self._active_rows >= self.segment_rows:
+            self._seal_locked()
+        return written
+
+    def _seal_locked(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._seal_file(self._active_path)
+            self._active_path = None
+
+    def flush(self, seal=False):
+        """Write buffered samples; seal=True also closes the active segment. Returns rows written"""
+        with self._lock:
+            written = self._flush_locked()
+            if seal:
+                self._seal_locked()
+        if seal:
+            self.compact()
+        return written
+
+    def read_recent(self, n_rows=RESTORE_ROWS):
+        """The newest n_rows samples, converting only those rows of the segments that hold them"""
+        with self._lock:
+            paths = self._sealed_segments()
+            if self._active_path is not None:
+                paths.append(self._active_path)
+            buffered = pd.DataFrame(self._buffer).reindex(columns=SCHEMA.names) if self._buffer else None
+
+            tables = []
+            rows = 0 if buffered is None else len(buffered)
+            for path in reversed(paths):
+                if rows >= n_rows:
+                    break
+                table = read_segment_tail(path, n_rows - rows)
+                tables.append(table)
+                rows += table.num_rows
+
+        frames = [t.to_pandas() for t in reversed(tables) if t.num_rows]
+        if buffered is not None:
+            frames.append(buffered)
+        if not frames:
+            return pd.DataFrame()
+        history = pd.concat(frames, ignore_index=True)
+        return history.tail(n_rows).reset_index(drop=True)
+
+    def compact(self):
+        """
+        Apply retention, then merge runs of small sealed segments into
+        segments of up to segment_rows rows. Planned from segment metadata;
+        only the segments being merged are read.
+        """
+        with self._lock:
+            segments = self._sealed_segments()
+            cutoff = pd.Timestamp.now() - pd.Timedelta(days=self.retention_days)
+
+            # Segments are in append order, so retention stops at the first one it keeps
+            kept = []
+            for i, path in enumerate(segments):
+                rows, newest = self._segment_info(path)
+                if newest is None or newest < cutoff:
+                    path.unlink()
+                    self._info.pop(path.name, None)
+                    continue
+                kept = [(p, self._segment_info(p)[0]) for p in segments[i:]]
+                break
+
+            run, run_rows = [], 0
+            for path, rows in kept + [(None, 0)]:
+                if path is not None and run_rows + rows <= self.segment_rows:
+                    run.append(path)
+                    run_rows += rows
+                    continue
+                if len(run) > 1:
+                    first, last = _sealed_range(run[0])[0], _sealed_range(run[-1])[1]
+                    merged = pa.concat_tables([read_segment(p) for p in run])
+                    merged_path = self.root / f"{first:08d}-{last:08d}.arrow"
+                    self._info[merged_path.name] = write_segment(merged_path, merged)
+                    for p in run:
+                        p.unlink()
+                        self._info.pop(p.name, None)
+                run, run_rows = ([path], rows) if path is not None else ([], 0)
+
+    def size_bytes(self):
+        """Bytes on disk of all segments (buffered samples not included)"""
+        return sum(path.stat().st_size for path in list(self.root.glob("*.arrow")) + list(self.root.glob("*.active")))
+
+    def segment_count(self):
+        return len(self._sealed_segments()) + (self._active_path is not None)
+
+    def clear(self):
+        """Delete every stored sample"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+                self._active_path = None
+            self._buffer = []
+            self._info = {}
+            for path in list(self.root.glob("*.arrow")) + list(self.root.glob("*.active")):
+                path.unlink()
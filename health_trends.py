@@ -0,0 +1,210 @@
+"""
+Health Trend Aggregations
+History bookkeeping and the aggregates behind the Health Trend Dashboard:
+summary cards, alert severity counts, activity distribution and the
+statistics of the most recent window. HealthAggregates keeps the
+whole-history numbers current per appended sample, so the dashboard does
+not rescan the history on every rerun.
+"""
+
+from collections import Counter, deque
+
+import numpy as np
+import pandas as pd
+
+SEVERITIES = ['INFO', 'WARNING', 'CRITICAL', 'EMERGENCY']
+
+# Samples in the recent window behind recent_stats
+TREND_WINDOW = 50
+
+
+class HealthHistory:
+    """
+    Health samples in arrival order. append() only buffers the sample
+    dict; pending samples are folded into the DataFrame when the history
+    is read, so the live loop pays O(1) per sample.
+    """
+
+    def __init__(self, frame=None):
+        self._frame = frame if frame is not None else pd.DataFrame()
+        self._pending = []
+
+    def append(self, entry):
+        """Buffer one health sample (dict)"""
+        self._pending.append(entry)
+
+    def __len__(self):
+        return len(self._frame) + len(self._pending)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def has_column(self, name):
+        """True if samples carry `name`, without building the frame"""
+        if self._pending:
+            return name in self._pending[-1]
+        return name in self._frame.columns
+
+    def timestamp_range(self):
+        """(first, last) timestamp without building the frame, or None while empty"""
+        if self.empty or not self.has_column('timestamp'):
+            return None
+        first = self._frame['timestamp'].iloc[0] if len(self._frame) else self._pending[0]['timestamp']
+        last = self._pending[-1]['timestamp'] if self._pending else self._frame['timestamp'].iloc[-1]
+        return first, last
+
+    def frame(self):
+        """The whole history as a DataFrame"""
+        if self._pending:
+            pending = pd.DataFrame(self._pending)
+            self._frame = pending if self._frame.empty else pd.concat([self._frame, pending], ignore_index=True)
+            self._pending = []
+        return self._frame
+
+
+def health_summary(df_health):
+    """Values for the top summary cards"""
+    has_rows = len(df_health) > 0
+    return {
+        'total_samples': len(df_health),
+        'total_falls': int(df_health['fall'].sum()) if 'fall' in df_health.columns else 0,
+        'highest_risk': df_health['risk'].max() if 'risk' in df_health.columns and has_rows else 0,
+        'avg_risk': df_health['risk'].mean() if 'risk' in df_health.columns and has_rows else 0,
+        'total_alerts': int(df_health['alert'].sum()) if 'alert' in df_health.columns else 0,
+        'total_anomalies': int(df_health['anomaly'].sum()) if 'anomaly' in df_health.columns else 0
+    }
+
+
+def classify_severity(entry):
+    """Severity SafetyAlertSystem would give one sample, or None"""
+    if entry.get('fall', False):
+        return 'EMERGENCY'
+    if entry.get('alert', False):
+        return 'CRITICAL'
+    if entry.get('anomaly', False):
+        return 'WARNING'
+    if entry.get('risk', 0) >= 60:
+        return 'INFO'
+    return None
+
+
+def alert_severity_counts(df_health):
+    """Classify each sample the way SafetyAlertSystem would and count per severity"""
+    n = len(df_health)
+
+    def flags(column):
+        if column not in df_health.columns:
+            return np.zeros(n, dtype=bool)
+        return df_health[column].fillna(False).to_numpy(dtype=bool)
+
+    risk = df_health['risk'].fillna(0).to_numpy() if 'risk' in df_health.columns else np.zeros(n)
+    # Same precedence as classify_severity; -1 = no alert
+    levels = np.select(
+        [flags('fall'), flags('alert'), flags('anomaly'), risk >= 60],
+        [3, 2, 1, 0],
+        default=-1
+    )
+    counts = np.bincount(levels[levels >= 0], minlength=len(SEVERITIES))
+    return {severity: int(count) for severity, count in zip(SEVERITIES, counts)}
+
+
+def activity_distribution(df_health):
+    """Activity value counts, or None if the history has no activity column"""
+    if 'activity' not in df_health.columns:
+        return None
+    return df_health['activity'].value_counts()
+
+
+class HealthAggregates:
+    """
+    Whole-history Health Trend aggregates, updated in O(1) per sample
+
+    Mirrors health_summary, alert_severity_counts and
+    activity_distribution, plus the statistics of the most recent window.
+    """
+
+    def __init__(self, window=TREND_WINDOW):
+        self.total_samples = 0
+        self.total_falls = 0
+        self.total_alerts = 0
+        self.total_anomalies = 0
+        self.risk_sum = 0.0
+        self.highest_risk = 0
+        self.severities = {severity: 0 for severity in SEVERITIES}
+        self.activities = Counter()
+        self.recent = deque(maxlen=window)
+
+    @classmethod
+    def from_history(cls, df_health, window=TREND_WINDOW):
+        """Build the aggregates for an existing history in one vectorized pass"""
+        aggregates = cls(window)
+        if len(df_health) == 0:
+            return aggregates
+        summary = health_summary(df_health)
+        aggregates.total_samples = summary['total_samples']
+        aggregates.total_falls = summary['total_falls']
+        aggregates.total_alerts = summary['total_alerts']
+        aggregates.total_anomalies = summary['total_anomalies']
+        if 'risk' in df_health.columns:
+            aggregates.risk_sum = float(df_health['risk'].sum())
+            aggregates.highest_risk = summary['highest_risk']
+        aggregates.severities = alert_severity_counts(df_health)
+        activity_counts = activity_distribution(df_health)
+        if activity_counts is not None:
+            aggregates.activities = Counter(activity_counts.to_dict())
+        tail = df_health.tail(window)
+        aggregates.recent.extend(zip(tail.get('motion', [0.0] * len(tail)), tail.get('risk', [0] * len(tail))))
+        return aggregates
+
+    def update(self, entry):
+        """Fold one appended sample (the dict passed to HealthHistory.append)"""
+        self.total_samples += 1
+        self.total_falls += bool(entry.get('fall', False))
+        self.total_alerts += bool(entry.get('alert', False))
+        self.total_anomalies += bool(entry.get('anomaly', False))
+
+        risk = entry.get('risk', 0)
+        motion = entry.get('motion', 0.0)
+        self.risk_sum += risk
+        self.highest_risk = max(self.highest_risk, risk)
+
+        severity = classify_severity(entry)
+        if severity is not None:
+            self.severities[severity] += 1
+        if 'activity' in entry:
+            self.activities[entry['activity']] += 1
+        self.recent.append((motion, risk))
+
+    def summary(self):
+        """Same values as health_summary(history)"""
+        return {
+            'total_samples': self.total_samples,
+            'total_falls': self.total_falls,
+            'highest_risk': self.highest_risk,
+            'avg_risk': self.risk_sum / self.total_samples if self.total_samples else 0,
+            'total_alerts': self.total_alerts,
+            'total_anomalies': self.total_anomalies
+        }
+
+    def severity_counts(self):
+        return dict(self.severities)
+
+    def activity_counts(self):
+        """Same as activity_distribution(history): counts, most common first"""
+        if not self.activities:
+            return None
+        return pd.Series(dict(self.activities.most_common()), name='count')
+
+    def recent_stats(self):
+        """Mean/std/max of motion and risk over the most recent window"""
+        if not self.recent:
+            return None
+        values = np.array(self.recent, dtype=float)
+        return {
+            'samples': len(values),
+            'motion_mean': values[:, 0].mean(),
+            'motion_std': values[:, 0].std(),
+            'risk_mean': values[:, 1].mean(),
+            'risk_max': values[:, 1].max()
+        }
@@ -0,0 +1,163 @@
+"""
+Hyperparameter Sweep
+Grid or random search over the Random Forest configuration. Candidates
+are fitted concurrently in a process pool on a subject-grouped split of
+train.csv; workers memory-map the features from the binary dataset cache
+(dataset.py), so they share one read-only copy of the data. Latency is
+measured after the pool is done, with the deployed n_jobs. Candidates
+are ranked by validation accuracy among those that fit the per-sample
+latency and model-size budget, then by how close the rest come to it.
+"""
+
+import itertools
+import pickle
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import GroupShuffleSplit
+
+from dataset import DATASET_CACHE_DIR, dataset_cache_path, load_har_dataset
+
+SWEEP_REPORT_PATH = "hyperparameter_sweep_report.csv"
+
+# The configuration train_model.py used before sweeps existed
+DEFAULT_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 20,
+    'min_samples_split': 10,
+    'min_samples_leaf': 4
+}
+
+PARAM_GRID = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [10, 20, None],
+    'min_samples_split': [2, 10],
+    'min_samples_leaf': [1, 4]
+}
+
+# Real-time budget for the deployed model
+MAX_LATENCY_MS = 20.0
+MAX_MODEL_SIZE_KB = 20 * 1024
+# train_model.py deploys the forest with n_jobs=-1, so latency is measured with it
+DEPLOYED_N_JOBS = -1
+
+# Fraction of training subjects held out for validation
+VALIDATION_SUBJECTS = 0.25
+LATENCY_REPEATS = 50
+
+
+def candidate_configs(grid=PARAM_GRID, samples=None, seed=42):
+    """Every grid combination, or `samples` of them drawn at random"""
+    names = list(grid)
+    configs = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    if samples is not None and samples < len(configs):
+        configs = random.Random(seed).sample(configs, samples)
+    return configs
+
+
+def _fit_config(cache_target, train_idx, val_idx, params, random_state, model_path):
+    """Fit one candidate in a worker and dump it to model_path; X is a memory map of the dataset cache"""
+    # Index the map directly: only the split's rows are copied
+    features = np.load(Path(cache_target) / "X.npy", mmap_mode='r')
+    labels = np.load(Path(cache_target) / "y.npy")
+
+    model = RandomForestClassifier(**params, random_state=random_state, n_jobs=1)
+    start = time.perf_counter()
+    model.fit(features[train_idx], labels[train_idx])
+    fit_seconds = time.perf_counter() - start
+
+    accuracy = accuracy_score(labels[val_idx], model.predict(features[val_idx]))
+    joblib.dump(model, model_path)
+    return {
+        **params,
+        'val_accuracy': accuracy,
+        'model_size_kb': len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 1024,
+        'fit_seconds': fit_seconds
+    }
+
+
+def measure_latency(model, rows, n_jobs):
+    """(p50, p99) single-sample predict latency in ms, with the model's n_jobs set to n_jobs"""
+    model.set_params(n_jobs=n_jobs)
+    model.predict(rows[:1])  # warm up
+    timings = []
+    for i in range(LATENCY_REPEATS):
+        row = rows[i % len(rows)][None, :]
+        start = time.perf_counter()
+        model.predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000), float(np.percentile(timings, 99) * 1000)
+
+
+def run_sweep(train_path, configs, workers=None, random_state=42, n_jobs=DEPLOYED_N_JOBS):
+    """
+    Fit every config on a subject-grouped train/validation split of train_path
+
+    Candidates are fitted concurrently; latency is measured once the pool
+    has shut down, one model at a time, with the n_jobs it is deployed with.
+
+    Returns: DataFrame with one row per config (params, validation accuracy,
+    p50/p99 single-sample latency, pickled size, fit time)
+    """
+    X, y, subject, _ = load_har_dataset(train_path)
+    cache_target = dataset_cache_path(train_path, DATASET_CACHE_DIR)
+    groups = subject if subject is not None else np.arange(len(X))
+    splitter = GroupShuffleSplit(n_splits=1, test_size=VALIDATION_SUBJECTS, random_state=random_state)
+    train_idx, val_idx = next(splitter.split(X, y, groups=groups))
+
+    with tempfile.TemporaryDirectory(prefix="sweep-") as model_dir:
+        model_paths = [Path(model_dir) / f"config_{i}.pkl" for i in range(len(configs))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_fit_config, cache_target, train_idx, val_idx, params, random_state, path)
+                       for params, path in zip(configs, model_paths)]
+            rows = [future.result() for future in futures]
+
+        latency_rows = np.asarray(X.iloc[val_idx[:LATENCY_REPEATS]])
+        for row, path in zip(rows, model_paths):
+            row['latency_ms_p50'], row['latency_ms_p99'] = measure_latency(joblib.load(path), latency_rows, n_jobs)
+    return pd.DataFrame(rows)
+
+
+def rank_configs(report, max_latency_ms=MAX_LATENCY_MS, max_size_kb=MAX_MODEL_SIZE_KB):
+    """
+    Mark configs within the latency (p99) and size budget and sort them:
+    in-budget ones by accuracy, then by latency; then the rest, closest to
+    the budget first (budget_ratio: the larger of p99 / latency budget and
+    size / size budget)
+    """
+    report = report.copy()
+    report['budget_ratio'] = np.maximum(report['latency_ms_p99'] / max_latency_ms,
+                                        report['model_size_kb'] / max_size_kb)
+    report['within_budget'] = report['budget_ratio'] <= 1
+    within = report[report['within_budget']].sort_values(
+        ['val_accuracy', 'latency_ms_p50'], ascending=[False, True], kind='stable')
+    over = report[~report['within_budget']].sort_values(
+        ['budget_ratio', 'val_accuracy'], ascending=[True, False], kind='stable')
+    return pd.concat([within, over]).reset_index(drop=True)
+
+
+def best_params(ranked):
+    """
+    Params of the top-ranked config: the best in-budget one, or the one
+    closest to the budget if none fits (check ranked['within_budget']);
+    None if the report is empty
+    """
+    if ranked.empty:
+        return None
+    row = ranked.iloc[0]
+    params = {}
+    for name in PARAM_GRID:
+        value = row[name]
+        if pd.isna(value):
+            params[name] = None
+        else:
+            params[name] = int(value) if isinstance(value, (int, float, np.number)) else value
+    return params
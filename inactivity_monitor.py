@@ -0,0 +1,150 @@
+"""
+Inactivity Monitor
+Per-subject prolonged-inactivity tracking for wellness alerts
+(decision_logic.md §6). A subject that stays in a resting activity or
+below the low-motion threshold gets a deadline; deadlines live in a
+hierarchical timer wheel, so a tick costs O(timers expiring) no matter
+how many subjects are monitored.
+"""
+
+import math
+
+# Activities that count as resting regardless of motion
+INACTIVE_ACTIVITIES = {'SITTING', 'LAYING'}
+
+# Continuous inactivity before a wellness alert
+INACTIVITY_ALERT_SECONDS = 5 * 60
+# Motion below this fraction of the mean magnitude counts as inactive
+LOW_MOTION_RATIO = 0.5
+
+# HAR windows are 2.56 s with 50% overlap: one sample every 1.28 s
+SAMPLE_SECONDS = 1.28
+
+WHEEL_TICK_SECONDS = 1.0
+WHEEL_SLOTS = 64
+WHEEL_LEVELS = 4
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel (Varghese & Lauck). Level L has `slots`
+    buckets of slots**L ticks each; timers cascade to finer levels as
+    their bucket comes up. Cancelling is O(1): stale entries are skipped
+    when their bucket is reached.
+    """
+
+    def __init__(self, tick=WHEEL_TICK_SECONDS, slots=WHEEL_SLOTS, levels=WHEEL_LEVELS):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.current = 0
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        # key -> deadline tick of its live timer
+        self.deadlines = {}
+        self._due = []
+
+    def __len__(self):
+        return len(self.deadlines)
+
+    def _to_tick(self, seconds):
+        return math.ceil(seconds / self.tick)
+
+    def _place(self, key, deadline):
+        delta = deadline - self.current
+        if delta <= 0:
+            self._due.append((key, deadline))
+            return
+        # Beyond the wheel's span: park in the top level and re-place on cascade
+        target = min(deadline, self.current + self.slots ** self.levels - 1)
+        level = 0
+        while target - self.current >= self.slots ** (level + 1):
+            level += 1
+        slot = (target // self.slots ** level) % self.slots
+        self.wheels[level][slot].append((key, deadline))
+
+    def schedule(self, key, when):
+        """Fire `key` once the clock reaches `when` seconds; replaces its previous timer"""
+        deadline = self._to_tick(when)
+        self.deadlines[key] = deadline
+        self._place(key, deadline)
+
+    def cancel(self, key):
+        return self.deadlines.pop(key, None) is not None
+
+    def _expire(self, entries, expired):
+        for key, deadline in entries:
+            if self.deadlines.get(key) == deadline:
+                if deadline <= self.current:
+                    del self.deadlines[key]
+                    expired.append(key)
+                else:
+                    self._place(key, deadline)
+
+    def advance(self, now):
+        """Move the clock to `now` seconds; returns the keys whose timers expired"""
+        target = int(now // self.tick)
+        expired = []
+        self._expire(self._due, expired)
+        self._due = []
+        while self.current < target:
+            if not self.deadlines:
+                self.current = target
+                break
+            self.current += 1
+            # Cascade coarser buckets that start at this tick, coarsest first
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if self.current % span == 0:
+                    bucket = self.wheels[level][(self.current // span) % self.slots]
+                    entries = bucket[:]
+                    bucket.clear()
+                    self._expire(entries, expired)
+            bucket = self.wheels[0][self.current % self.slots]
+            entries = bucket[:]
+            bucket.clear()
+            self._expire(entries, expired)
+        return expired
+
+
+class InactivityMonitor:
+    """Fires once per continuous stretch of inactivity longer than threshold seconds"""
+
+    def __init__(self, threshold=INACTIVITY_ALERT_SECONDS, low_motion=0.0, wheel=None):
+        self.threshold = threshold
+        self.low_motion = low_motion
+        self.wheel = wheel or TimerWheel()
+        # subject -> (time the inactive stretch started, activity at that time)
+        self.inactive_since = {}
+
+    def is_inactive(self, activity, motion):
+        return str(activity).upper() in INACTIVE_ACTIVITIES or motion < self.low_motion
+
+    def observe(self, subject, activity, motion, now):
+        """Record one sample of `subject` at `now` seconds"""
+        if self.is_inactive(activity, motion):
+            if subject not in self.inactive_since:
+                self.inactive_since[subject] = (now, activity)
+                self.wheel.schedule(subject, now + self.threshold)
+        elif self.inactive_since.pop(subject, None) is not None:
+            self.wheel.cancel(subject)
+
+    def poll(self, now):
+        """
+        Advance to `now` seconds
+
+        Returns: list of (subject, activity, inactive_seconds) that crossed the threshold
+        """
+        expired = []
+        for subject in self.wheel.advance(now):
+            since, activity = self.inactive_since[subject]
+            expired.append((subject, activity, now - since))
+        return expired
+
+    def forget(self, subject):
+        self.inactive_since.pop(subject, None)
+        self.wheel.cancel(subject)
+
+    @property
+    def monitored(self):
+        """Subjects currently inactive"""
+        return len(self.inactive_since)
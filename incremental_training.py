@@ -0,0 +1,298 @@
+"""
+Incremental Model Training
+Appends new labelled recordings to an on-disk training cache and grows the
+existing Random Forest with warm_start trees instead of refitting from
+scratch. New trees are fit on the new rows plus a bounded, class-stratified
+replay buffer, so an update costs time proportional to the new data.
+"""
+
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from dataset import file_fingerprint, read_har_csv, split_features
+
+TRAINING_CACHE_DIR = "training_cache"
+
+# Rows kept per class in the replay buffer mixed into every update
+REPLAY_ROWS_PER_CLASS = 200
+
+# Default forest growth: new trees per 1000 new rows
+TREES_PER_1K_ROWS = 10
+
+
+def atomic_dump(model, path):
+    """joblib.dump to a temporary file, then rename over the target"""
+    tmp_path = f"{path}.tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+
+class TrainingCache:
+    """
+    Append-only store of ingested recordings plus a replay buffer
+
+    append() only stages its chunk and replay buffer; commit() puts them in
+    place together with state.json, which names the current replay file, so
+    a failed update leaves the cache as it was.
+    """
+
+    def __init__(self, root=TRAINING_CACHE_DIR, replay_rows_per_class=REPLAY_ROWS_PER_CLASS, seed=42):
+        self.root = Path(root)
+        self.state_file = self.root / "state.json"
+        self.replay_rows_per_class = replay_rows_per_class
+        self.rng = np.random.default_rng(seed)
+        self.state = self._load_state()
+        # Chunk files written but not yet committed, and the uncommitted replay buffer
+        self._staged_chunks = []
+        self._staged_replay = None
+
+    def _load_state(self):
+        if self.state_file.exists():
+            with open(self.state_file) as f:
+                return json.load(f)
+        return {
+            'feature_names': None,
+            'chunks': [],
+            'ingested': {},
+            'total_rows': 0,
+            'class_seen': {},
+            'replay': None,
+            'model': None
+        }
+
+    @property
+    def replay_file(self):
+        # Caches written before replay files were versioned keep it in replay.npz
+        return self.root / (self.state.get('replay') or "replay.npz")
+
+    def commit(self):
+        """Put the staged chunks and replay buffer in place, then save the state that refers to them"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        for staged in self._staged_chunks:
+            os.replace(staged, staged.with_name(staged.name.replace(".staged", "")))
+        old_replay = self.replay_file
+        if self._staged_replay is not None:
+            X_replay, y_replay = self._staged_replay
+            replay_name = f"replay-{len(self.state['chunks']):05d}.npz"
+            tmp_file = self.root / f"{replay_name}.tmp.npz"
+            np.savez(tmp_file, X=X_replay, y=y_replay)
+            os.replace(tmp_file, self.root / replay_name)
+            self.state['replay'] = replay_name
+        self.save_state()
+        if self._staged_replay is not None and old_replay != self.replay_file and old_replay.exists():
+            old_replay.unlink()
+        self._staged_chunks = []
+        self._staged_replay = None
+
+    def discard(self):
+        """Drop everything appended since the last commit"""
+        for staged in self._staged_chunks:
+            staged.unlink(missing_ok=True)
+        self._staged_chunks = []
+        self._staged_replay = None
+        self.state = self._load_state()
+
+    def save_state(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    @property
+    def is_initialized(self):
+        return bool(self.state['chunks'])
+
+    def data_fingerprint(self):
+        """Fingerprint of the whole corpus: hash over the ingested file hashes in order"""
+        digest = hashlib.sha256()
+        for chunk in self.state['chunks']:
+            digest.update(chunk['sha256'].encode())
+        return digest.hexdigest()
+
+    def is_ingested(self, fingerprint):
+        return fingerprint in self.state['ingested']
+
+    def append(self, path, fingerprint=None):
+        """
+        Stage a labelled recording for the cache (see commit)
+
+        Returns: (X, y) of the new rows as a DataFrame / Series
+        """
+        fingerprint = fingerprint or file_fingerprint(path)
+        df = read_har_csv(path)
+        X, y, subject = split_features(df)
+        if y is None:
+            raise ValueError(f"{path} has no Activity column")
+
+        if self.state['feature_names'] is None:
+            self.state['feature_names'] = list(X.columns)
+        X = X[self.state['feature_names']]
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        chunk_name = f"chunk-{len(self.state['chunks']) + 1:05d}.npz"
+        staged = self.root / chunk_name.replace(".npz", ".staged.npz")
+        np.savez(
+            staged,
+            X=X.to_numpy(dtype=np.float32),
+            y=y.to_numpy(dtype=str),
+            subject=subject.to_numpy() if subject is not None else np.full(len(X), -1)
+        )
+        self._staged_chunks.append(staged)
+
+        self.state['chunks'].append({'file': chunk_name, 'source': str(path),
+                                     'sha256': fingerprint, 'rows': len(X)})
+        self.state['ingested'][fingerprint] = chunk_name
+        self.state['total_rows'] += len(X)
+        self._update_replay(X.to_numpy(dtype=np.float32), y.to_numpy(dtype=str))
+        return X, y
+
+    def _update_replay(self, X_new, y_new):
+        """Per-class reservoir sampling so the buffer stays a uniform sample of the corpus"""
+        X_replay, y_replay = self.replay()
+        X_keep, y_keep = [], []
+        seen = self.state['class_seen']
+        capacity = self.replay_rows_per_class
+
+        for label in np.union1d(np.unique(y_new), y_replay):
+            kept = X_replay[y_replay == label]
+            rows = X_new[y_new == label]
+            n_seen = seen.get(label, 0)
+            seen[label] = n_seen + len(rows)
+
+            # Fill the reservoir, then row t (1-based over the class stream)
+            # replaces a random slot with probability capacity / t
+            n_fill = min(max(capacity - len(kept), 0), len(rows))
+            kept = np.concatenate([kept, rows[:n_fill]]) if len(kept) else rows[:n_fill]
+            rest = rows[n_fill:]
+            if len(rest):
+                stream_index = n_seen + n_fill + np.arange(1, len(rest) + 1)
+                slots = self.rng.integers(stream_index)
+                accepted = np.flatnonzero(slots < capacity)
+                # Later rows overwrite earlier ones on the same slot, as in the sequential algorithm
+                reversed_slots = slots[accepted][::-1]
+                _, last = np.unique(reversed_slots, return_index=True)
+                winners = accepted[::-1][last]
+                kept = kept.copy()
+                kept[slots[winners]] = rest[winners]
+            X_keep.append(kept)
+            y_keep.append(np.full(len(kept), label))
+
+        n_features = X_new.shape[1]
+        self._staged_replay = (
+            np.concatenate(X_keep).astype(np.float32) if X_keep else np.empty((0, n_features), np.float32),
+            np.concatenate(y_keep) if y_keep else np.empty(0, dtype=str)
+        )
+
+    def replay(self):
+        """Return the replay buffer (including staged rows) as (X, y) arrays"""
+        if self._staged_replay is not None:
+            return self._staged_replay
+        if not self.replay_file.exists():
+            return np.empty((0, len(self.state['feature_names'] or []))), np.empty(0, dtype=str)
+        data = np.load(self.replay_file)
+        return data['X'], data['y']
+
+
+def grow_forest(model, X_fit, y_fit, n_new_trees, max_trees=None):
+    """
+    Add n_new_trees to a fitted forest using warm_start
+
+    With max_trees, the oldest trees are dropped so the forest keeps at most
+    max_trees estimators (a sliding window over the data stream).
+    """
+    unknown = set(np.unique(y_fit)) - set(model.classes_)
+    if unknown:
+        raise ValueError(f"New classes {sorted(unknown)} need a full retrain")
+    missing = set(model.classes_) - set(np.unique(y_fit))
+    if missing:
+        raise ValueError(f"Classes {sorted(missing)} missing from the update batch")
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees, verbose=0)
+    model.fit(X_fit, y_fit)
+    model.set_params(warm_start=False)
+
+    if max_trees and len(model.estimators_) > max_trees:
+        model.estimators_ = model.estimators_[-max_trees:]
+        model.set_params(n_estimators=max_trees)
+
+    return model
+
+
+def trees_for_rows(n_rows, trees_per_1k_rows=TREES_PER_1K_ROWS):
+    return max(1, math.ceil(n_rows * trees_per_1k_rows / 1000))
+
+
+def incremental_update(model_path, new_paths, base_path=None, cache_dir=TRAINING_CACHE_DIR,
+                       trees_per_1k_rows=TREES_PER_1K_ROWS, n_new_trees=None, max_trees=None):
+    """
+    Ingest new recordings and grow the model saved at model_path
+
+    base_path: the dataset the existing model was trained on; ingested once
+    to seed the cache (and replay buffer) the first time this runs.
+
+    Returns: dict describing the update (rows, trees, fingerprints)
+    """
+    cache = TrainingCache(cache_dir)
+
+    if not cache.is_initialized:
+        if base_path is None:
+            raise ValueError("Training cache is empty and no base dataset was given")
+        cache.append(base_path)
+
+    # Replay rows are sampled before the new rows join the buffer, so no new
+    # row can appear twice in the fit set
+    X_replay, y_replay = cache.replay()
+
+    new_X, new_y, skipped = [], [], []
+    for path in new_paths:
+        fingerprint = file_fingerprint(path)
+        if cache.is_ingested(fingerprint):
+            skipped.append(str(path))
+            continue
+        X, y = cache.append(path, fingerprint)
+        new_X.append(X)
+        new_y.append(y)
+
+    model = joblib.load(model_path)
+    summary = {'new_rows': 0, 'new_trees': 0, 'skipped': skipped,
+               'trees': len(model.estimators_), 'total_rows': cache.state['total_rows']}
+
+    if not new_X:
+        cache.commit()
+        return summary
+
+    X_fit = pd.concat(new_X + [pd.DataFrame(X_replay, columns=cache.state['feature_names'])],
+                      ignore_index=True)
+    y_fit = np.concatenate([np.concatenate([y.to_numpy(dtype=str) for y in new_y]), y_replay])
+
+    n_new_rows = sum(len(X) for X in new_X)
+    n_new_trees = n_new_trees or trees_for_rows(n_new_rows, trees_per_1k_rows)
+    try:
+        grow_forest(model, X_fit, y_fit, n_new_trees, max_trees)
+    except Exception:
+        # Nothing was ingested: a re-run sees the same files as new
+        cache.discard()
+        raise
+
+    atomic_dump(model, model_path)
+    cache.state['model'] = {
+        'path': str(model_path),
+        'sha256': file_fingerprint(model_path),
+        'data_fingerprint': cache.data_fingerprint(),
+        'trees': len(model.estimators_)
+    }
+    cache.commit()
+
+    summary.update(new_rows=n_new_rows, new_trees=n_new_trees, fit_rows=len(X_fit),
+                   trees=len(model.estimators_), total_rows=cache.state['total_rows'],
+                   data_fingerprint=cache.data_fingerprint(),
+                   feature_names=cache.state['feature_names'])
+    return summary
@@ -0,0 +1,351 @@
+"""
+Local Micro-Batching Inference Server
+Holds the activity and fall detection models once per host and serves
+predictions over localhost HTTP. Concurrent requests are coalesced into
+micro-batches under a max-latency deadline, so one model.predict call
+serves many clients.
+
+Usage:
+    python inference_server.py --port 8765 --max-latency-ms 5
+
+Endpoints:
+    GET  /health                  model versions, feature lists, batch stats
+    POST /predict/<model>         model is "activity" or "fall"
+         body: JSON {"rows": [[...], ...]}  or raw float32 row-major bytes
+               with Content-Type: application/octet-stream (and X-Row-Width)
+               optional X-Feature-Digest: feature_digest() of the feature
+               order the rows were built in (from /health)
+         reply: JSON {"predictions": [...]}, or 409 if the model was
+                hot-swapped for one expecting other features
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from feature_selection import fallback_model
+from model_registry import REGISTRY_DIR, HotSwapModel, ModelRegistry
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LATENCY_MS = 5.0
+MAX_BATCH_ROWS = 4096
+
+FALL_MODEL_PATH = "fall_detection_model.pkl"
+
+
+def model_fallbacks():
+    """
+    Model files served without a promoted registry version; the activity
+    model is chosen exactly as the dashboard chooses it (fallback_model)
+    """
+    return {
+        'activity': fallback_model()[0],
+        'fall': FALL_MODEL_PATH
+    }
+
+
+def feature_digest(features):
+    """Short hash of an ordered feature list (None for models without feature names)"""
+    if features is None:
+        return None
+    return hashlib.sha1("\n".join(features).encode()).hexdigest()[:16]
+
+
+class ModelChangedError(RuntimeError):
+    """Rows were shaped for a model that has since been hot-swapped for one with other features"""
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent predict requests for one model
+
+    The worker blocks for the first request, then keeps collecting until
+    max_latency has passed since that request arrived or max_batch_rows is
+    reached, and answers the whole batch with a single predict call.
+    """
+
+    def __init__(self, handle, max_latency_ms=MAX_LATENCY_MS, max_batch_rows=MAX_BATCH_ROWS):
+        self.handle = handle
+        self.max_latency = max_latency_ms / 1000
+        self.max_batch_rows = max_batch_rows
+        self.requests = queue.Queue()
+        self.batches = 0
+        self.rows = 0
+        self._digest = (None, None)
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, X, digest=None):
+        """
+        Queue a (n_rows, n_features) float32 array; returns a Future of predictions.
+        digest: feature_digest of the feature order X was built in, if known
+        """
+        future = Future()
+        self.requests.put((X, future, digest))
+        return future
+
+    def _feature_digest(self, model):
+        """feature_digest of the model, computed once per loaded model"""
+        if self._digest[0] is not model:
+            self._digest = (model, feature_digest(getattr(model, "feature_names_in_", None)))
+        return self._digest[1]
+
+    def _collect(self):
+        batch = [self.requests.get()]
+        n_rows = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_latency
+
+        while n_rows < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            n_rows += len(item[0])
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                _, model, _ = self.handle.get()
+                if model is None:
+                    raise RuntimeError("model not available")
+
+                # Requests were shaped with the model current when they arrived; reject
+                # only those that no longer fit this snapshot, not the whole batch. A model
+                # of the same width can still expect other features, hence the digest
+                width = model.n_features_in_
+                digest = self._feature_digest(model)
+                fitting = []
+                for X_part, future, request_digest in batch:
+                    if X_part.shape[1] != width:
+                        future.set_exception(ModelChangedError(
+                            f"model now expects {width} features per row, got {X_part.shape[1]}"))
+                    elif request_digest is not None and request_digest != digest:
+                        future.set_exception(ModelChangedError("model now expects other features"))
+                    else:
+                        fitting.append((X_part, future))
+                batch = fitting
+                if not batch:
+                    continue
+
+                X = np.vstack([X for X, _ in batch])
+                features = getattr(model, "feature_names_in_", None)
+                if features is not None:
+                    X = pd.DataFrame(X, columns=features)
+                predictions = model.predict(X)
+
+                start = 0
+                for X_part, future in batch:
+                    future.set_result(predictions[start:start + len(X_part)])
+                    start += len(X_part)
+
+                self.batches += 1
+                self.rows += len(predictions)
+            except Exception as e:
+                for _, future, *_ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+class InferenceService:
+    """Model handles plus one batcher per model"""
+
+    def __init__(self, registry_dir=REGISTRY_DIR, max_latency_ms=MAX_LATENCY_MS,
+                 max_batch_rows=MAX_BATCH_ROWS, models=None):
+        registry = ModelRegistry(registry_dir)
+        self.handles = {}
+        self.batchers = {}
+
+        for name, fallback in (models or model_fallbacks()).items():
+            handle = HotSwapModel(registry, name, fallback)
+            if handle.get()[1] is None:
+                handle.stop()
+                continue
+            self.handles[name] = handle
+            self.batchers[name] = MicroBatcher(handle, max_latency_ms, max_batch_rows)
+
+    def health(self):
+        status = {}
+        for name, handle in self.handles.items():
+            label, model, _ = handle.get()
+            features = getattr(model, "feature_names_in_", None)
+            status[name] = {
+                'version': label,
+                'features': list(features) if features is not None else None,
+                'feature_digest': feature_digest(features),
+                'n_features': int(model.n_features_in_),
+                'batches': self.batchers[name].batches,
+                'rows': self.batchers[name].rows
+            }
+        return status
+
+
+def make_handler(service):
+    class InferenceHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, service.health())
+            else:
+                self._reply(404, {'error': f"unknown path {self.path}"})
+
+        def do_POST(self):
+            # Read the body first, even for an unknown endpoint: bytes left unread
+            # would be parsed as the next request on this keep-alive connection
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            name = self.path.rsplit("/", 1)[-1]
+            if not self.path.startswith("/predict/") or name not in service.batchers:
+                self._reply(404, {'error': f"unknown model endpoint {self.path}"})
+                return
+
+            try:
+                # Rows keep the width the client shaped them with; the batcher checks
+                # it against the model snapshot it predicts with
+                width = int(self.headers.get("X-Row-Width") or service.handles[name].get()[1].n_features_in_)
+                if self.headers.get("Content-Type") == "application/octet-stream":
+                    X = np.frombuffer(body, dtype=np.float32).reshape(-1, width)
+                else:
+                    X = np.asarray(json.loads(body)['rows'], dtype=np.float32)
+                    X = X if X.ndim == 2 else X.reshape(-1, width)
+            except (ValueError, KeyError) as e:
+                self._reply(400, {'error': f"bad request body: {e}"})
+                return
+
+            try:
+                predictions = service.batchers[name].submit(X, self.headers.get("X-Feature-Digest")).result()
+            except ModelChangedError as e:
+                self._reply(409, {'error': str(e)})
+                return
+            except Exception as e:
+                self._reply(500, {'error': str(e)})
+                return
+            self._reply(200, {'predictions': predictions.tolist()})
+
+    return InferenceHandler
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **service_kwargs):
+    """Create (but do not start) the HTTP server; returns (server, service)"""
+    service = InferenceService(**service_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    return server, service
+
+
+class InferenceClient:
+    """Keep-alive HTTP client for the inference server (one per thread)"""
+
+    def __init__(self, url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=30):
+        parsed = urlparse(url)
+        self.connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=timeout)
+        self._health = None
+
+    def _request(self, method, path, body=None, headers=None):
+        self.connection.request(method, path, body=body, headers=headers or {})
+        response = self.connection.getresponse()
+        payload = json.loads(response.read())
+        if response.status == 409:
+            raise ModelChangedError(payload.get('error', "model changed"))
+        if response.status != 200:
+            raise RuntimeError(payload.get('error', f"HTTP {response.status}"))
+        return payload
+
+    def health(self):
+        self._health = self._request("GET", "/health")
+        return self._health
+
+    def predict(self, name, X, retries=1):
+        """
+        Predict with a served model
+
+        X: DataFrame (columns are aligned to the model's features) or
+        a 2-D array already in the model's feature order. If the model is
+        hot-swapped for one with other features, the feature list is
+        refreshed and the request retried.
+        """
+        for attempt in range(retries + 1):
+            rows = X
+            headers = {"Content-Type": "application/octet-stream"}
+            if isinstance(X, pd.DataFrame):
+                info = (self._health or self.health())[name]
+                if info['features'] is not None:
+                    rows = X[info['features']]
+                    # Lets the server tell a swap to other features of the same width
+                    headers["X-Feature-Digest"] = info['feature_digest']
+            rows = np.ascontiguousarray(rows, dtype=np.float32)
+            headers["X-Row-Width"] = str(rows.shape[1])
+
+            try:
+                payload = self._request("POST", f"/predict/{name}", body=rows.tobytes(), headers=headers)
+            except ModelChangedError:
+                if attempt == retries:
+                    raise
+                self._health = None
+                continue
+            return np.asarray(payload['predictions'])
+
+    def close(self):
+        self.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local micro-batching inference server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-latency-ms", type=float, default=MAX_LATENCY_MS,
+                        help="Longest a request waits for its batch to fill")
+    parser.add_argument("--max-batch-rows", type=int, default=MAX_BATCH_ROWS)
+    args = parser.parse_args()
+
+    server, service = serve(args.host, args.port, max_latency_ms=args.max_latency_ms,
+                            max_batch_rows=args.max_batch_rows)
+    if not service.handles:
+        print("❌ No models found! Train or promote a model first.")
+        return 1
+
+    for name, info in service.health().items():
+        print(f"✅ {name}: {info['version']} ({info['n_features']} features)")
+    print(f"🚀 Serving on http://{args.host}:{args.port} "
+          f"(max latency {args.max_latency_ms} ms, max batch {args.max_batch_rows} rows)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
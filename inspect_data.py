@@ -1,26 +1,20 @@
-import pandas as pd
+import time
 import traceback
 
-try:
-    train = pd.read_csv('data/train.csv')
-    test = pd.read_csv('data/test.csv')
-    print('train columns:', train.columns.tolist())
-    print('train shape:', train.shape)
-    print('test shape:', test.shape)
-
-    label_col = None
-    for c in ['activity', 'Activity']:
-        if c in train.columns:
-            label_col = c
-            break
-    if label_col is None:
-        raise KeyError('No activity/Activity column found')
+from dataset import find_dataset, load_har_dataset
 
-    X_train = train.drop(columns=[label_col])
-    y_train = train[label_col]
+try:
+    start = time.perf_counter()
+    X_train, y_train, subject_train, train_cached = load_har_dataset(find_dataset('train.csv'))
+    X_test, y_test, subject_test, test_cached = load_har_dataset(find_dataset('test.csv'))
+    print(f'loaded in {time.perf_counter() - start:.3f}s',
+          '(binary cache)' if train_cached and test_cached else '(parsed CSV, now cached)')
+    print('feature columns:', X_train.columns.tolist())
+    print('train shape:', X_train.shape)
+    print('test shape:', X_test.shape)
 
-    X_test = test.drop(columns=[label_col])
-    y_test = test[label_col]
+    if y_train is None or y_test is None:
+        raise KeyError('No Activity column found')
 
     print('X_train shape, y_train shape:', X_train.shape, y_train.shape)
     print('X_test shape, y_test shape:', X_test.shape, y_test.shape)
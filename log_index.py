@@ -0,0 +1,202 @@
+"""
+Tracking Log Time Index
+Sparse block index over activity_tracking_log.csv: the timestamp and byte
+offset of every BLOCK_ROWS-th row. The tracker writes timestamps in
+increasing order, so a time range maps to a byte range by binary search
+and only the blocks overlapping it are read and parsed - latency depends
+on the size of the range, not of the file.
+
+The index is extended incrementally as the log grows and saved next to
+the log (<log>.idx.npz) so a restart does not rescan the file.
+"""
+
+import io
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tracking_log import TRACKING_LOG_PATH, normalize_log
+
+BLOCK_ROWS = 1024
+
+# Bytes scanned per read while extending the index
+SCAN_BYTES = 32 * 1024 * 1024
+
+
+def _to_ns(value):
+    return pd.Timestamp(value).value
+
+
+class LogIndex:
+    """Block index of (first timestamp, byte offset) pairs for a time-ordered CSV log"""
+
+    def __init__(self, path=TRACKING_LOG_PATH, block_rows=BLOCK_ROWS, index_path=None):
+        self.path = path
+        self.block_rows = block_rows
+        self.index_path = index_path or f"{path}.idx.npz"
+        # Shared by every session of the process: refresh (and the save it
+        # does) must not interleave with another refresh or with a read
+        self._lock = threading.Lock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.header = None
+        self.timestamp_column = None
+        self.identity = None
+        self.scanned = 0
+        self.rows = 0
+        self.last_ns = None
+        self.block_ns = np.empty(0, dtype=np.int64)
+        self.block_offsets = np.empty(0, dtype=np.int64)
+
+    @property
+    def available(self):
+        """True once the header is known and has a timestamp column"""
+        return self.timestamp_column is not None
+
+    def _load(self):
+        try:
+            saved = np.load(self.index_path)
+            meta = json.loads(str(saved['meta']))
+        except (OSError, KeyError, ValueError):
+            return
+        if meta.get('block_rows') != self.block_rows:
+            return
+        self.header = meta['header'].encode()
+        self.timestamp_column = meta['timestamp_column']
+        self.identity = tuple(meta['identity'])
+        self.scanned = meta['scanned']
+        self.rows = meta['rows']
+        self.last_ns = meta['last_ns']
+        self.block_ns = saved['block_ns']
+        self.block_offsets = saved['block_offsets']
+
+    def _save(self):
+        meta = {
+            'block_rows': self.block_rows,
+            'header': self.header.decode(),
+            'timestamp_column': self.timestamp_column,
+            'identity': list(self.identity),
+            'scanned': self.scanned,
+            'rows': self.rows,
+            'last_ns': self.last_ns
+        }
+        tmp_path = f"{self.index_path}.tmp.npz"
+        np.savez(tmp_path, block_ns=self.block_ns, block_offsets=self.block_offsets, meta=json.dumps(meta))
+        os.replace(tmp_path, self.index_path)
+
+    def _timestamp_of(self, line):
+        return _to_ns(line.split(b",")[self.timestamp_column].decode().strip().strip('"'))
+
+    def refresh(self):
+        """Index complete lines appended since the last refresh; returns rows added"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._reset()
+            return 0
+
+        identity = (stat.st_dev, stat.st_ino)
+        if self.identity is not None and (identity != self.identity or stat.st_size < self.scanned):
+            self._reset()
+        if stat.st_size == self.scanned:
+            return 0
+
+        added = 0
+        new_ns, new_offsets = [], []
+        with open(self.path, 'rb') as f:
+            if self.header is None:
+                self.header = f.readline()
+                if not self.header.endswith(b"\n"):
+                    self._reset()
+                    return 0
+                columns = [c.strip().strip('"') for c in self.header.decode().rstrip("\r\n").split(",")]
+                self.timestamp_column = columns.index("timestamp") if "timestamp" in columns else None
+                self.identity = identity
+                self.scanned = f.tell()
+
+            if self.timestamp_column is None:
+                return 0
+            f.seek(self.scanned)
+            while True:
+                chunk = f.read(SCAN_BYTES)
+                end = chunk.rfind(b"\n") + 1
+                if end == 0:
+                    break
+                data = chunk[:end]
+                # Start of every complete line in this chunk
+                newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n"))
+                starts = np.concatenate([[0], newlines[:-1] + 1])
+                row_numbers = self.rows + np.arange(len(starts))
+
+                for start in starts[row_numbers % self.block_rows == 0]:
+                    line_end = data.index(b"\n", start)
+                    new_ns.append(self._timestamp_of(data[start:line_end]))
+                    new_offsets.append(self.scanned + int(start))
+                self.last_ns = self._timestamp_of(data[starts[-1]:end - 1])
+
+                self.rows += len(starts)
+                self.scanned += end
+                added += len(starts)
+                if len(chunk) < SCAN_BYTES:
+                    break
+                f.seek(self.scanned)
+
+        if added:
+            self.block_ns = np.concatenate([self.block_ns, np.array(new_ns, dtype=np.int64)])
+            self.block_offsets = np.concatenate([self.block_offsets, np.array(new_offsets, dtype=np.int64)])
+            self._save()
+        return added
+
+    def bounds(self):
+        """(first, last) timestamp in the log, or None while empty"""
+        with self._lock:
+            if not len(self.block_ns):
+                return None
+            return pd.Timestamp(int(self.block_ns[0])), pd.Timestamp(self.last_ns)
+
+    def byte_range(self, start=None, end=None):
+        """Byte span [lo, hi) of the blocks that can hold rows with start <= timestamp < end"""
+        lo_block = 0
+        if start is not None:
+            lo_block = max(int(np.searchsorted(self.block_ns, _to_ns(start), side='right')) - 1, 0)
+        hi_block = len(self.block_ns)
+        if end is not None:
+            hi_block = int(np.searchsorted(self.block_ns, _to_ns(end), side='left'))
+        lo = int(self.block_offsets[lo_block]) if len(self.block_offsets) else self.scanned
+        hi = int(self.block_offsets[hi_block]) if hi_block < len(self.block_offsets) else self.scanned
+        return lo, max(lo, hi)
+
+    def read_range(self, start=None, end=None):
+        """Rows with start <= timestamp < end, reading only the overlapping blocks"""
+        with self._lock:
+            if not self.available:
+                return pd.DataFrame()
+            header = self.header
+            lo, hi = self.byte_range(start, end)
+        with open(self.path, 'rb') as f:
+            f.seek(lo)
+            data = f.read(hi - lo)
+        frame = normalize_log(pd.read_csv(io.BytesIO(header + data)))
+
+        mask = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            mask &= (frame["timestamp"] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (frame["timestamp"] < pd.Timestamp(end)).to_numpy()
+        return frame[mask].reset_index(drop=True)
+
+    def read_last(self, duration):
+        """Rows from the last `duration` (Timedelta or string like '10min') of the log"""
+        bounds = self.bounds()
+        if bounds is None:
+            return pd.DataFrame()
+        return self.read_range(bounds[1] - pd.Timedelta(duration), None)
@@ -0,0 +1,275 @@
+"""
+Versioned Model Registry
+Stores trained models as immutable, numbered versions with metadata and an
+atomically updated CURRENT pointer, and provides a hot-swapping handle the
+dashboard uses to pick up newly promoted versions in the background.
+
+Layout:
+    model_registry/<name>/v0001/model.pkl
+    model_registry/<name>/v0001/model.forest/   (optional memory-mapped artifact)
+    model_registry/<name>/v0001/metadata.json
+    model_registry/<name>/CURRENT            (JSON pointer to the promoted version)
+
+Usage:
+    python model_registry.py list activity
+    python model_registry.py promote activity 3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from forest_artifact import forest_artifact_path, load_forest
+
+REGISTRY_DIR = "model_registry"
+
+# How often the dashboard's background watcher checks for a new promotion
+POLL_INTERVAL_SECONDS = 2.0
+
+
+def _load_pickle(path):
+    # joblib (and sklearn, via unpickling) is imported on first use so that
+    # importing the registry stays cheap for the dashboard's startup
+    import joblib
+    return joblib.load(path)
+
+
+def load_model_file(path):
+    """
+    Load a saved model, preferring its memory-mapped forest artifact
+    (forest_artifact.py) when one at least as new as the pickle exists
+    """
+    forest_path = forest_artifact_path(path)
+    if forest_path.exists() and os.path.getmtime(forest_path) >= os.path.getmtime(path):
+        return load_forest(forest_path)
+    return _load_pickle(path)
+
+
+def _write_json_atomic(path, data):
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ModelRegistry:
+    """Local directory of versioned model artifacts"""
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = Path(root)
+
+    def _model_dir(self, name):
+        return self.root / name
+
+    def _version_dir(self, name, version):
+        return self._model_dir(name) / f"v{version:04d}"
+
+    def versions(self, name):
+        """Registered version numbers, oldest first"""
+        model_dir = self._model_dir(name)
+        if not model_dir.exists():
+            return []
+        return sorted(int(p.name[1:]) for p in model_dir.glob("v[0-9]*") if p.is_dir())
+
+    def register(self, name, model_path, features=None, training_data_hash=None,
+                 accuracy=None, forest_path=None, **extra):
+        """
+        Copy a model file (and optionally its forest artifact directory)
+        into the registry as a new version
+
+        Returns: the new version number (not promoted yet)
+        """
+        versions = self.versions(name)
+        version = versions[-1] + 1 if versions else 1
+
+        # Build the version in a temporary directory and rename it into place,
+        # so readers never see a half-written version
+        self._model_dir(name).mkdir(parents=True, exist_ok=True)
+        staging_dir = self._model_dir(name) / f".v{version:04d}.tmp"
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir()
+
+        artifact = staging_dir / "model.pkl"
+        shutil.copyfile(model_path, artifact)
+
+        start = time.perf_counter()
+        _load_pickle(artifact)
+        load_seconds = time.perf_counter() - start
+
+        if forest_path is not None:
+            shutil.copytree(forest_path, forest_artifact_path(artifact))
+            start = time.perf_counter()
+            load_forest(forest_artifact_path(artifact))
+            extra['forest_load_seconds'] = time.perf_counter() - start
+
+        metadata = {
+            'name': name,
+            'version': version,
+            'registered_at': datetime.now().isoformat(),
+            'source': str(model_path),
+            'features': list(features) if features is not None else None,
+            'training_data_hash': training_data_hash,
+            'accuracy': accuracy,
+            'file_size_bytes': artifact.stat().st_size,
+            'load_seconds': load_seconds,
+            **extra
+        }
+        _write_json_atomic(staging_dir / "metadata.json", metadata)
+
+        os.rename(staging_dir, self._version_dir(name, version))
+        return version
+
+    def promote(self, name, version):
+        """Atomically point CURRENT at an existing version"""
+        if version not in self.versions(name):
+            raise ValueError(f"{name} has no version {version}")
+        _write_json_atomic(self._model_dir(name) / "CURRENT", {
+            'version': version,
+            'promoted_at': datetime.now().isoformat()
+        })
+
+    def current_version(self, name):
+        """The promoted version number, or None"""
+        pointer = self._model_dir(name) / "CURRENT"
+        if not pointer.exists():
+            return None
+        with open(pointer) as f:
+            return json.load(f)['version']
+
+    def metadata(self, name, version):
+        with open(self._version_dir(name, version) / "metadata.json") as f:
+            return json.load(f)
+
+    def model_path(self, name, version):
+        return self._version_dir(name, version) / "model.pkl"
+
+    def load(self, name, version=None):
+        """
+        Load a version (default: the promoted one)
+
+        Returns: (model, metadata) or (None, None) if nothing is promoted
+        """
+        version = version if version is not None else self.current_version(name)
+        if version is None:
+            return None, None
+        # Versions are immutable, so a registered forest artifact is never stale
+        forest_path = forest_artifact_path(self.model_path(name, version))
+        if forest_path.exists():
+            return load_forest(forest_path), self.metadata(name, version)
+        return _load_pickle(self.model_path(name, version)), self.metadata(name, version)
+
+
+class HotSwapModel:
+    """
+    Holds the currently promoted model and swaps it in the background
+
+    A daemon thread polls the registry pointer (or, without a promoted
+    version, the fallback file's mtime) and loads a changed model off the
+    request path. get() returns an immutable (label, model, metadata)
+    snapshot, so callers that captured a snapshot keep using that model
+    until they ask again - an in-flight simulation is never disturbed.
+    """
+
+    def __init__(self, registry, name, fallback_path=None, fallback_metadata=None,
+                 poll_interval=POLL_INTERVAL_SECONDS):
+        self.registry = registry
+        self.name = name
+        self.fallback_path = Path(fallback_path) if fallback_path else None
+        self.fallback_metadata = fallback_metadata or {}
+        self.poll_interval = poll_interval
+        self.last_error = None
+
+        self._source = None
+        self._snapshot = (None, None, None)
+        self._stop = threading.Event()
+        self._refresh()
+
+        self._thread = threading.Thread(target=self._watch, name=f"hotswap-{name}", daemon=True)
+        self._thread.start()
+
+    def _current_source(self):
+        version = self.registry.current_version(self.name)
+        if version is not None:
+            return ('registry', version)
+        if self.fallback_path and self.fallback_path.exists():
+            forest_path = forest_artifact_path(self.fallback_path)
+            mtimes = [os.path.getmtime(p) for p in (self.fallback_path, forest_path) if p.exists()]
+            return ('file', max(mtimes))
+        return None
+
+    def _refresh(self):
+        source = self._current_source()
+        if source == self._source:
+            return False
+
+        if source is None:
+            snapshot = (None, None, None)
+        elif source[0] == 'registry':
+            model, metadata = self.registry.load(self.name, source[1])
+            snapshot = (f"{self.name} v{source[1]}", model, metadata)
+        else:
+            model = load_model_file(self.fallback_path)
+            snapshot = (str(self.fallback_path), model, dict(self.fallback_metadata))
+
+        # Single reference assignment: readers see either the old or the new snapshot
+        self._snapshot = snapshot
+        self._source = source
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._refresh()
+                self.last_error = None
+            except Exception as e:
+                # Keep serving the previous model if the new one fails to load
+                self.last_error = e
+
+    def get(self):
+        """Return the current (label, model, metadata) snapshot"""
+        return self._snapshot
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local model registry")
+    parser.add_argument("--root", default=REGISTRY_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List versions of a model")
+    list_parser.add_argument("name")
+
+    promote_parser = subparsers.add_parser("promote", help="Promote a version to CURRENT")
+    promote_parser.add_argument("name")
+    promote_parser.add_argument("version", type=int)
+
+    args = parser.parse_args()
+    registry = ModelRegistry(args.root)
+
+    if args.command == "list":
+        current = registry.current_version(args.name)
+        for version in registry.versions(args.name):
+            meta = registry.metadata(args.name, version)
+            marker = "*" if version == current else " "
+            accuracy = f"{meta['accuracy']:.2%}" if meta.get('accuracy') is not None else "n/a"
+            n_features = len(meta['features']) if meta.get('features') else "all"
+            forest_load = meta.get('forest_load_seconds')
+            forest = f"  forest load={forest_load * 1000:.1f} ms" if forest_load is not None else ""
+            print(f"{marker} v{version:04d}  {meta['registered_at']}  accuracy={accuracy}  "
+                  f"features={n_features}  size={meta['file_size_bytes'] / 1024:.0f} KB  "
+                  f"load={meta['load_seconds'] * 1000:.0f} ms{forest}")
+    elif args.command == "promote":
+        registry.promote(args.name, args.version)
+        print(f"✅ Promoted {args.name} v{args.version}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Dashboard Modes
+Each mode of app.py lives in its own module exposing render(). A mode's
+module - and with it heavy libraries such as matplotlib or
+joblib/sklearn - is imported only the first time that mode is shown;
+the import time is recorded as the profiler stage "startup.import.<module>".
+"""
+
+import importlib
+import sys
+import time
+
+from profiling import profiler
+
+# Sidebar label -> module in this package
+MODES = {
+    "📊 Historical Dashboard": "historical",
+    "🔴 Live Simulation": "live_simulation",
+    "📈 Dataset Explorer": "dataset_explorer",
+    "🚨 Safety Alert System": "safety_alerts",
+    "📅 Health Trend Dashboard": "health_dashboard",
+    "⏱️ Performance": "performance"
+}
+
+
+def load_mode(label):
+    """Import (once per process) and return the module rendering `label`"""
+    name = f"{__name__}.{MODES[label]}"
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        profiler.record(f"startup.import.{MODES[label]}", time.perf_counter() - start)
+    return module
+
+
+def render_mode(label):
+    load_mode(label).render()
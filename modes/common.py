@@ -0,0 +1,117 @@
+"""
+Shared Dashboard Resources
+Cached data loaders, per-process stores and data-source checks used by
+app.py and more than one dashboard mode. Kept free of matplotlib and
+joblib/sklearn so importing it stays cheap.
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from dataset import read_har_csv
+from feature_selection import REDUCED_MODEL_PATH
+from figure_cache import FigureCache
+from model_registry import REGISTRY_DIR, ModelRegistry, HotSwapModel
+from rollups import RollupStore
+from log_index import LogIndex
+from activity_segments import SegmentStore
+from health_store import HealthStore
+from health_trends import HealthAggregates, HealthHistory
+from fatigue_detector import FatigueDetector
+from risk_model import RiskModel
+
+TRACKING_LOG = "activity_tracking_log.csv"
+
+
+def model_available():
+    return (Path("activity_model.pkl").exists() or Path(REDUCED_MODEL_PATH).exists()
+            or ModelRegistry(REGISTRY_DIR).current_version("activity") is not None)
+
+
+def tracking_log_available():
+    return Path(TRACKING_LOG).exists()
+
+
+def test_data_available():
+    return Path("data/test.csv").exists() or Path("test.csv").exists()
+
+
+@st.cache_data(show_spinner=False)
+def load_har_data(path, modified_time, columns=None, nrows=None):
+    """Load a HAR CSV (optionally its first nrows) with float32 features; cached until the file changes"""
+    return read_har_csv(path, usecols=columns, nrows=nrows)
+
+
+def file_version(path):
+    """Cheap change detector for a data file: (mtime_ns, size)"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@st.cache_data(show_spinner=False)
+def load_tracking_log(path, version):
+    """Read the activity tracking log; cached until the file changes"""
+    return pd.read_csv(path)
+
+
+@st.cache_resource(show_spinner=False)
+def shared_figure_cache():
+    """Rendered panels for data shared by all sessions (the tracking log)"""
+    return FigureCache()
+
+
+@st.cache_resource(show_spinner=False)
+def get_rollup_store(path):
+    """Per-second/minute/hour rollups of the tracking log, kept current in the background"""
+    store = RollupStore(path)
+    store.refresh()
+    return store.start()
+
+
+@st.cache_resource(show_spinner=False)
+def get_log_index(path):
+    """Time index over the tracking log for range reads; extended on refresh()"""
+    return LogIndex(path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_segment_store(path):
+    """Run-length encoded activity segments of the tracking log; extended on refresh()"""
+    return SegmentStore(path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_health_store():
+    """Durable health history shared by all sessions in the process"""
+    return HealthStore()
+
+
+def restore_health_session():
+    """
+    Restore this session's Health Trend history from the durable store, once.
+    Until then live samples go to the store only, so the restore includes them.
+    """
+    if 'health_history' not in st.session_state:
+        history = HealthHistory(get_health_store().read_recent())
+        st.session_state.health_aggregates = HealthAggregates.from_history(history.frame())
+        st.session_state.fatigue_detector = FatigueDetector.from_history(history.frame())
+        st.session_state.health_history = history
+
+
+@st.cache_resource(show_spinner=False)
+def get_risk_model():
+    """Long-term per-subject risk counters shared by all sessions; saved after each simulation"""
+    return RiskModel.load()
+
+
+@st.cache_resource(show_spinner=False)
+def get_model_handle(name, fallback_path, fallback_features=None):
+    """
+    One hot-swapping model handle per process, shared by all sessions;
+    newly promoted registry versions are loaded by its background thread
+    """
+    fallback_metadata = {'features': list(fallback_features)} if fallback_features else None
+    return HotSwapModel(ModelRegistry(REGISTRY_DIR), name, fallback_path, fallback_metadata)
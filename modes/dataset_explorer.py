@@ -0,0 +1,193 @@
+"""
+Dataset Explorer Mode
+Browse the test dataset's samples, activity distribution and per-feature
+statistics. Everything shown is computed once per dataset version; the
+feature table is searchable and paginated. Recordings larger than
+IN_MEMORY_LIMIT_BYTES are never loaded whole: their overview, histograms
+and correlations come from a single bounded-memory streaming pass.
+"""
+
+import os
+import streamlit as st
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+from dataset import LABEL_COLUMN, SUBJECT_COLUMN, find_dataset, load_har_dataset, read_columns, schema_dtypes
+from feature_stats import SUMMARY_COLUMNS, load_feature_stats, filter_features, page_count, paginate
+from streaming_stats import scan_csv
+from modes.common import file_version, shared_figure_cache
+
+SAMPLE_ROWS = 20
+PAGE_SIZES = [25, 50, 100]
+IN_MEMORY_LIMIT_BYTES = 512 * 1024 ** 2
+SCAN_WORKERS = min(os.cpu_count() or 1, 4)
+CORRELATION_FEATURES = 8
+TOP_CORRELATIONS = 10
+
+
+@st.cache_data(show_spinner=False)
+def dataset_overview(path, version):
+    """Feature statistics, activity counts and the first rows of a HAR CSV; cached per file version"""
+    stats, _ = load_feature_stats(path)
+    X, y, subject, _ = load_har_dataset(path)
+    sample = X.head(SAMPLE_ROWS).copy()
+    if subject is not None:
+        sample.insert(0, SUBJECT_COLUMN, subject.head(SAMPLE_ROWS).to_numpy())
+    if y is not None:
+        sample.insert(0, LABEL_COLUMN, y.head(SAMPLE_ROWS).to_numpy())
+    return {
+        'rows': len(X),
+        'stats': stats,
+        'activity_counts': y.value_counts() if y is not None else None,
+        'sample': sample
+    }
+
+
+@st.cache_data(show_spinner="Scanning recording in one streaming pass...")
+def scan_recording(path, version, _workers=SCAN_WORKERS):
+    """StreamingStats of a HAR CSV (bounded memory, process pool); cached per file version"""
+    return scan_csv(path, workers=_workers)
+
+
+def streaming_overview(path, version):
+    """Same shape as dataset_overview, without loading the file into memory"""
+    scan = scan_recording(path, version)
+    columns = read_columns(path)
+    id_columns = [c for c in (LABEL_COLUMN, SUBJECT_COLUMN) if c in columns]
+    sample = pd.read_csv(path, nrows=SAMPLE_ROWS, dtype=schema_dtypes(columns))
+    activity_counts = scan.activity_counts()
+    return {
+        'rows': scan.rows,
+        'stats': scan.summary(),
+        'activity_counts': activity_counts if len(activity_counts) else None,
+        'sample': sample[id_columns + scan.features]
+    }
+
+
+def render():
+    st.header("📈 Dataset Explorer")
+    
+    test_path = str(find_dataset("test.csv"))
+    
+    if Path(test_path).exists():
+        version = file_version(test_path)
+        size = os.path.getsize(test_path)
+        streamed = size > IN_MEMORY_LIMIT_BYTES
+        overview = streaming_overview(test_path, version) if streamed else dataset_overview(test_path, version)
+        stats = overview['stats']
+        activity_counts = overview['activity_counts']
+        
+        if streamed:
+            st.success(f"✅ Scanned {overview['rows']:,} samples from test dataset "
+                       f"({size / 1024 ** 2:,.0f} MB, streamed without loading it into memory)")
+            st.caption("Quartiles are interpolated from fixed-range histograms")
+        else:
+            st.success(f"✅ Loaded {overview['rows']} samples from test dataset")
+        
+        # Dataset info
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Total Samples", overview['rows'])
+        
+        with col2:
+            st.metric("Features", len(stats))
+        
+        with col3:
+            if activity_counts is not None:
+                st.metric("Activities", len(activity_counts))
+        
+        st.divider()
+        
+        # Feature statistics: search and page through one row per feature
+        st.subheader("📊 Feature Statistics")
+        
+        col1, col2, col3 = st.columns([3, 1, 1])
+        
+        with col1:
+            query = st.text_input("🔍 Search features", placeholder="e.g. tBodyAcc mean",
+                                  key="explorer_feature_query")
+        
+        matches = filter_features(stats, query)
+        
+        with col2:
+            page_size = st.selectbox("Per page", PAGE_SIZES, key="explorer_page_size")
+        
+        with col3:
+            pages = page_count(len(matches), page_size)
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1,
+                                   key=f"explorer_page_{query}_{page_size}")
+        
+        page_stats = paginate(matches, page, page_size)
+        
+        if matches.empty:
+            st.info(f"No features match '{query}'")
+        else:
+            first = (page - 1) * page_size + 1
+            st.caption(f"Features {first}–{first + len(page_stats) - 1} of {len(matches)}"
+                       + (f" matching '{query}'" if query.strip() else ""))
+            
+            show_activity_means = st.toggle("Show per-activity means", value=False, key="explorer_activity_means")
+            columns = list(stats.columns) if show_activity_means else SUMMARY_COLUMNS
+            st.dataframe(page_stats[columns], use_container_width=True)
+        
+        st.divider()
+        
+        # Show sample data for the features on the current page
+        st.subheader("📋 Sample Data")
+        sample = overview['sample']
+        id_columns = [c for c in (LABEL_COLUMN, SUBJECT_COLUMN) if c in sample.columns]
+        st.dataframe(sample[id_columns + list(page_stats.index)], use_container_width=True)
+        st.caption(f"First {len(sample)} rows; columns follow the feature page above")
+        
+        st.divider()
+        
+        # Activity distribution
+        if activity_counts is not None:
+            st.subheader("🎯 Activity Distribution")
+            
+            def render_activity_distribution():
+                fig, ax = plt.subplots(figsize=(10, 5))
+                ax.bar(activity_counts.index, activity_counts.values.astype(int), color='#667eea')
+                ax.set_xlabel('Activity Type')
+                ax.set_ylabel('Count')
+                ax.set_title('Distribution of Activities in Dataset')
+                plt.xticks(rotation=45)
+                plt.tight_layout()
+                return fig
+            
+            st.image(shared_figure_cache().get_or_render("explorer.activity_distribution", (test_path, version),
+                                                         render_activity_distribution),
+                     use_container_width=True)
+        
+        st.divider()
+        
+        # Histograms and correlations come from the streaming scan, whatever the file size
+        st.subheader("🗄️ Feature Distributions & Correlations")
+        
+        if streamed or st.toggle("Compute histograms and correlations (one streaming pass over the file)",
+                                 value=False, key="explorer_scan"):
+            scan = scan_recording(test_path, version)
+            features = list(page_stats.index) or scan.features
+            
+            feature = st.selectbox("Feature", features, key="explorer_histogram_feature")
+            labels, counts = scan.histogram(feature)
+            # Bins stay in value order (string labels would otherwise be sorted alphabetically)
+            st.bar_chart(pd.Series(counts, index=pd.Index(labels, name=feature), name="count"), sort=False)
+            
+            correlations = scan.correlation().loc[feature].drop(feature).dropna()
+            top = correlations.reindex(correlations.abs().sort_values(ascending=False).index).head(TOP_CORRELATIONS)
+            st.caption(f"Features most correlated with {feature}")
+            st.dataframe(top.rename("correlation").to_frame(), use_container_width=True)
+            
+            selected = st.multiselect("Correlation matrix features", scan.features,
+                                      default=features[:CORRELATION_FEATURES], key="explorer_corr_features")
+            if len(selected) > 1:
+                matrix = scan.correlation(selected)
+                st.dataframe(matrix.style.background_gradient(cmap='coolwarm', vmin=-1, vmax=1).format("{:.2f}"),
+                             use_container_width=True)
+            st.caption(f"{scan.rows:,} rows scanned; correlations use the {scan.complete_rows:,} rows "
+                       "with no missing feature")
+        
+    else:
+        st.error("❌ Test dataset not found!")
@@ -0,0 +1,473 @@
+"""
+Health Trend Dashboard Mode
+Health history accumulated across simulations: summaries, trends,
+fatigue detection and long-term subject risk.
+"""
+
+import streamlit as st
+import pandas as pd
+import matplotlib.pyplot as plt
+import numpy as np
+import time
+from profiling import profiler
+from downsampling import downsample, background_positions
+from health_trends import HealthAggregates, HealthHistory
+from fatigue_detector import FatigueDetector, WARMUP_SAMPLES
+from modes.common import get_health_store, get_risk_model, restore_health_session
+
+
+def render():
+    st.header("📅 Health Trend Dashboard")
+    st.subheader("Cumulative Health Analytics Across All Simulations")
+    restore_health_session()
+    
+    # Check if there's any health history data
+    if st.session_state.health_history.empty:
+        st.info("📝 No health trend data available yet. Run a Live Simulation to start collecting health metrics.")
+        
+        st.markdown("""
+        ### How to Start Tracking:
+        
+        1. Go to **🔴 Live Simulation** mode
+        2. Run a simulation (alerts can be enabled or disabled)
+        3. Return here to see cumulative health trends
+        
+        The dashboard will track:
+        - 📊 Risk trends over time
+        - 🚨 Fall events timeline
+        - ⚠️ Alert frequency
+        - 🏃 Activity distribution
+        - 💪 Fatigue and overactivity patterns
+        """)
+    else:
+        # The raw rows are only built when a panel has to be redrawn or exported
+        history = st.session_state.health_history
+        aggregates = st.session_state.health_aggregates
+        health_version = st.session_state.health_version
+        figures = st.session_state.figure_cache
+        sections = profiler.sections("health")
+        
+        # ====================================
+        # TOP SUMMARY CARDS
+        # ====================================
+        sections.mark("summary")
+        st.subheader("📊 Overall Health Summary")
+        
+        summary = aggregates.summary()
+        
+        col1, col2, col3, col4, col5, col6 = st.columns(6)
+        
+        with col1:
+            st.metric("📍 Total Samples", summary['total_samples'])
+        
+        with col2:
+            st.metric("🚨 Total Falls", summary['total_falls'])
+        
+        with col3:
+            st.metric("⚡ Highest Risk", f"{int(summary['highest_risk'])}/100")
+        
+        with col4:
+            st.metric("📈 Avg Risk", f"{summary['avg_risk']:.1f}/100")
+        
+        with col5:
+            st.metric("⚠️ High-Risk Alerts", summary['total_alerts'])
+        
+        with col6:
+            st.metric("🔎 Anomalies", summary['total_anomalies'])
+        
+        st.divider()
+        
+        # ====================================
+        # TRENDS SECTION
+        # ====================================
+        st.subheader("📈 Live Trend Analytics")
+        
+        # 1️⃣ Risk Trend Over Time
+        sections.mark("risk_trend")
+        st.markdown("#### 1️⃣ Risk Trend Over Time")
+        
+        if history.has_column('risk'):
+            def render_risk_trend():
+                df_health = history.frame()
+                fig1, ax1 = plt.subplots(figsize=(12, 5))
+                
+                risk_values = df_health['risk'].to_numpy()
+                critical = risk_values > 75
+                
+                # Plot risk as line chart, downsampled with critical spikes and falls kept
+                keep = critical | df_health['fall'].to_numpy(dtype=bool) if 'fall' in df_health.columns else critical
+                positions = downsample(risk_values, keep=keep)
+                ax1.plot(positions, risk_values[positions], 
+                        color='#667eea', linewidth=2, label='Risk Score')
+                
+                # Highlight critical spikes (risk > 75)
+                critical_indices = np.flatnonzero(critical)
+                if len(critical_indices) > 0:
+                    ax1.scatter(critical_indices, risk_values[critical_indices], 
+                               color='red', s=100, zorder=5, label='Critical Spikes', marker='X')
+                
+                # Add threshold lines
+                ax1.axhline(y=30, color='green', linestyle='--', alpha=0.5, label='Low Risk')
+                ax1.axhline(y=60, color='orange', linestyle='--', alpha=0.5, label='Medium Risk')
+                ax1.axhline(y=85, color='red', linestyle='--', alpha=0.5, label='High Risk')
+                
+                ax1.set_xlabel('Sample Index', fontsize=12)
+                ax1.set_ylabel('Risk Score', fontsize=12)
+                ax1.set_title('Risk Score Evolution', fontsize=14, fontweight='bold')
+                ax1.legend(loc='upper right')
+                ax1.grid(True, alpha=0.3)
+                ax1.set_ylim(0, 100)
+                return fig1
+            
+            st.image(figures.get_or_render("health.risk_trend", health_version, render_risk_trend),
+                     use_container_width=True)
+        else:
+            st.info("No risk data available yet")
+        
+        st.divider()
+        
+        # 2️⃣ Fall Trend Timeline
+        sections.mark("fall_timeline")
+        st.markdown("#### 2️⃣ Fall Event Timeline")
+        
+        if history.has_column('fall'):
+            fall_count = aggregates.total_falls
+            
+            if fall_count > 0:
+                st.metric("🚨 Fall Event Count", fall_count)
+            else:
+                st.success("✅ No fall events detected across all simulations!")
+            
+            def render_fall_timeline():
+                df_health = history.frame()
+                fig2, ax2 = plt.subplots(figsize=(12, 3))
+                
+                # Plot all samples as background (evenly thinned on long histories)
+                background = background_positions(len(df_health))
+                ax2.scatter(background, [0.5] * len(background), 
+                           color='lightgray', s=10, alpha=0.3, label='Normal')
+                
+                # Mark fall events
+                if fall_count > 0:
+                    fall_positions = np.flatnonzero(df_health['fall'].to_numpy(dtype=bool))
+                    ax2.scatter(fall_positions, [0.5] * len(fall_positions), 
+                               color='red', s=200, marker='X', zorder=5, label='Fall Detected')
+                
+                ax2.set_xlabel('Sample Index', fontsize=12)
+                ax2.set_title('Fall Events Across All Simulations', fontsize=14, fontweight='bold')
+                ax2.set_ylim(0, 1)
+                ax2.set_yticks([0.5])
+                ax2.set_yticklabels(['Timeline'])
+                ax2.legend(loc='upper right')
+                ax2.grid(True, alpha=0.3, axis='x')
+                return fig2
+            
+            st.image(figures.get_or_render("health.fall_timeline", health_version, render_fall_timeline),
+                     use_container_width=True)
+        else:
+            st.info("No fall data available")
+        
+        st.divider()
+        
+        # 3️⃣ Alert Frequency Chart
+        sections.mark("alert_frequency")
+        st.markdown("#### 3️⃣ Alert Frequency Over Time")
+        
+        col_left, col_right = st.columns(2)
+        
+        with col_left:
+            # Calculate alert counts
+            alert_summary = aggregates.severity_counts()
+            
+            def render_alert_frequency():
+                fig3, ax3 = plt.subplots(figsize=(8, 5))
+                
+                colors_map = {
+                    'INFO': '#3b82f6',
+                    'WARNING': '#f59e0b',
+                    'CRITICAL': '#ef4444',
+                    'EMERGENCY': '#991b1b'
+                }
+                
+                severities = list(alert_summary.keys())
+                counts = list(alert_summary.values())
+                bar_colors = [colors_map[s] for s in severities]
+                
+                bars = ax3.bar(severities, counts, color=bar_colors, edgecolor='black', linewidth=1.5)
+                
+                # Add value labels
+                for bar in bars:
+                    height = bar.get_height()
+                    ax3.text(bar.get_x() + bar.get_width()/2., height,
+                            f'{int(height)}',
+                            ha='center', va='bottom', fontsize=12, fontweight='bold')
+                
+                ax3.set_xlabel('Alert Severity', fontsize=12)
+                ax3.set_ylabel('Count', fontsize=12)
+                ax3.set_title('Cumulative Alert Distribution', fontsize=14, fontweight='bold')
+                ax3.grid(True, alpha=0.3, axis='y')
+                return fig3
+            
+            st.image(figures.get_or_render("health.alert_frequency", health_version, render_alert_frequency),
+                     use_container_width=True)
+        
+        with col_right:
+            st.markdown("**Alert Summary Statistics:**")
+            total_alerts_all = sum(alert_summary.values())
+            
+            for severity, count in alert_summary.items():
+                percentage = (count / total_alerts_all * 100) if total_alerts_all > 0 else 0
+                st.metric(f"{severity} Alerts", count, f"{percentage:.1f}%")
+        
+        st.divider()
+        
+        # 4️⃣ Activity Distribution
+        sections.mark("activity_distribution")
+        st.markdown("#### 4️⃣ Activity Distribution")
+        
+        activity_counts = aggregates.activity_counts()
+        
+        if activity_counts is not None:
+            
+            col_chart, col_table = st.columns([2, 1])
+            
+            with col_chart:
+                def render_activity_pie():
+                    fig4, ax4 = plt.subplots(figsize=(10, 6))
+                    
+                    # Create pie chart
+                    colors = plt.cm.Set3(range(len(activity_counts)))
+                    wedges, texts, autotexts = ax4.pie(
+                        activity_counts.values, 
+                        labels=activity_counts.index,
+                        autopct='%1.1f%%',
+                        colors=colors,
+                        startangle=90
+                    )
+                    
+                    # Enhance text
+                    for autotext in autotexts:
+                        autotext.set_color('white')
+                        autotext.set_fontweight('bold')
+                    
+                    ax4.set_title('Activity Distribution Across All Simulations', 
+                                 fontsize=14, fontweight='bold')
+                    return fig4
+                
+                st.image(figures.get_or_render("health.activity_pie", health_version, render_activity_pie),
+                         use_container_width=True)
+            
+            with col_table:
+                st.markdown("**Activity Breakdown:**")
+                activity_df = pd.DataFrame({
+                    'Activity': activity_counts.index,
+                    'Count': activity_counts.values,
+                    'Percentage': (activity_counts.values / activity_counts.sum() * 100).round(1)
+                })
+                st.dataframe(activity_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No activity data available")
+        
+        st.divider()
+        
+        # ====================================
+        # FATIGUE / OVERACTIVITY INSIGHT
+        # ====================================
+        sections.mark("fatigue")
+        st.subheader("💪 Fatigue & Activity Insights")
+        
+        # Change-point detector state, updated once per sample in the live loop
+        detector = st.session_state.fatigue_detector
+        detector_state = detector.state()
+        
+        if detector_state['samples'] > WARMUP_SAMPLES:
+            motion_state = detector_state['motion']
+            risk_state = detector_state['risk']
+            
+            if detector_state['fatigue']:
+                st.warning("⚠️ **Possible Fatigue Detected**")
+                st.markdown("""
+                Recent samples show:
+                - A sustained rise in motion intensity
+                - Rising risk scores at the same time
+                
+                **Recommendation:** Consider reducing activity intensity and taking rest breaks.
+                """)
+            
+            if detector_state['overexertion']:
+                st.warning("⚠️ **Overexertion Detected**")
+                st.markdown(f"""
+                Motion intensity shifted well above its baseline:
+                - Current motion level: {motion_state['level']:.3f}
+                - Baseline motion: {motion_state['baseline']:.3f}
+                """)
+            
+            if detector_state['inactivity']:
+                st.info("ℹ️ **Extended Inactivity Detected**")
+                st.markdown(f"""
+                Motion intensity dropped well below its baseline:
+                - Current motion level: {motion_state['level']:.3f}
+                - Baseline motion: {motion_state['baseline']:.3f}
+                
+                **Note:** Extended periods of low activity detected.
+                """)
+            
+            if not (detector_state['fatigue'] or detector_state['overexertion'] or detector_state['inactivity']):
+                st.success("✅ No sustained change in motion or risk")
+            
+            # Plain statistics of the last window, kept current per sample by HealthAggregates
+            recent = aggregates.recent_stats()
+            
+            col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+            with col_f1:
+                st.metric("Motion Level", f"{motion_state['level']:.3f}",
+                          delta=f"{motion_state['level'] - motion_state['baseline']:+.3f} vs baseline",
+                          delta_color="off")
+            with col_f2:
+                st.metric("Risk Level", f"{risk_state['level']:.1f}",
+                          delta=f"{risk_state['level'] - risk_state['baseline']:+.1f} vs baseline",
+                          delta_color="off")
+            with col_f3:
+                st.metric(f"Motion (last {recent['samples']})", f"{recent['motion_mean']:.3f}",
+                          delta=f"± {recent['motion_std']:.3f} std", delta_color="off")
+            with col_f4:
+                st.metric(f"Risk (last {recent['samples']})", f"{recent['risk_mean']:.1f}",
+                          delta=f"max {recent['risk_max']:.0f}", delta_color="off")
+            
+            # Detected change points, newest first
+            if detector_state['events']:
+                events = pd.DataFrame(detector_state['events'][::-1])
+                events.index = events.index + 1
+                st.dataframe(
+                    events[["timestamp", "type", "motion", "risk", "baseline_motion"]].head(20),
+                    use_container_width=True
+                )
+            
+            # Show trends chart
+            def render_fatigue_trends():
+                recent = np.array(detector.history, dtype=float)
+                samples = np.arange(len(recent))
+                fig5, (ax5a, ax5b) = plt.subplots(1, 2, figsize=(14, 4))
+                
+                # Motion trend
+                ax5a.plot(samples, recent[:, 0], color='#8b5cf6', alpha=0.6, label='Motion')
+                ax5a.plot(samples, recent[:, 2], color='#6366f1', linewidth=3, label='EWMA')
+                ax5a.axhline(motion_state['baseline'], color='gray', linestyle='--', label='Baseline')
+                ax5a.set_xlabel('Recent Sample Index')
+                ax5a.set_ylabel('Motion Magnitude')
+                ax5a.set_title(f'Motion Trend (Last {len(recent)} Samples)')
+                ax5a.legend()
+                ax5a.grid(True, alpha=0.3)
+                
+                # Risk trend
+                ax5b.plot(samples, recent[:, 1], color='#f59e0b', alpha=0.6, label='Risk')
+                ax5b.plot(samples, recent[:, 3], color='#ef4444', linewidth=3, label='EWMA')
+                ax5b.axhline(risk_state['baseline'], color='gray', linestyle='--', label='Baseline')
+                ax5b.set_xlabel('Recent Sample Index')
+                ax5b.set_ylabel('Risk Score')
+                ax5b.set_title(f'Risk Trend (Last {len(recent)} Samples)')
+                ax5b.legend()
+                ax5b.grid(True, alpha=0.3)
+                
+                plt.tight_layout()
+                return fig5
+            
+            st.image(figures.get_or_render("health.fatigue_trends", health_version, render_fatigue_trends),
+                     use_container_width=True)
+        else:
+            st.info(f"Collect more samples (at least {WARMUP_SAMPLES}) for fatigue analysis")
+        
+        st.divider()
+        
+        # ====================================
+        # LONG-TERM SUBJECT RISK
+        # ====================================
+        sections.mark("subject_risk")
+        st.subheader("🧭 Long-Term Subject Risk")
+        
+        risk_model = get_risk_model()
+        if len(risk_model):
+            now = time.time()
+            level_counts = risk_model.level_counts(now)
+            col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+            with col_r1:
+                st.metric("👥 Subjects", len(risk_model))
+            with col_r2:
+                st.metric("🔴 High Risk", int(level_counts['High']))
+            with col_r3:
+                st.metric("🟡 Medium Risk", int(level_counts['Medium']))
+            with col_r4:
+                st.metric("🟢 Low Risk", int(level_counts['Low']))
+            
+            # Highest decayed score first
+            rankings = risk_model.rankings(now, top=20)
+            rankings.index = rankings.index + 1
+            st.dataframe(
+                rankings.round({'falls': 2, 'near_falls': 2, 'inactive_hours': 3, 'safe_hours': 3, 'score': 1}),
+                use_container_width=True
+            )
+            st.caption(f"Falls, near-falls, inactive and safe-activity time decay with a "
+                       f"{risk_model.half_life_days}-day half-life")
+        else:
+            st.info("Run a Live Simulation to build long-term subject risk scores")
+        
+        st.divider()
+        
+        # ====================================
+        # PERSISTENCE - SAVE HEALTH TREND LOG
+        # ====================================
+        sections.mark("export")
+        st.subheader("💾 Export Health Trend Data")
+        
+        col_save1, col_save2, col_save3 = st.columns(3)
+        
+        with col_save1:
+            if st.button("💾 Save Health Trend Log", use_container_width=True):
+                # Samples are already appended to the store as they arrive; flush and seal the rest
+                health_store = get_health_store()
+                written = health_store.flush(seal=True)
+                st.success(f"✅ Flushed {written} pending records to {health_store.root}/ "
+                           f"({health_store.segment_count()} segments)")
+        
+        with col_save2:
+            if st.button("📥 Download Health Trend CSV", use_container_width=True):
+                csv = history.frame().to_csv(index=False)
+                st.download_button(
+                    label="Download CSV",
+                    data=csv,
+                    file_name=f"health_trend_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv"
+                )
+        
+        with col_save3:
+            # The durable store is shared by every session; by default only this session's view is cleared
+            clear_store = st.checkbox("Also delete the stored history for all sessions", value=False,
+                                      key="clear_health_store")
+            if st.button("🗑️ Clear Health History", use_container_width=True, type="secondary"):
+                if st.session_state.get('confirm_clear', False):
+                    st.session_state.health_history = HealthHistory()
+                    st.session_state.health_aggregates = HealthAggregates()
+                    st.session_state.fatigue_detector = FatigueDetector()
+                    if clear_store:
+                        get_health_store().clear()
+                    st.session_state.health_version += 1
+                    st.session_state.figure_cache.clear()
+                    st.session_state.confirm_clear = False
+                    st.success("✅ Health history cleared!")
+                    st.rerun()
+                else:
+                    st.session_state.confirm_clear = True
+                    if clear_store:
+                        st.warning("⚠️ Click again to permanently delete the stored health history of all sessions!")
+                    else:
+                        st.warning("⚠️ Click again to clear this session's health trends (the stored history is kept)")
+        
+        # Data summary, from counters rather than a scan of the history
+        first_ts, last_ts = history.timestamp_range() or ("-", "-")
+        st.markdown(f"""
+        **Current Health Trend Database:**
+        - Total Samples: {len(history)}
+        - Date Range: {first_ts} to {last_ts}
+        - Stored Size: {get_health_store().size_bytes() / 1024:.2f} KB (durable store, all sessions)
+        """)
+        sections.end()
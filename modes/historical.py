@@ -0,0 +1,374 @@
+"""
+Historical Dashboard Mode
+Activity tracking log overview: activity timeline and volume, range
+queries over the log index and fall/alert history.
+"""
+
+import streamlit as st
+import pandas as pd
+import matplotlib.pyplot as plt
+import numpy as np
+from profiling import profiler
+from downsampling import background_positions
+from rollups import counts_with_prefix
+from modes.common import (
+    file_version, load_tracking_log, shared_figure_cache, get_rollup_store, get_log_index, get_segment_store
+)
+
+
+def render():
+    st.header("📊 Historical Activity Dashboard")
+    sections = profiler.sections("historical")
+    
+    sections.mark("load_log")
+    log_version = file_version("activity_tracking_log.csv")
+    figures = shared_figure_cache()
+    
+    # Counts come from the rollup store instead of re-scanning raw rows
+    rollup_store = get_rollup_store("activity_tracking_log.csv")
+    rollup_store.refresh()
+    rollup_version = rollup_store.version
+    
+    # Raw rows are read only for the selected time range, via the log's time index
+    log_index = get_log_index("activity_tracking_log.csv")
+    log_index.refresh()
+    log_bounds = log_index.bounds() if log_index.available else None
+    
+    if log_bounds is not None:
+        first_ts, last_ts = log_bounds
+        range_presets = {
+            "Last 10 minutes": pd.Timedelta(minutes=10),
+            "Last hour": pd.Timedelta(hours=1),
+            "Last 24 hours": pd.Timedelta(days=1),
+            "Entire log": None,
+            "Custom range": None
+        }
+        
+        col_preset, col_from, col_to = st.columns([1, 2, 2])
+        
+        with col_preset:
+            preset = st.selectbox("🕒 Time range:", list(range_presets), index=1)
+        
+        if preset == "Custom range":
+            default_start = max(first_ts, last_ts - pd.Timedelta(hours=1))
+            with col_from:
+                from_date = st.date_input("From date", default_start.date(),
+                                          min_value=first_ts.date(), max_value=last_ts.date())
+                from_time = st.time_input("From time", default_start.time().replace(microsecond=0))
+            # The first whole minute after the last record, which may fall on the next day
+            default_end = last_ts.floor("min") + pd.Timedelta(minutes=1)
+            with col_to:
+                to_date = st.date_input("To date", default_end.date(),
+                                        min_value=first_ts.date(), max_value=default_end.date())
+                to_time = st.time_input("To time", default_end.time())
+            range_start = pd.Timestamp.combine(from_date, from_time)
+            range_end = pd.Timestamp.combine(to_date, to_time)
+        elif range_presets[preset] is None:
+            range_start, range_end = None, None
+        else:
+            # Whole seconds, so the per-second rollups match the raw rows exactly
+            range_end = last_ts.floor("s") + pd.Timedelta(seconds=1)
+            range_start = max(first_ts.floor("s"), range_end - range_presets[preset])
+        
+        log = log_index.read_range(range_start, range_end)
+        log_totals = rollup_store.totals(range_start, range_end)
+        
+        shown_start = log["timestamp"].iloc[0] if len(log) else range_start
+        shown_end = log["timestamp"].iloc[-1] if len(log) else range_end
+        st.caption(f"Showing {len(log):,} of {log_index.rows:,} records ({shown_start} → {shown_end})")
+    else:
+        # No timestamp column to index: fall back to the whole log
+        range_start, range_end = None, None
+        log = load_tracking_log("activity_tracking_log.csv", log_version)
+        log_totals = rollup_store.totals()
+    
+    if log.empty:
+        st.info("📝 No records in the selected time range")
+        st.stop()
+    
+    sections.mark("metrics")
+    
+    # Top metrics in columns
+    col1, col2, col3, col4 = st.columns(4)
+    
+    latest = rollup_store.latest or log.iloc[-1]
+    
+    with col1:
+        st.metric("🏃 Current Activity", latest.get("predicted_activity", "N/A"))
+    
+    with col2:
+        fall_status = "YES ⚠️" if latest.get("fall_detected", False) else "NO ✓"
+        st.metric("🚨 Fall Detected", fall_status)
+    
+    with col3:
+        risk = latest.get("risk_level", "Unknown")
+        st.metric("⚡ Risk Level", risk)
+    
+    with col4:
+        st.metric("📝 Total Records", int(log_totals["samples"]))
+    
+    st.divider()
+    
+    # Two column layout
+    sections.mark("recent_log_and_risk")
+    col_left, col_right = st.columns([2, 1])
+    
+    with col_left:
+        st.subheader("📋 Recent Activity Log")
+        display_count = st.slider("Number of records to display:", 5, 50, 20)
+        st.dataframe(log.head(display_count), use_container_width=True, height=300)
+    
+    with col_right:
+        st.subheader("📊 Risk Distribution")
+        if "risk_level" in log.columns:
+            def render_risk_overview():
+                risk_counts = counts_with_prefix(log_totals, "risk")
+                fig_risk, ax_risk = plt.subplots(figsize=(6, 4))
+                colors = {'Low': '#10b981', 'Medium': '#f59e0b', 'High': '#ef4444'}
+                ax_risk.bar(risk_counts.index, risk_counts.values.astype(int), 
+                           color=[colors.get(x, '#6366f1') for x in risk_counts.index])
+                ax_risk.set_xlabel('Risk Level')
+                ax_risk.set_ylabel('Count')
+                ax_risk.set_title('Risk Level Distribution')
+                plt.xticks(rotation=45)
+                return fig_risk
+            
+            st.image(figures.get_or_render("historical.risk_overview", rollup_version, render_risk_overview,
+                                           start=range_start, end=range_end),
+                     use_container_width=True)
+    
+    st.divider()
+    
+    # Activity tracking over time
+    sections.mark("activity_timeline")
+    st.subheader("⏱️ Activity Tracking Over Time")
+    
+    # Timeline and time-per-activity work on activity runs, not individual samples
+    segment_store = get_segment_store("activity_tracking_log.csv")
+    segment_store.refresh()
+    segments = segment_store.segments(range_start, range_end)
+    
+    def render_activity_timeline():
+        fig, ax = plt.subplots(figsize=(12, 5))
+        
+        if "timestamp" in log.columns:
+            # Create numeric mapping for activities
+            numeric_activities, unique_activities = pd.factorize(segments["activity"])
+            
+            # One horizontal bar per segment, joined by the transitions between them
+            ax.hlines(numeric_activities, segments["start"], segments["end"], linewidth=6, color='#667eea')
+            
+            fall_segments = segments[segments["falls"] > 0]
+            if len(fall_segments) > 0:
+                ax.scatter(fall_segments["start"], numeric_activities[fall_segments.index], 
+                          color='red', s=80, marker='X', zorder=5, label='Segment with fall')
+                ax.legend(loc='upper right')
+            
+            ax.set_yticks(range(len(unique_activities)))
+            ax.set_yticklabels(unique_activities)
+            ax.set_xlabel('Time')
+            ax.set_ylabel('Activity')
+            ax.set_title(f'{len(segments)} activity segments ({len(log)} samples)')
+            ax.grid(True, alpha=0.3)
+        else:
+            ax.plot(log["predicted_activity"].value_counts())
+        
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+        return fig
+    
+    st.image(figures.get_or_render("historical.activity_timeline", segment_store.version, render_activity_timeline,
+                                   start=range_start, end=range_end),
+             use_container_width=True)
+    
+    # Time spent per activity from segment durations
+    if "timestamp" in log.columns and len(segments) > 0:
+        st.subheader("⏳ Time Spent per Activity")
+        time_spent = segment_store.time_per_activity(range_start, range_end)
+        
+        col_chart, col_table = st.columns([2, 1])
+        
+        with col_chart:
+            def render_time_spent():
+                fig_time, ax_time = plt.subplots(figsize=(10, 4))
+                ax_time.barh(time_spent.index[::-1], time_spent["seconds"].to_numpy()[::-1] / 60, color='#667eea')
+                ax_time.set_xlabel('Minutes')
+                ax_time.set_title('Time Spent per Activity')
+                ax_time.grid(True, alpha=0.3, axis='x')
+                plt.tight_layout()
+                return fig_time
+            
+            st.image(figures.get_or_render("historical.time_spent", segment_store.version, render_time_spent,
+                                           start=range_start, end=range_end),
+                     use_container_width=True)
+        
+        with col_table:
+            st.dataframe(
+                pd.DataFrame({
+                    'Activity': time_spent.index,
+                    'Time': [f"{int(sec // 3600)}h {int(sec % 3600 // 60):02d}m {int(sec % 60):02d}s"
+                             for sec in time_spent["seconds"]],
+                    'Segments': time_spent["segments"].to_numpy(),
+                    'Share': [f"{share:.1%}" for share in time_spent["share"]]
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+    
+    # Activity volume per rollup bucket, at the finest level that fits the chart
+    sections.mark("activity_volume")
+    if "timestamp" in log.columns:
+        st.subheader("📆 Activity Volume Over Time")
+        
+        rollup_level, volume = rollup_store.series(range_start, range_end)
+        
+        def render_activity_volume():
+            fig_vol, ax_vol = plt.subplots(figsize=(12, 4))
+            activity_cols = [c for c in volume.columns if c.startswith("activity:")]
+            ax_vol.stackplot(volume.index, volume[activity_cols].to_numpy().T,
+                             labels=[c.split(":", 1)[1] for c in activity_cols], alpha=0.8)
+            
+            if "falls" in volume.columns and volume["falls"].any():
+                fall_buckets = volume.index[volume["falls"].to_numpy() > 0]
+                ax_vol.scatter(fall_buckets, volume.loc[fall_buckets, "samples"], 
+                              color='red', s=60, marker='X', zorder=5, label='Falls')
+            
+            ax_vol.set_xlabel('Time')
+            ax_vol.set_ylabel(f'Samples per {rollup_level}')
+            ax_vol.set_title(f'Activity Volume ({len(volume)} {rollup_level} buckets)')
+            ax_vol.legend(loc='upper left', fontsize=8, ncol=4)
+            ax_vol.grid(True, alpha=0.3)
+            plt.tight_layout()
+            return fig_vol
+        
+        st.image(figures.get_or_render("historical.activity_volume", rollup_version, render_activity_volume,
+                                       start=range_start, end=range_end),
+                 use_container_width=True)
+    
+    # Fall detection visualization
+    sections.mark("fall_analysis")
+    st.divider()
+    st.subheader("🚨 Fall Detection Analysis")
+    
+    # Check if fall_detected column exists
+    if "fall_detected" in log.columns:
+        fall_data = log.copy()
+        
+        # Convert fall_detected to boolean if needed
+        if fall_data["fall_detected"].dtype == 'object':
+            fall_data["fall_detected"] = fall_data["fall_detected"].map({True: True, 'True': True, 1: True, False: False, 'False': False, 0: False})
+        
+        # Fall statistics
+        total_falls = int(log_totals["falls"])
+        total_samples = int(log_totals["samples"])
+        fall_percentage = (total_falls / total_samples * 100) if total_samples > 0 else 0
+        
+        # Display metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("🚨 Total Falls", int(total_falls))
+        
+        with col2:
+            st.metric("📊 Total Samples", total_samples)
+        
+        with col3:
+            st.metric("📈 Fall Rate", f"{fall_percentage:.2f}%")
+        
+        with col4:
+            fall_status = "🔴 CRITICAL" if total_falls > 5 else "🟡 WARNING" if total_falls > 0 else "🟢 SAFE"
+            st.metric("⚡ Status", fall_status)
+        
+        st.divider()
+        
+        # Create visualizations
+        col_left, col_right = st.columns(2)
+        
+        with col_left:
+            st.subheader("📍 Fall Events Timeline")
+            
+            def render_fall_timeline():
+                fig1, ax1 = plt.subplots(figsize=(10, 5))
+                
+                # Background line standing in for all samples, every fall kept
+                indices = background_positions(len(fall_data))
+                fall_positions = np.flatnonzero(fall_data["fall_detected"] == True)
+                
+                ax1.plot(indices, [0.5] * len(indices), 'o', markersize=2, color='lightgray', alpha=0.3, label='Normal')
+                
+                # Highlight fall events
+                if len(fall_positions) > 0:
+                    ax1.scatter(fall_positions, [0.5] * len(fall_positions), 
+                               color='red', s=100, marker='X', label='Fall Detected', zorder=5)
+                
+                ax1.set_xlabel('Sample Index')
+                ax1.set_ylabel('Event')
+                ax1.set_title(f'Fall Events in Selected Range ({len(fall_data)} Samples)')
+                ax1.set_ylim(0, 1)
+                ax1.set_yticks([0.5])
+                ax1.set_yticklabels(['Activity Stream'])
+                ax1.legend(loc='upper right')
+                ax1.grid(True, alpha=0.3, axis='x')
+                return fig1
+            
+            st.image(figures.get_or_render("historical.fall_timeline", log_version, render_fall_timeline,
+                                           start=range_start, end=range_end),
+                     use_container_width=True)
+        
+        with col_right:
+            st.subheader("⚡ Risk Level Distribution")
+            
+            if "risk_level" in fall_data.columns:
+                def render_risk_distribution():
+                    risk_counts = counts_with_prefix(log_totals, "risk")
+                    
+                    fig2, ax2 = plt.subplots(figsize=(8, 5))
+                    
+                    # Color mapping
+                    colors = {'Low': '#10b981', 'Medium': '#f59e0b', 'High': '#ef4444'}
+                    bar_colors = [colors.get(level, '#6366f1') for level in risk_counts.index]
+                    
+                    bars = ax2.bar(risk_counts.index, risk_counts.values.astype(int), color=bar_colors, edgecolor='black', linewidth=1.5)
+                    
+                    # Add value labels on bars
+                    for bar in bars:
+                        height = bar.get_height()
+                        ax2.text(bar.get_x() + bar.get_width()/2., height,
+                                f'{int(height)}',
+                                ha='center', va='bottom', fontsize=12, fontweight='bold')
+                    
+                    ax2.set_xlabel('Risk Level', fontsize=12)
+                    ax2.set_ylabel('Count', fontsize=12)
+                    ax2.set_title('Distribution of Risk Levels', fontsize=14, fontweight='bold')
+                    ax2.grid(True, alpha=0.3, axis='y')
+                    return fig2
+                
+                st.image(figures.get_or_render("historical.risk_distribution", rollup_version, render_risk_distribution,
+                                               start=range_start, end=range_end),
+                         use_container_width=True)
+            else:
+                st.info("Risk level data not available")
+        
+        # Detailed fall event list
+        if total_falls > 0:
+            st.divider()
+            st.subheader("📋 Detailed Fall Events")
+            
+            fall_events = fall_data[fall_data["fall_detected"] == True].copy()
+            fall_events = fall_events.reset_index(drop=True)
+            fall_events.index = fall_events.index + 1  # Start from 1
+            
+            # Display table
+            st.dataframe(
+                fall_events[["timestamp", "predicted_activity", "risk_level"]].head(20),
+                use_container_width=True
+            )
+            
+            if len(fall_events) > 20:
+                st.info(f"Showing first 20 of {len(fall_events)} fall events")
+        else:
+            st.success("✅ No fall events detected in the activity log!")
+    else:
+        st.warning("⚠️ Fall detection data not available in the log file")
+    
+    sections.end()
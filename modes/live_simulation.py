@@ -0,0 +1,425 @@
+"""
+Live Simulation Mode
+Replays test.csv through the activity model, fall detection, alerting,
+inactivity and risk tracking as a live monitoring session.
+"""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import time
+import os
+from pathlib import Path
+from alert_system import SafetyAlertSystem, format_alert_message
+from feature_selection import fallback_model
+from dataset import find_dataset
+from model_registry import REGISTRY_DIR, ModelRegistry
+from inference_server import InferenceClient
+from motion_analysis import MAGNITUDE_COLS, GRAVITY_COLS, FALL_FEATURE_COLS, add_motion_features, movement_magnitude, detect_falls_heuristic, compute_risk_score
+from fall_state_machine import detect_falls_streaming
+from inactivity_monitor import InactivityMonitor, LOW_MOTION_RATIO, SAMPLE_SECONDS
+from profiling import profiler
+from modes.common import model_available, load_har_data, get_health_store, get_risk_model, get_model_handle
+
+
+def render():
+    st.header("🔴 Live Activity Monitoring Simulation")
+    
+    # Check for model
+    if not model_available():
+        st.error("❌ Model file 'activity_model.pkl' not found! Please train the model first.")
+        st.info("💡 Run the Jupyter notebook 'activity_recognition.ipynb' to train and save the model.")
+        st.stop()
+    
+    # Without a promoted registry version, prefer a current reduced-feature
+    # model from train_model.py --top-k, then the full bare model file
+    fallback_path, fallback_features = fallback_model()
+    
+    # Load model: take one snapshot for this run, so a hot-swap in the
+    # background never changes the model mid-simulation
+    try:
+        model_label, model, model_meta = get_model_handle("activity", fallback_path, fallback_features).get()
+        if model is None:
+            raise FileNotFoundError("no promoted or saved activity model")
+        model_features = (model_meta or {}).get('features')
+        if model_features:
+            st.success(f"✅ Model loaded successfully! ({model_label}, {len(model_features)} features)")
+        else:
+            st.success(f"✅ Model loaded successfully! ({model_label})")
+    except Exception as e:
+        st.error(f"Error loading model: {e}")
+        st.stop()
+    
+    # Initialize alert system
+    alert_system = SafetyAlertSystem()
+    alert_system.clear_session_alerts()  # Clear previous session alerts
+    
+    sections = profiler.sections("live")
+    
+    # Load test data: the motion baseline from the magnitude columns of the whole
+    # recording, and only the rows replayed (of the columns the model and fall detection need)
+    sections.mark("load_data")
+    test_path = str(find_dataset("test.csv"))
+    test_mtime = os.path.getmtime(test_path)
+    recording = load_har_data(test_path, test_mtime, tuple(MAGNITUDE_COLS))
+    total_rows = len(recording)
+    recording_mag = movement_magnitude(recording)
+    motion_baseline = (recording_mag.mean(), recording_mag.std())
+    
+    # The Max Samples input below keeps its value in session state across reruns
+    replay_rows = min(int(st.session_state.get("live_max_samples", min(100, total_rows))), total_rows)
+    needed = None
+    if model_features:
+        needed = tuple(sorted(set(model_features) | set(FALL_FEATURE_COLS) | {"Activity", "subject"}))
+    df = load_har_data(test_path, test_mtime, needed, replay_rows)
+    
+    st.info(f"🔄 Live simulation replaying {len(df)} of {total_rows} samples from test dataset")
+    
+    # Feature prediction
+    if model_features:
+        X = df[model_features]
+    else:
+        X = df.drop(columns=["Activity", "subject"], errors='ignore')
+    
+    # Use the shared micro-batching server (inference_server.py) when configured
+    sections.mark("predict")
+    inference_url = os.environ.get("INFERENCE_SERVER_URL")
+    if inference_url:
+        try:
+            client = InferenceClient(inference_url)
+            df["Predicted Activity"] = client.predict("activity", X)
+            client.close()
+        except (OSError, RuntimeError, KeyError, ValueError) as e:
+            st.warning(f"⚠️ Inference server unavailable ({e}), predicting locally")
+            df["Predicted Activity"] = model.predict(X)
+    else:
+        df["Predicted Activity"] = model.predict(X)
+    
+    # Movement magnitude and anomaly thresholds
+    sections.mark("fall_detection")
+    mean_mag, std_mag = add_motion_features(df, motion_baseline)
+    
+    def motion_fall_events():
+        """Impact → posture → inactivity state machine per subject, or the spike heuristic without orientation"""
+        if all(col in df.columns for col in GRAVITY_COLS):
+            return detect_falls_streaming(df["acc_mag"], df[GRAVITY_COLS], df.get("subject"))
+        return detect_falls_heuristic(df["acc_mag"], df["Possible_Fall"], mean_mag)
+    
+    # Fall detection using supervised model from fall_detection.ipynb
+    fall_model_available = (Path("fall_detection_model.pkl").exists()
+                            or ModelRegistry(REGISTRY_DIR).current_version("fall") is not None)
+    
+    if fall_model_available:
+        try:
+            # Current fall detection model from the shared hot-swap handle
+            _, fall_model, _ = get_model_handle("fall", "fall_detection_model.pkl").get()
+            
+            # Use available features that match the model's training features
+            available_cols = [col for col in FALL_FEATURE_COLS if col in df.columns]
+            
+            if available_cols:
+                X_fall = df[available_cols].to_numpy(dtype=np.float32)
+                df["Fall_Event"] = fall_model.predict(X_fall).astype(bool)
+                st.success("✅ Using supervised fall detection model from fall_detection.ipynb")
+            else:
+                # Fallback to heuristic if features not available
+                df["Fall_Event"] = motion_fall_events()
+                st.warning("⚠️ Required features not available, using heuristic fall detection")
+                
+        except Exception as e:
+            # Fallback to motion-based heuristic if model fails
+            st.warning(f"⚠️ Could not load fall model ({e}), using heuristic detection")
+            df["Fall_Event"] = motion_fall_events()
+    else:
+        # Fallback to motion-based heuristic
+        st.info("ℹ️ Supervised fall detection model not found, using motion-based fall detection")
+        df["Fall_Event"] = motion_fall_events()
+    
+    sections.end()
+    
+    # Control panel
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    
+    with col1:
+        start_simulation = st.button("▶️ Start Simulation", type="primary", use_container_width=True)
+    
+    with col2:
+        simulation_speed = st.select_slider("Speed", options=[0.1, 0.3, 0.5, 1.0, 2.0], value=0.5)
+    
+    with col3:
+        max_samples = st.number_input("Max Samples", min_value=10, max_value=total_rows, value=min(100, total_rows),
+                                      key="live_max_samples")
+    
+    with col4:
+        enable_alerts = st.checkbox("🚨 Enable Alerts", value=True, help="Generate and log safety alerts during simulation")
+    
+    st.divider()
+    
+    # Live monitoring placeholder
+    if start_simulation:
+        # Clear previous session data when starting new simulation
+        st.session_state.current_session_alerts = []
+        st.session_state.current_session_samples = 0
+        st.session_state.simulation_completed = False
+        
+        st.subheader("🎯 Live Monitoring")
+        
+        # Placeholders
+        placeholder_metrics = st.empty()
+        placeholder_status = st.empty()
+        placeholder_chart = st.empty()
+        progress_bar = st.progress(0)
+        
+        # Prolonged-inactivity wellness alerts on the sample clock
+        inactivity = InactivityMonitor(low_motion=LOW_MOTION_RATIO * mean_mag)
+        previous_subject = None
+        
+        i = 0
+        while i < min(max_samples, len(df)):
+            current_row = df.iloc[i:i+1]
+            
+            activity = current_row["Predicted Activity"].iloc[0]
+            motion = current_row["acc_mag"].iloc[0]
+            is_anomaly = current_row["Possible_Fall"].iloc[0]
+            is_alert = current_row["High_Risk_Alert"].iloc[0]
+            is_fall = current_row["Fall_Event"].iloc[0]
+            subject = current_row["subject"].iloc[0] if "subject" in current_row.columns else 0
+            
+            # Calculate risk score
+            risk = compute_risk_score(motion, mean_mag, is_anomaly, is_alert, is_fall)
+            
+            # Generate safety alert if enabled
+            current_alert = None
+            wellness_alerts = []
+            if enable_alerts:
+                with profiler.span("live.generate_alert"):
+                    current_alert = alert_system.generate_alert(
+                        activity=activity,
+                        risk_score=risk,
+                        motion_intensity=motion,
+                        is_fall=is_fall,
+                        is_anomaly=is_anomaly,
+                        is_high_alert=is_alert,
+                        sample_index=i
+                    )
+                
+                # Store alert in session state for later viewing
+                if current_alert:
+                    st.session_state.current_session_alerts.append(current_alert)
+                
+                with profiler.span("live.inactivity"):
+                    now = i * SAMPLE_SECONDS
+                    if previous_subject is not None and subject != previous_subject:
+                        # The recording moved on to another subject
+                        inactivity.forget(previous_subject)
+                    previous_subject = subject
+                    inactivity.observe(subject, activity, motion, now)
+                    for subject_id, rest_activity, inactive_seconds in inactivity.poll(now):
+                        wellness_alerts.append(alert_system.generate_wellness_alert(
+                            activity=rest_activity,
+                            inactive_seconds=inactive_seconds,
+                            risk_score=risk,
+                            motion_intensity=motion,
+                            subject=subject_id,
+                            sample_index=i
+                        ))
+                    st.session_state.current_session_alerts.extend(wellness_alerts)
+                
+                # Save critical alerts to log immediately
+                if current_alert and current_alert['severity'] in ['CRITICAL', 'EMERGENCY']:
+                    with profiler.span("live.save_alert_to_log"):
+                        alert_system.save_alert_to_log(current_alert)
+            
+            # Append to Health Trend Dashboard history
+            with profiler.span("live.health_append"):
+                health_entry = {
+                    'timestamp': pd.Timestamp.now(),
+                    'activity': activity,
+                    'risk': risk,
+                    'motion': motion,
+                    'fall': is_fall,
+                    'alert': is_alert,
+                    'anomaly': is_anomaly
+                }
+                # Before the dashboard has restored this session's history, the store alone records it
+                if 'health_history' in st.session_state:
+                    st.session_state.health_history.append(health_entry)
+                    st.session_state.health_aggregates.update(health_entry)
+                    st.session_state.fatigue_detector.update(health_entry)
+                get_health_store().append(health_entry)
+                st.session_state.health_version += 1
+            
+            with profiler.span("live.risk_model"):
+                get_risk_model().record_sample(subject, time.time(), activity, SAMPLE_SECONDS,
+                                               is_fall=is_fall, is_anomaly=is_anomaly, is_alert=is_alert)
+            
+            # Display metrics
+            render_started = time.perf_counter()
+            with placeholder_metrics.container():
+                col1, col2, col3, col4 = st.columns(4)
+                
+                with col1:
+                    st.metric("🏃 Activity", activity)
+                
+                with col2:
+                    st.metric("📊 Motion", f"{motion:.3f}")
+                
+                with col3:
+                    st.metric("🛡️ Risk Score", f"{risk}/100")
+                
+                with col4:
+                    st.metric("📍 Sample", f"{i+1}/{max_samples}")
+            
+            # Display status
+            with placeholder_status.container():
+                if is_fall:
+                    st.error("🚨 **CRITICAL: Likely FALL detected!**")
+                elif is_alert:
+                    st.error("⚠️ **HIGH RISK: Significant motion spike detected**")
+                elif is_anomaly:
+                    st.warning("🔎 **CAUTION: Unusual movement pattern**")
+                else:
+                    st.success("✅ **NORMAL: Movement within safe parameters**")
+                
+                for wellness_alert in wellness_alerts:
+                    st.info(wellness_alert['message'])
+                
+                # Risk level indicator
+                if risk < 30:
+                    st.success("🟢 Low Risk - Stable condition")
+                elif risk < 60:
+                    st.warning("🟡 Medium Risk - Monitor closely")
+                elif risk < 85:
+                    st.error("🟠 High Risk - Potential danger")
+                else:
+                    st.error("🔴 CRITICAL - Immediate attention required!")
+            
+            # Update progress
+            progress_bar.progress((i + 1) / max_samples)
+            profiler.record("live.render", time.perf_counter() - render_started)
+            
+            time.sleep(simulation_speed)
+            i += 1
+        
+        # Persist the samples still buffered for the health store, and the long-term risk counters
+        get_health_store().flush()
+        get_risk_model().save()
+        
+        # Mark simulation as completed and store sample count
+        st.session_state.simulation_completed = True
+        st.session_state.current_session_samples = max_samples
+        
+        st.success("✅ Simulation completed!")
+        
+        # Display alert summary if alerts were enabled
+        if enable_alerts:
+            st.divider()
+            st.subheader("🚨 Alert Summary")
+            
+            session_summary = alert_system.get_session_summary()
+            
+            if session_summary['total_alerts'] > 0:
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.metric("📢 Total Alerts", session_summary['total_alerts'])
+                
+                with col2:
+                    st.metric("🔴 Critical/Emergency", session_summary['critical_count'])
+                
+                with col3:
+                    if st.button("💾 Save All Alerts to Log"):
+                        for alert in alert_system.current_session_alerts:
+                            alert_system.save_alert_to_log(alert)
+                        st.success("Alerts saved to log!")
+                
+                # Show breakdown by severity
+                st.write("**Alerts by Severity:**")
+                severity_df = pd.DataFrame({
+                    'Severity': list(session_summary['by_severity'].keys()),
+                    'Count': list(session_summary['by_severity'].values())
+                })
+                st.bar_chart(severity_df.set_index('Severity'))
+                
+                # Show critical alerts
+                critical_alerts = [a for a in alert_system.current_session_alerts 
+                                 if a['severity'] in ['CRITICAL', 'EMERGENCY']]
+                
+                if critical_alerts:
+                    st.error(f"**⚠️ {len(critical_alerts)} Critical/Emergency Alerts Detected**")
+                    
+                    with st.expander("View Critical Alerts"):
+                        for idx, alert in enumerate(critical_alerts, 1):
+                            st.markdown(f"### Alert #{idx}")
+                            st.markdown(format_alert_message(alert))
+                            st.divider()
+            else:
+                st.success("✅ No safety alerts were generated during this simulation")
+    
+    # Summary statistics - Only for simulated samples
+    st.divider()
+    st.header("📊 Simulation Summary")
+    
+    # Get the range that will be/was simulated
+    simulated_range = min(max_samples, len(df))
+    simulated_data = df.head(simulated_range)
+    
+    st.info(f"📍 Analysis based on **{simulated_range}** simulated samples (out of {total_rows} total)")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.subheader("🔎 Anomaly Detection")
+        anomaly_count = int(simulated_data['Possible_Fall'].sum())
+        anomaly_rate = (anomaly_count / len(simulated_data) * 100) if len(simulated_data) > 0 else 0
+        st.metric("Unusual Movements", anomaly_count)
+        st.caption(f"{anomaly_rate:.1f}% of simulated samples")
+        st.progress(min(anomaly_count / len(simulated_data), 1.0))
+    
+    with col2:
+        st.subheader("🚨 Fall Detection")
+        fall_count = int(simulated_data["Fall_Event"].sum())
+        fall_rate = (fall_count / len(simulated_data) * 100) if len(simulated_data) > 0 else 0
+        if fall_count > 0:
+            st.error(f"⚠️ {fall_count} fall events")
+            st.caption(f"{fall_rate:.1f}% of simulated samples")
+        else:
+            st.success("✅ No falls detected")
+            st.caption("0% fall rate")
+    
+    with col3:
+        st.subheader("⚠️ Safety Alerts")
+        alert_count = int(simulated_data["High_Risk_Alert"].sum())
+        alert_rate = (alert_count / len(simulated_data) * 100) if len(simulated_data) > 0 else 0
+        if alert_count > 0:
+            st.warning(f"📢 {alert_count} high-risk alerts")
+            st.caption(f"{alert_rate:.1f}% of simulated samples")
+        else:
+            st.success("✅ No alerts")
+            st.caption("0% alert rate")
+    
+    st.divider()
+    st.subheader("📈 Activity Distribution")
+    st.caption(f"Distribution of activities in the {simulated_range} simulated samples")
+    
+    # Create activity distribution chart
+    activity_dist = simulated_data["Predicted Activity"].value_counts()
+    st.bar_chart(activity_dist)
+    
+    # Show detailed breakdown
+    st.subheader("📋 Detailed Activity Breakdown")
+    col_a, col_b = st.columns(2)
+    
+    with col_a:
+        activity_df = pd.DataFrame({
+            'Activity': activity_dist.index,
+            'Count': activity_dist.values.astype(int),
+            'Percentage': (activity_dist.values.astype(float) / len(simulated_data) * 100).round(2)
+        })
+        st.dataframe(activity_df, use_container_width=True, hide_index=True)
+    
+    with col_b:
+        # Summary statistics
+        st.metric("Total Activities", len(activity_dist))
+        st.metric("Most Common", activity_dist.index[0])
+        st.metric("Least Common", activity_dist.index[-1])
@@ -0,0 +1,82 @@
+"""
+Performance Mode
+Per-stage latency percentiles, figure cache statistics and on-demand
+cProfile capture.
+"""
+
+import streamlit as st
+import pandas as pd
+from profiling import profiler
+from modes.common import shared_figure_cache
+
+
+def render():
+    st.header("⏱️ Pipeline Performance")
+    st.subheader("Per-Stage Latency Across All Sessions")
+    
+    stage_stats = profiler.snapshot()
+    
+    if not stage_stats:
+        st.info("📝 No timings recorded yet. Use the other modes (e.g. run a Live Simulation) to collect stage timings.")
+    else:
+        stats_df = pd.DataFrame(stage_stats)
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("⏱️ Stages Tracked", len(stats_df))
+        
+        with col2:
+            slowest = stats_df.iloc[0]
+            st.metric("🐢 Slowest p95", slowest['stage'], f"{slowest['p95_ms']:.1f} ms", delta_color="off")
+        
+        with col3:
+            busiest = stats_df.sort_values('total_s', ascending=False).iloc[0]
+            st.metric("🔥 Most Total Time", busiest['stage'], f"{busiest['total_s']:.1f} s", delta_color="off")
+        
+        st.dataframe(
+            stats_df.round(3),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                'mean_ms': 'mean (ms)', 'p50_ms': 'p50 (ms)', 'p95_ms': 'p95 (ms)',
+                'p99_ms': 'p99 (ms)', 'max_ms': 'max (ms)', 'total_s': 'total (s)'
+            }
+        )
+        st.caption("Percentiles come from fixed-size log-scale histograms (~12% bucket resolution).")
+    
+    st.divider()
+    st.subheader("🖼️ Figure Cache")
+    
+    col1, col2 = st.columns(2)
+    
+    for column, (label, cache) in zip((col1, col2), [
+        ("Historical (shared)", shared_figure_cache()),
+        ("Health Trends (this session)", st.session_state.figure_cache)
+    ]):
+        with column:
+            lookups = cache.hits + cache.misses
+            hit_rate = f"{cache.hits / lookups:.0%} hits" if lookups else None
+            st.metric(label, f"{cache.hits} / {lookups}", hit_rate, delta_color="off")
+    
+    st.caption("Panels are re-rendered only when their data version or widget parameters change.")
+    
+    st.divider()
+    st.subheader("🔬 cProfile Capture")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("🔬 Profile Next Rerun", use_container_width=True):
+            st.session_state.profile_next_rerun = True
+            st.success("✅ The next rerun will be profiled - switch to the mode you want to inspect, then come back here.")
+    
+    with col2:
+        if st.button("🔄 Reset Timings", use_container_width=True):
+            profiler.reset()
+            st.rerun()
+    
+    if 'last_profile' in st.session_state:
+        st.code(st.session_state.last_profile, language="text")
+    else:
+        st.info("No cProfile capture yet")
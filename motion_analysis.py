@@ -0,0 +1,80 @@
+"""
+Motion Analysis
+Movement magnitude, anomaly thresholds, heuristic fall detection and the
+per-sample risk score used by the Live Simulation pipeline.
+"""
+
+import numpy as np
+
+MAGNITUDE_COLS = ["tBodyAcc-mean()-X", "tBodyAcc-mean()-Y", "tBodyAcc-mean()-Z"]
+GRAVITY_COLS = ["tGravityAcc-mean()-X", "tGravityAcc-mean()-Y", "tGravityAcc-mean()-Z"]
+
+# Features used by the supervised fall detection model (fall_detection.ipynb)
+FALL_FEATURE_COLS = MAGNITUDE_COLS + [
+    "tBodyAcc-std()-X", "tBodyAcc-std()-Y", "tBodyAcc-std()-Z",
+    "tBodyAcc-max()-X", "tBodyAcc-max()-Y", "tBodyAcc-max()-Z",
+    "tBodyAcc-min()-X", "tBodyAcc-min()-Y", "tBodyAcc-min()-Z"
+] + GRAVITY_COLS
+
+# Anomaly thresholds in standard deviations above the mean magnitude
+ANOMALY_STD = 2.0
+HIGH_RISK_STD = 3.5
+
+
+def movement_magnitude(df):
+    """Body acceleration magnitude of every row of df"""
+    return np.sqrt(
+        (df[MAGNITUDE_COLS[0]] ** 2) +
+        (df[MAGNITUDE_COLS[1]] ** 2) +
+        (df[MAGNITUDE_COLS[2]] ** 2)
+    )
+
+
+def add_motion_features(df, baseline=None):
+    """
+    Add acc_mag, Possible_Fall and High_Risk_Alert columns to df
+
+    baseline: optional (mean_mag, std_mag) to threshold against, e.g. of the
+    whole recording when df is only part of it; default: df's own
+
+    Returns: (mean_mag, std_mag) of the movement magnitude
+    """
+    df["acc_mag"] = movement_magnitude(df)
+
+    if baseline is None:
+        baseline = (df["acc_mag"].mean(), df["acc_mag"].std())
+    mean_mag, std_mag = baseline
+
+    df["Possible_Fall"] = df["acc_mag"] > mean_mag + ANOMALY_STD * std_mag
+    df["High_Risk_Alert"] = df["acc_mag"] > mean_mag + HIGH_RISK_STD * std_mag
+
+    return mean_mag, std_mag
+
+
+def detect_falls_heuristic(acc_mag, possible_fall, mean_mag):
+    """
+    Motion-based fall heuristic: an anomalous spike followed by a sample
+    below the mean magnitude. The first and last samples are never flagged.
+
+    Returns: boolean numpy array
+    """
+    acc_mag = np.asarray(acc_mag)
+    possible_fall = np.asarray(possible_fall, dtype=bool)
+
+    falls = np.zeros(len(acc_mag), dtype=bool)
+    if len(acc_mag) > 2:
+        falls[1:-1] = possible_fall[1:-1] & (acc_mag[2:] < mean_mag)
+    return falls
+
+
+def compute_risk_score(motion, mean_mag, is_anomaly, is_alert, is_fall):
+    """Risk score 0-100: up to 25 from relative motion plus 25 per active flag"""
+    risk = 0
+    risk += min((motion / mean_mag) * 25, 25)
+    if is_anomaly:
+        risk += 25
+    if is_alert:
+        risk += 25
+    if is_fall:
+        risk += 25
+    return int(min(risk, 100))
@@ -0,0 +1,136 @@
+"""
+Pipeline Profiling
+Lightweight timing spans for pipeline stages and dashboard sections,
+recorded into fixed-size log-bucketed histograms so memory stays constant
+no matter how long the app runs. One profiler is shared per process.
+"""
+
+import cProfile
+import io
+import math
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Histogram range: 1 µs to 1000 s, 20 buckets per decade (~12% resolution)
+MIN_SECONDS = 1e-6
+DECADES = 9
+BUCKETS_PER_DECADE = 20
+
+
+class LatencyHistogram:
+    """Fixed-size histogram of durations with approximate percentiles"""
+
+    def __init__(self):
+        self.counts = np.zeros(DECADES * BUCKETS_PER_DECADE + 2, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        if seconds < MIN_SECONDS:
+            idx = 0
+        else:
+            idx = 1 + int(math.log10(seconds / MIN_SECONDS) * BUCKETS_PER_DECADE)
+            idx = min(idx, len(self.counts) - 1)
+        self.counts[idx] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (q in 0-100)"""
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(self.count * q / 100)
+        idx = int(np.searchsorted(np.cumsum(self.counts), max(rank, 1)))
+        upper = MIN_SECONDS * 10 ** (idx / BUCKETS_PER_DECADE)
+        return min(upper, self.max)
+
+
+class SectionSequence:
+    """
+    Times consecutive sections without re-indenting them:
+    mark("a") ... mark("b") ... end() records "a" and "b"
+    """
+
+    def __init__(self, profiler, prefix):
+        self.profiler = profiler
+        self.prefix = prefix
+        self.current = None
+        self.started = None
+
+    def mark(self, name):
+        self.end()
+        self.current = name
+        self.started = time.perf_counter()
+
+    def end(self):
+        if self.current is not None:
+            self.profiler.record(f"{self.prefix}.{self.current}", time.perf_counter() - self.started)
+            self.current = None
+
+
+class StageProfiler:
+    """Per-stage latency histograms shared by all sessions in the process"""
+
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            if stage not in self.histograms:
+                self.histograms[stage] = LatencyHistogram()
+            self.histograms[stage].record(seconds)
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def sections(self, prefix):
+        return SectionSequence(self, prefix)
+
+    def snapshot(self):
+        """Per-stage statistics in milliseconds, slowest p95 first"""
+        with self._lock:
+            rows = [{
+                'stage': stage,
+                'count': hist.count,
+                'mean_ms': hist.total / hist.count * 1000,
+                'p50_ms': hist.percentile(50) * 1000,
+                'p95_ms': hist.percentile(95) * 1000,
+                'p99_ms': hist.percentile(99) * 1000,
+                'max_ms': hist.max * 1000,
+                'total_s': hist.total
+            } for stage, hist in self.histograms.items() if hist.count]
+        return sorted(rows, key=lambda row: row['p95_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+
+profiler = StageProfiler()
+
+
+def start_capture():
+    """Start a cProfile capture on the current (script) thread"""
+    capture = cProfile.Profile()
+    capture.enable()
+    return capture
+
+
+def finish_capture(capture, limit=40):
+    """Stop a capture and return the top functions by cumulative time as text"""
+    capture.disable()
+    output = io.StringIO()
+    pstats.Stats(capture, stream=output).sort_stats("cumulative").print_stats(limit)
+    return output.getvalue()
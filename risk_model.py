@@ -0,0 +1,174 @@
+"""
+Long-Term Risk Model
+Per-subject long-term risk (decision_logic.md §7) kept as exponentially
+decayed counters: falls, near-falls (anomalies / motion spikes),
+inactive time and safe activity time. Counters decay with a half-life,
+so old events fade without keeping any history; each update and each
+score query is O(1), and the whole fleet is scored with one vectorized
+pass. State is saved as a small .npz file.
+"""
+
+import json
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+RISK_MODEL_PATH = "risk_model.npz"
+
+HALF_LIFE_DAYS = 7
+
+COUNTERS = ['falls', 'near_falls', 'inactive_hours', 'safe_hours']
+
+# Score points per decayed unit of each counter (safe activity lowers the score)
+WEIGHTS = {'falls': 30.0, 'near_falls': 5.0, 'inactive_hours': 10.0, 'safe_hours': -10.0}
+
+SAFE_ACTIVITIES = {'WALKING'}
+INACTIVE_ACTIVITIES = {'SITTING', 'LAYING'}
+
+# Upper bounds of the Low and Medium levels
+LEVEL_BOUNDS = (30, 60)
+LEVELS = ['Low', 'Medium', 'High']
+
+
+def risk_level(score):
+    """Low / Medium / High for a 0-100 score (scalar or array)"""
+    return np.array(LEVELS, dtype=object)[np.searchsorted(LEVEL_BOUNDS, score, side='right')]
+
+
+class RiskModel:
+    """Exponentially decayed per-subject risk counters; subjects are keyed by str(subject)"""
+
+    def __init__(self, half_life_days=HALF_LIFE_DAYS, capacity=64):
+        self.half_life_days = half_life_days
+        self.decay_rate = np.log(2) / (half_life_days * 86400)
+        self._lock = threading.Lock()
+        self._reset(capacity)
+
+    def _reset(self, capacity):
+        self.subjects = []
+        self._rows = {}
+        self.updated_at = np.zeros(capacity, dtype=np.float64)
+        self.counters = np.zeros((capacity, len(COUNTERS)), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.subjects)
+
+    def _row(self, subject):
+        subject = str(subject)
+        row = self._rows.get(subject)
+        if row is None:
+            row = len(self.subjects)
+            if row == len(self.updated_at):
+                self.updated_at = np.pad(self.updated_at, (0, row))
+                self.counters = np.pad(self.counters, ((0, row), (0, 0)))
+            self._rows[subject] = row
+            self.subjects.append(subject)
+            self.updated_at[row] = 0.0
+            self.counters[row] = 0.0
+        return row
+
+    def _decay_factor(self, row, now):
+        # Scalar math: numpy per-element overhead would dominate single-subject updates
+        return math.exp(-self.decay_rate * max(now - float(self.updated_at[row]), 0.0))
+
+    def record(self, subject, now, falls=0, near_falls=0, inactive_seconds=0.0, safe_seconds=0.0):
+        """Decay the subject's counters to `now` (epoch seconds) and add the new amounts"""
+        with self._lock:
+            row = self._row(subject)
+            factor = self._decay_factor(row, now) if self.updated_at[row] else 1.0
+            f, n, i, s = self.counters[row].tolist()
+            self.counters[row] = (f * factor + falls, n * factor + near_falls,
+                                  i * factor + inactive_seconds / 3600, s * factor + safe_seconds / 3600)
+            self.updated_at[row] = max(now, self.updated_at[row])
+
+    def record_sample(self, subject, now, activity, duration, is_fall=False, is_anomaly=False,
+                      is_alert=False):
+        """Fold one monitored sample covering `duration` seconds"""
+        activity = str(activity).upper()
+        near_fall = (is_anomaly or is_alert) and not is_fall
+        self.record(
+            subject, now,
+            falls=int(bool(is_fall)),
+            near_falls=int(bool(near_fall)),
+            inactive_seconds=duration if activity in INACTIVE_ACTIVITIES else 0.0,
+            safe_seconds=duration if activity in SAFE_ACTIVITIES and not near_fall and not is_fall else 0.0
+        )
+
+    def _scores(self, counters):
+        weights = np.array([WEIGHTS[name] for name in COUNTERS])
+        return np.clip(counters @ weights, 0, 100)
+
+    def _score_row(self, row, now):
+        factor = self._decay_factor(row, now)
+        total = sum(value * WEIGHTS[name] for name, value in zip(COUNTERS, self.counters[row].tolist()))
+        return min(max(total * factor, 0.0), 100.0)
+
+    def decayed(self, now):
+        """(n_subjects, len(COUNTERS)) counters as of `now`, without modifying the model"""
+        with self._lock:
+            n = len(self.subjects)
+            elapsed = np.maximum(now - self.updated_at[:n], 0.0)
+            return self.counters[:n] * np.exp(-self.decay_rate * elapsed)[:, None]
+
+    def score(self, subject, now):
+        """Returns: (score 0-100, level) of one subject, or None if it was never seen"""
+        row = self._rows.get(str(subject))
+        if row is None:
+            return None
+        score = self._score_row(row, now)
+        level = LEVELS[sum(score >= bound for bound in LEVEL_BOUNDS)]
+        return score, level
+
+    def rankings(self, now, top=None):
+        """Every subject's decayed counters, score and level, highest risk first"""
+        counters = self.decayed(now)
+        frame = pd.DataFrame(counters, columns=COUNTERS)
+        frame.insert(0, 'subject', self.subjects[:len(counters)])
+        frame['score'] = self._scores(frame[COUNTERS].to_numpy())
+        frame['level'] = risk_level(frame['score'].to_numpy())
+        frame = frame.sort_values('score', ascending=False, kind='stable').reset_index(drop=True)
+        return frame if top is None else frame.head(top)
+
+    def level_counts(self, now):
+        """Number of subjects per risk level"""
+        levels = risk_level(self._scores(self.decayed(now)))
+        return pd.Series(levels, dtype=object).value_counts().reindex(LEVELS, fill_value=0)
+
+    def save(self, path=RISK_MODEL_PATH):
+        """Write the counters as float32 (atomic replace)"""
+        with self._lock:
+            n = len(self.subjects)
+            meta = {'half_life_days': self.half_life_days, 'counters': COUNTERS, 'subjects': self.subjects[:n]}
+            updated_at = self.updated_at[:n].copy()
+            counters = self.counters[:n].astype(np.float32)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, meta=json.dumps(meta), updated_at=updated_at, counters=counters)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=RISK_MODEL_PATH, half_life_days=HALF_LIFE_DAYS):
+        """Saved model, or an empty one if the file is missing or unreadable"""
+        model = cls(half_life_days=half_life_days)
+        try:
+            saved = np.load(path)
+            meta = json.loads(str(saved['meta']))
+            counters = saved['counters'].astype(np.float64)
+            updated_at = saved['updated_at']
+        except (OSError, KeyError, ValueError):
+            return model
+        if meta.get('counters') != COUNTERS:
+            return model
+        model._reset(max(len(counters), 64))
+        model.subjects = list(meta['subjects'])
+        model._rows = {subject: row for row, subject in enumerate(model.subjects)}
+        model.counters[:len(counters)] = counters
+        model.updated_at[:len(counters)] = updated_at
+        return model
+
+    def clear(self):
+        """Forget every subject"""
+        with self._lock:
+            self._reset(64)
@@ -0,0 +1,218 @@
+"""
+Activity Log Rollups
+Per-second, per-minute and per-hour counts of samples, falls, activities
+and risk levels from activity_tracking_log.csv. The store tails the log
+and folds only the new rows into every level, and a background thread
+keeps it current. Queries use the coarsest level that answers them, so
+long ranges touch thousands of buckets instead of millions of rows.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from tracking_log import TRACKING_LOG_PATH, LogTail
+
+# Level name -> bucket width in seconds, finest first
+LEVELS = {'second': 1, 'minute': 60, 'hour': 3600}
+
+# Timeline charts never need more buckets than this
+MAX_BUCKETS = 2000
+
+POLL_INTERVAL_SECONDS = 2.0
+
+
+class RollupLevel:
+    """Sorted bucket start times (epoch seconds) with a growable count matrix"""
+
+    def __init__(self, width):
+        self.width = width
+        self.columns = []
+        self._column_index = {}
+        self.buckets = np.empty(0, dtype=np.int64)
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.n = 0
+
+    def _ensure_columns(self, columns):
+        missing = [c for c in columns if c not in self._column_index]
+        if missing:
+            for c in missing:
+                self._column_index[c] = len(self.columns)
+                self.columns.append(c)
+            self.counts = np.pad(self.counts, ((0, 0), (0, len(missing))))
+        return np.array([self._column_index[c] for c in columns], dtype=np.int64)
+
+    def _reserve(self, n_rows):
+        if n_rows > len(self.buckets):
+            capacity = max(n_rows, 2 * len(self.buckets), 1024)
+            self.buckets = np.resize(self.buckets, capacity)
+            self.counts = np.pad(self.counts, ((0, capacity - len(self.counts)), (0, 0)))
+
+    def add(self, buckets, counts, columns):
+        """Fold counts (one row per sorted, unique bucket) into the level"""
+        cols = self._ensure_columns(columns)
+        current = self.buckets[:self.n]
+
+        positions = np.searchsorted(current, buckets)
+        exists = positions < self.n
+        exists[exists] = current[positions[exists]] == buckets[exists]
+        if exists.any():
+            self.counts[positions[exists][:, None], cols] += counts[exists]
+
+        fresh = ~exists
+        if not fresh.any():
+            return
+        new_buckets = buckets[fresh]
+        new_counts = np.zeros((len(new_buckets), len(self.columns)), dtype=np.int64)
+        new_counts[:, cols] = counts[fresh]
+
+        self._reserve(self.n + len(new_buckets))
+        if self.n == 0 or new_buckets[0] > current[-1]:
+            # Log is appended in time order: the common case is a plain append
+            self.buckets[self.n:self.n + len(new_buckets)] = new_buckets
+            self.counts[self.n:self.n + len(new_buckets)] = new_counts
+        else:
+            merged = np.concatenate([current, new_buckets])
+            order = np.argsort(merged, kind='stable')
+            self.buckets[:len(merged)] = merged[order]
+            self.counts[:len(merged)] = np.concatenate([self.counts[:self.n], new_counts])[order]
+        self.n += len(new_buckets)
+
+    def frame(self, start=None, end=None):
+        """Buckets with start <= bucket < end as a DataFrame indexed by timestamp"""
+        lo = 0 if start is None else np.searchsorted(self.buckets[:self.n], start)
+        hi = self.n if end is None else np.searchsorted(self.buckets[:self.n], end)
+        index = pd.to_datetime(self.buckets[lo:hi], unit='s')
+        return pd.DataFrame(self.counts[lo:hi], index=index, columns=list(self.columns))
+
+
+def _epoch_seconds(value):
+    return None if value is None else int(pd.Timestamp(value).timestamp())
+
+
+def counts_with_prefix(totals, prefix):
+    """Pick e.g. the 'activity:*' entries of a totals Series, keyed by value"""
+    selected = totals[[c for c in totals.index if c.startswith(f"{prefix}:")]]
+    selected.index = [c.split(":", 1)[1] for c in selected.index]
+    return selected[selected > 0].sort_values(ascending=False)
+
+
+class RollupStore:
+    """Rollup pyramid over the tracking log, maintained incrementally"""
+
+    def __init__(self, log_path=TRACKING_LOG_PATH, poll_interval=POLL_INTERVAL_SECONDS):
+        self.log_path = log_path
+        self.poll_interval = poll_interval
+        self.last_error = None
+        self.latest = None
+        self.version = 0
+
+        self._tail = LogTail(log_path)
+        self._levels = {name: RollupLevel(width) for name, width in LEVELS.items()}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _ingest(self, frame):
+        if frame.empty:
+            return
+        if "timestamp" in frame.columns:
+            seconds = frame["timestamp"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+        else:
+            # Without timestamps only the totals are meaningful: one bucket at the epoch
+            seconds = np.zeros(len(frame), dtype=np.int64)
+
+        indicators = [("samples", np.ones(len(frame), dtype=np.int64))]
+        if "fall_detected" in frame.columns:
+            indicators.append(("falls", frame["fall_detected"].to_numpy(dtype=np.int64)))
+        for prefix, column in (("activity", "predicted_activity"), ("risk", "risk_level")):
+            if column in frame.columns:
+                codes, values = pd.factorize(frame[column])
+                for i, value in enumerate(values):
+                    indicators.append((f"{prefix}:{value}", (codes == i).astype(np.int64)))
+        columns = [name for name, _ in indicators]
+        matrix = np.column_stack([values for _, values in indicators])
+
+        for level in self._levels.values():
+            buckets, inverse = np.unique(seconds // level.width * level.width, return_inverse=True)
+            counts = np.zeros((len(buckets), len(columns)), dtype=np.int64)
+            np.add.at(counts, inverse, matrix)
+            level.add(buckets, counts, columns)
+
+        self.latest = frame.iloc[-1].to_dict()
+
+    def refresh(self):
+        """Fold rows appended since the last refresh into every level; returns rows read"""
+        rows = 0
+        with self._lock:
+            while True:
+                frame, reset = self._tail.read_new()
+                if reset:
+                    self._levels = {name: RollupLevel(width) for name, width in LEVELS.items()}
+                    self.latest = None
+                    self.version += 1
+                if frame is None:
+                    break
+                self._ingest(frame)
+                rows += len(frame)
+            if rows:
+                self.version += 1
+        return rows
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+
+    def start(self):
+        """Keep the store current from a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="rollups", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def bounds(self):
+        """(first, last) second covered, or None while empty"""
+        level = self._levels['second']
+        if level.n == 0:
+            return None
+        return int(level.buckets[0]), int(level.buckets[level.n - 1]) + 1
+
+    def level_for(self, start=None, end=None, max_buckets=MAX_BUCKETS):
+        """Finest level that covers [start, end) in at most max_buckets buckets"""
+        bounds = self.bounds()
+        if bounds is None:
+            return 'second'
+        start = bounds[0] if start is None else _epoch_seconds(start)
+        end = bounds[1] if end is None else _epoch_seconds(end)
+        for name, width in LEVELS.items():
+            if (end - start) / width <= max_buckets:
+                return name
+        return name
+
+    def series(self, start=None, end=None, max_buckets=MAX_BUCKETS):
+        """Returns: (level, DataFrame of counts per bucket) for a timeline over [start, end)"""
+        with self._lock:
+            level = self.level_for(start, end, max_buckets)
+            return level, self._levels[level].frame(_epoch_seconds(start), _epoch_seconds(end))
+
+    def totals(self, start=None, end=None):
+        """
+        Counts over [start, end) from the coarsest level whose bucket
+        boundaries line up with the range (unbounded ends always do)
+        """
+        start_s, end_s = _epoch_seconds(start), _epoch_seconds(end)
+        with self._lock:
+            for name in reversed(list(LEVELS)):
+                width = LEVELS[name]
+                if all(t is None or t % width == 0 for t in (start_s, end_s)):
+                    break
+            frame = self._levels[name].frame(start_s, end_s)
+        return frame.sum().astype(np.int64)
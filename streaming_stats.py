@@ -0,0 +1,300 @@
+"""
+Streaming Dataset Statistics
+Single-pass, bounded-memory statistics over HAR recordings of any size:
+activity counts, per-feature moments and min/max, fixed-range
+histograms (with approximate quartiles) and a feature correlation
+matrix. Every accumulator is mergeable, so the file is split into
+newline-aligned byte ranges that can be scanned by a process pool and
+the partial results combined; memory is bounded by the block size per
+worker, not by the file size.
+
+Usage:
+    python streaming_stats.py recording.csv --workers 4 --json recording_stats.json
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from dataset import LABEL_COLUMN, NON_FEATURE_COLUMNS, read_columns, schema_dtypes
+
+# Raw bytes parsed per step; bounds the memory of each worker
+BLOCK_BYTES = 32 * 1024 ** 2
+
+# HAR features are normalized to [-1, 1]; values outside land in the
+# under/overflow bins and are still counted exactly by the moments
+HIST_BINS = 40
+HIST_RANGE = (-1.0, 1.0)
+
+
+class StreamingStats:
+    """Mergeable per-feature moments, histograms, co-moments and label counts"""
+
+    def __init__(self, features, bins=HIST_BINS, value_range=HIST_RANGE):
+        self.features = list(features)
+        self.bins = bins
+        self.value_range = tuple(value_range)
+        n = len(self.features)
+        self.rows = 0
+        self.count = np.zeros(n, dtype=np.int64)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.min = np.full(n, np.inf)
+        self.max = np.full(n, -np.inf)
+        # Columns: underflow, `bins` regular bins, overflow
+        self.hist = np.zeros((n, bins + 2), dtype=np.int64)
+        # Co-moments over rows with no missing feature
+        self.complete_rows = 0
+        self.complete_mean = np.zeros(n)
+        self.comoment = np.zeros((n, n))
+        self.activities = Counter()
+
+    def _merge_moments(self, count, mean, m2, other_count, other_mean, other_m2):
+        """Chan et al. pairwise update of (count, mean, M2)"""
+        total = count + other_count
+        delta = other_mean - mean
+        safe_total = np.where(total == 0, 1, total)
+        new_mean = mean + delta * other_count / safe_total
+        new_m2 = m2 + other_m2 + delta ** 2 * count * other_count / safe_total
+        return total, new_mean, new_m2
+
+    def update(self, frame):
+        """Fold one chunk (DataFrame with the feature columns, optionally Activity)"""
+        values = frame[self.features].to_numpy(dtype=np.float64)
+        self.rows += len(values)
+        if LABEL_COLUMN in frame.columns:
+            self.activities.update(frame[LABEL_COLUMN].value_counts().to_dict())
+        if not len(values):
+            return
+
+        finite = ~np.isnan(values)
+        count = finite.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / np.maximum(count, 1), 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        self.count, self.mean, self.m2 = self._merge_moments(self.count, self.mean, self.m2, count, mean, m2)
+        self.min = np.fmin(self.min, np.nanmin(np.where(finite, values, np.inf), axis=0))
+        self.max = np.fmax(self.max, np.nanmax(np.where(finite, values, -np.inf), axis=0))
+
+        # Histogram every feature at once with one bincount over (feature, bin) codes
+        low, high = self.value_range
+        width = (high - low) / self.bins
+        with np.errstate(invalid='ignore'):
+            bin_index = np.clip(np.floor((values - low) / width) + 1, 0, self.bins + 1)
+        bin_index = np.where(finite, bin_index, 0).astype(np.int64)
+        bin_index[values == high] = self.bins
+        codes = bin_index + np.arange(len(self.features)) * (self.bins + 2)
+        # Missing values are left out of the histogram, as they are of the moments
+        codes = codes[finite]
+        self.hist += np.bincount(codes, minlength=self.hist.size).reshape(self.hist.shape)
+
+        complete = values[finite.all(axis=1)]
+        if len(complete):
+            chunk_mean = complete.mean(axis=0)
+            centered = complete - chunk_mean
+            self._merge_comoments(len(complete), chunk_mean, centered.T @ centered)
+
+    def _merge_comoments(self, count, mean, comoment):
+        total = self.complete_rows + count
+        delta = mean - self.complete_mean
+        self.comoment += comoment + np.outer(delta, delta) * self.complete_rows * count / total
+        self.complete_mean += delta * count / total
+        self.complete_rows = total
+
+    def merge(self, other):
+        """Fold another StreamingStats over the same features and bins into this one"""
+        if other.features != self.features or other.hist.shape != self.hist.shape:
+            raise ValueError("cannot merge statistics over different features or bins")
+        self.rows += other.rows
+        self.count, self.mean, self.m2 = self._merge_moments(
+            self.count, self.mean, self.m2, other.count, other.mean, other.m2)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.hist += other.hist
+        if other.complete_rows:
+            self._merge_comoments(other.complete_rows, other.complete_mean, other.comoment)
+        self.activities.update(other.activities)
+        return self
+
+    def bin_edges(self):
+        return np.linspace(*self.value_range, self.bins + 1)
+
+    def approx_quantiles(self, qs=(0.25, 0.5, 0.75)):
+        """(n_features, len(qs)) quantiles interpolated within histogram bins"""
+        edges = self.bin_edges()
+        # Under/overflow bins span out to the observed min/max
+        lower = np.column_stack([np.minimum(self.min, edges[0]), np.tile(edges[:-1], (len(self.features), 1)),
+                                 np.full(len(self.features), edges[-1])])
+        upper = np.column_stack([np.full(len(self.features), edges[0]), np.tile(edges[1:], (len(self.features), 1)),
+                                 np.maximum(self.max, edges[-1])])
+        cumulative = np.cumsum(self.hist, axis=1)
+        result = np.full((len(self.features), len(qs)), np.nan)
+        for j, q in enumerate(qs):
+            target = q * self.count
+            idx = np.minimum((cumulative < target[:, None]).sum(axis=1), self.hist.shape[1] - 1)
+            rows = np.arange(len(self.features))
+            before = np.where(idx > 0, cumulative[rows, np.maximum(idx - 1, 0)], 0)
+            in_bin = np.maximum(self.hist[rows, idx], 1)
+            fraction = np.clip((target - before) / in_bin, 0, 1)
+            result[:, j] = lower[rows, idx] + fraction * (upper[rows, idx] - lower[rows, idx])
+        result[self.count == 0] = np.nan
+        return result
+
+    def summary(self):
+        """One row per feature, with the columns of feature_stats.SUMMARY_COLUMNS (quartiles approximate)"""
+        quartiles = self.approx_quantiles()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        has_data = self.count > 0
+        return pd.DataFrame({
+            'count': self.count,
+            'mean': np.where(has_data, self.mean, np.nan),
+            'std': np.where(self.count > 1, std, np.nan),
+            'min': np.where(has_data, self.min, np.nan),
+            '25%': quartiles[:, 0],
+            '50%': quartiles[:, 1],
+            '75%': quartiles[:, 2],
+            'max': np.where(has_data, self.max, np.nan)
+        }, index=pd.Index(self.features, name='feature'))
+
+    def histogram(self, feature):
+        """(labels, counts) of one feature, including the under/overflow bins"""
+        edges = self.bin_edges()
+        labels = [f"< {edges[0]:g}"] + [f"{a:.2f}" for a in edges[:-1]] + [f"≥ {edges[-1]:g}"]
+        return labels, self.hist[self.features.index(feature)]
+
+    def correlation(self, features=None):
+        """Pearson correlation over complete rows, optionally restricted to some features"""
+        index = [self.features.index(f) for f in features] if features is not None else slice(None)
+        names = list(features) if features is not None else self.features
+        comoment = self.comoment[np.ix_(index, index)] if features is not None else self.comoment
+        scale = np.sqrt(np.diag(comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = comoment / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=names, columns=names)
+
+    def activity_counts(self):
+        return pd.Series(self.activities, dtype=np.int64).sort_values(ascending=False)
+
+
+def byte_ranges(path, parts):
+    """
+    Split a CSV's data section into `parts` byte ranges; a range owns the
+    lines that start inside it
+
+    Returns: (header line length, list of (start, end))
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        data_start = len(f.readline())
+    parts = max(1, min(parts, (size - data_start) // BLOCK_BYTES + 1))
+    bounds = np.linspace(data_start, size, parts + 1).astype(np.int64)
+    return data_start, [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def iter_blocks(path, start, end, data_start, block_bytes=BLOCK_BYTES):
+    """Yield raw blocks of whole lines starting in [start, end)"""
+    with open(path, 'rb') as f:
+        if start > data_start:
+            # Skip the line that started in the previous range (if start is mid-line)
+            f.seek(start - 1)
+            f.readline()
+        else:
+            f.seek(data_start)
+        position = f.tell()
+        while position < end:
+            block = f.read(block_bytes)
+            if not block:
+                break
+            if not block.endswith(b"\n"):
+                block += f.readline()
+            if position + len(block) > end:
+                # Keep lines starting before `end`: cut after the first newline at or past end - 1
+                cut = block.find(b"\n", end - position - 1)
+                block = block[:cut + 1] if cut >= 0 else block
+                yield block
+                break
+            position += len(block)
+            yield block
+
+
+def scan_range(path, start, end, data_start, columns, features, bins, value_range, block_bytes=BLOCK_BYTES):
+    """Accumulate StreamingStats over one byte range (runs in a worker process)"""
+    stats = StreamingStats(features, bins, value_range)
+    dtypes = schema_dtypes(columns)
+    usecols = [c for c in columns if c in features or c == LABEL_COLUMN]
+    for block in iter_blocks(path, start, end, data_start, block_bytes):
+        frame = pd.read_csv(BytesIO(block), header=None, names=columns, usecols=usecols, dtype=dtypes)
+        stats.update(frame)
+    return stats
+
+
+def scan_csv(path, workers=None, features=None, bins=HIST_BINS, value_range=HIST_RANGE,
+             block_bytes=BLOCK_BYTES):
+    """
+    Single pass over a HAR CSV with bounded memory; workers > 1 scans
+    byte ranges in a process pool and merges the partial results
+
+    Returns: StreamingStats
+    """
+    columns = read_columns(path)
+    if features is None:
+        features = [c for c in columns if c not in NON_FEATURE_COLUMNS]
+    data_start, ranges = byte_ranges(path, workers or 1)
+    args = (data_start, columns, features, bins, value_range, block_bytes)
+
+    if not workers or workers <= 1 or len(ranges) == 1:
+        parts = [scan_range(path, start, end, *args) for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(scan_range, path, start, end, *args) for start, end in ranges]
+            parts = [future.result() for future in futures]
+
+    total = parts[0]
+    for part in parts[1:]:
+        total.merge(part)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-pass statistics of a large HAR recording")
+    parser.add_argument("path")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: scan in-process)")
+    parser.add_argument("--json", default=None, help="Write the summary, activity counts and histograms here")
+    args = parser.parse_args()
+
+    size_mb = os.path.getsize(args.path) / 1024 ** 2
+    print(f"📂 Scanning {args.path} ({size_mb:,.0f} MB) with {args.workers or 1} worker(s)...")
+    start = time.perf_counter()
+    stats = scan_csv(args.path, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {stats.rows:,} rows × {len(stats.features)} features in {elapsed:.1f}s "
+          f"({size_mb / elapsed:,.0f} MB/s)")
+
+    print("\n🎯 Activities:")
+    for activity, count in stats.activity_counts().items():
+        print(f"   {activity:<20} {count:>10,}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'path': args.path,
+                'rows': stats.rows,
+                'seconds': elapsed,
+                'activities': {k: int(v) for k, v in stats.activities.items()},
+                'summary': stats.summary().reset_index().to_dict(orient='records'),
+                'histogram_edges': stats.bin_edges().tolist(),
+                'histograms': {f: stats.hist[i].tolist() for i, f in enumerate(stats.features)}
+            }, f, indent=2)
+        print(f"\n💾 Written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
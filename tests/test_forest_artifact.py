@@ -0,0 +1,18 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from forest_artifact import load_forest, save_forest
+
+
+def test_loaded_forest_matches_sklearn(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 8)).astype(np.float32)
+    y = np.select([X[:, 0] > 0.5, X[:, 1] > 0], ['WALKING', 'SITTING'], 'LAYING')
+    model = RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0).fit(X, y)
+
+    artifact = load_forest(save_forest(model, tmp_path / "activity_model.forest"))
+    X_test = rng.normal(size=(500, 8)).astype(np.float32)
+    np.testing.assert_allclose(artifact.predict_proba(X_test), model.predict_proba(X_test), atol=1e-6)
+    assert (artifact.predict(X_test) == model.predict(X_test)).all()
+    # Leaves are numbered across the concatenated trees
+    assert (artifact.apply(X_test) - artifact.roots == model.apply(X_test)).all()
@@ -0,0 +1,93 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from health_store import SCHEMA, HealthStore, read_segment_info
+
+
+def _entries(n, start=0):
+    # A day old: inside the default retention, outside retention_days=0
+    base = pd.Timestamp.now().floor('s') - pd.Timedelta(days=1)
+    return [{'timestamp': base + pd.Timedelta(seconds=i), 'activity': 'WALKING', 'risk': float(i),
+             'motion': 0.5, 'fall': i % 97 == 0, 'alert': False, 'anomaly': False}
+            for i in range(start, start + n)]
+
+
+def _store(root, **kwargs):
+    kwargs.setdefault('flush_rows', 100)
+    kwargs.setdefault('segment_rows', 5000)
+    return HealthStore(root, **kwargs)
+
+
+def test_round_trip_includes_buffered_rows(tmp_path):
+    store = _store(tmp_path)
+    for entry in _entries(250):
+        store.append(entry)
+
+    # 200 rows are in the active segment, 50 are still buffered
+    recent = store.read_recent(1000)
+    assert len(recent) == 250
+    assert recent['risk'].tolist() == [float(i) for i in range(250)]
+    assert recent['fall'].sum() == 3
+
+
+def test_full_segments_are_sealed_with_metadata(tmp_path):
+    store = _store(tmp_path)
+    for entry in _entries(23_050):
+        store.append(entry)
+    store.flush(seal=True)
+
+    sealed = sorted(tmp_path.glob("*.arrow"))
+    assert not list(tmp_path.glob("*.active"))
+    assert sum(read_segment_info(p)[0] for p in sealed) == 23_050
+    assert all(read_segment_info(p)[0] <= 5000 for p in sealed)
+
+    # The tail spans several segments
+    recent = store.read_recent(7000)
+    assert recent['risk'].tolist() == [float(i) for i in range(16_050, 23_050)]
+
+
+def test_reopen_seals_the_active_segment(tmp_path):
+    store = _store(tmp_path)
+    for entry in _entries(300):
+        store.append(entry)
+    store.flush()
+    assert list(tmp_path.glob("*.active"))
+
+    reopened = _store(tmp_path)
+    assert not list(tmp_path.glob("*.active"))
+    assert reopened.read_recent(1000)['risk'].tolist() == [float(i) for i in range(300)]
+
+
+def test_compaction_merges_small_segments(tmp_path):
+    store = _store(tmp_path)
+    for part in range(4):
+        for entry in _entries(100, start=part * 100):
+            store.append(entry)
+        store.flush(seal=True)
+
+    assert store.segment_count() == 1
+    assert len(store.read_recent(1000)) == 400
+
+
+def test_segment_without_metadata_is_read(tmp_path):
+    table = pa.Table.from_pandas(pd.DataFrame(_entries(50)), schema=SCHEMA, preserve_index=False)
+    with ipc.new_stream(str(tmp_path / "00000000-00000000.arrow"), SCHEMA) as writer:
+        writer.write_table(table)
+
+    store = _store(tmp_path)
+    for entry in _entries(20, start=50):
+        store.append(entry)
+    store.flush(seal=True)
+    assert store.read_recent(1000)['risk'].tolist() == [float(i) for i in range(70)]
+
+
+def test_retention_drops_old_segments(tmp_path):
+    store = _store(tmp_path)
+    for entry in _entries(200):
+        store.append(entry)
+    store.flush(seal=True)
+
+    expired = _store(tmp_path, retention_days=0)
+    assert expired.segment_count() == 0
+    assert expired.read_recent(1000).empty
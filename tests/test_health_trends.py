@@ -0,0 +1,32 @@
+import pandas as pd
+
+from health_trends import HealthAggregates, HealthHistory, health_summary
+
+
+def _entry(i, **flags):
+    return {'timestamp': pd.Timestamp("2026-01-01") + pd.Timedelta(seconds=i), 'activity': 'WALKING',
+            'risk': float(i % 100), 'motion': 0.5, 'fall': False, 'alert': False, 'anomaly': False, **flags}
+
+
+def test_history_answers_counts_and_range_without_building_the_frame():
+    restored = pd.DataFrame([_entry(i) for i in range(3)])
+    history = HealthHistory(restored)
+    history.append(_entry(3))
+    history.append(_entry(4))
+
+    assert len(history) == 5
+    assert history.has_column('risk') and not history.has_column('missing')
+    assert history.timestamp_range() == (restored['timestamp'].iloc[0], _entry(4)['timestamp'])
+    # Still pending: nothing was folded into the frame
+    assert len(history._pending) == 2
+    assert len(history.frame()) == 5 and not history._pending
+
+
+def test_aggregates_match_a_full_scan():
+    entries = [_entry(i, fall=(i == 7), alert=(i % 10 == 0), anomaly=(i % 3 == 0)) for i in range(120)]
+    aggregates = HealthAggregates.from_history(pd.DataFrame(entries[:60]))
+    for entry in entries[60:]:
+        aggregates.update(entry)
+
+    assert aggregates.summary() == health_summary(pd.DataFrame(entries))
+    assert aggregates.recent_stats()['samples'] == 50
@@ -0,0 +1,44 @@
+import numpy as np
+
+from inactivity_monitor import InactivityMonitor, TimerWheel
+
+
+def test_timers_fire_at_their_deadline():
+    wheel = TimerWheel(tick=1.0, slots=8, levels=2)
+    rng = np.random.default_rng(0)
+    # Past the 64-tick span of the wheel too
+    deadlines = {f"s{i}": float(d) for i, d in enumerate(rng.integers(1, 300, 200))}
+    for key, when in deadlines.items():
+        wheel.schedule(key, when)
+
+    fired = {}
+    for now in range(1, 301):
+        for key in wheel.advance(now):
+            fired[key] = now
+    assert fired == deadlines
+    assert len(wheel) == 0
+
+
+def test_cancel_and_reschedule():
+    wheel = TimerWheel(tick=1.0, slots=8, levels=2)
+    wheel.schedule('a', 10)
+    wheel.schedule('b', 10)
+    wheel.schedule('b', 100)
+    assert wheel.cancel('a')
+    assert not wheel.cancel('a')
+
+    assert wheel.advance(99) == []
+    assert wheel.advance(100) == ['b']
+
+
+def test_inactivity_fires_once_per_stretch():
+    monitor = InactivityMonitor(threshold=30)
+    monitor.observe(1, 'SITTING', 0.1, now=0)
+    monitor.observe(1, 'LAYING', 0.1, now=10)
+    monitor.observe(2, 'SITTING', 0.1, now=5)
+    monitor.observe(2, 'WALKING', 0.9, now=20)
+
+    assert monitor.poll(29) == []
+    assert monitor.poll(31) == [(1, 'SITTING', 31)]
+    assert monitor.poll(100) == []
+    assert monitor.monitored == 1
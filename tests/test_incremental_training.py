@@ -0,0 +1,65 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from incremental_training import TrainingCache, incremental_update
+
+FEATURES = ['f0', 'f1', 'f2']
+
+
+def _write_recording(path, activities, seed):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.normal(size=(len(activities), len(FEATURES))), columns=FEATURES)
+    frame['subject'] = 1
+    frame['Activity'] = activities
+    frame.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def trained(tmp_path):
+    base = _write_recording(tmp_path / "train.csv", ['WALKING', 'SITTING'] * 50, seed=0)
+    frame = pd.read_csv(base)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(frame[FEATURES], frame['Activity'])
+    model_path = tmp_path / "activity_model.pkl"
+    joblib.dump(model, model_path)
+    return tmp_path, base, model_path
+
+
+def test_update_ingests_and_grows(trained):
+    tmp_path, base, model_path = trained
+    new = _write_recording(tmp_path / "new.csv", ['WALKING', 'SITTING'] * 20, seed=1)
+
+    summary = incremental_update(model_path, [new], base_path=base, cache_dir=tmp_path / "cache",
+                                 n_new_trees=3)
+    assert summary['new_rows'] == 40
+    assert summary['trees'] == 8
+    cache = TrainingCache(tmp_path / "cache")
+    assert [chunk['rows'] for chunk in cache.state['chunks']] == [100, 40]
+    assert len(cache.replay()[0]) == 140
+    assert not list((tmp_path / "cache").glob("*.staged.npz"))
+
+    # The same file is skipped on a re-run
+    assert incremental_update(model_path, [new], cache_dir=tmp_path / "cache")['skipped'] == [str(new)]
+
+
+def test_failed_fit_leaves_the_cache_unchanged(trained):
+    tmp_path, base, model_path = trained
+    cache_dir = tmp_path / "cache"
+    incremental_update(model_path, [], base_path=base, cache_dir=cache_dir)
+    state_before = (cache_dir / "state.json").read_text()
+    files_before = sorted(p.name for p in cache_dir.iterdir())
+
+    # A class the model has never seen needs a full retrain
+    bad = _write_recording(tmp_path / "bad.csv", ['RUNNING'] * 10, seed=2)
+    with pytest.raises(ValueError):
+        incremental_update(model_path, [bad], cache_dir=cache_dir)
+
+    assert (cache_dir / "state.json").read_text() == state_before
+    assert sorted(p.name for p in cache_dir.iterdir()) == files_before
+    assert len(TrainingCache(cache_dir).replay()[0]) == 100
+    assert json.loads(state_before)['ingested'] == TrainingCache(cache_dir).state['ingested']
@@ -0,0 +1,66 @@
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from inference_server import InferenceClient, MicroBatcher, ModelChangedError, feature_digest, serve
+
+
+class StubHandle:
+    """Stands in for HotSwapModel: get() returns the current model"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def get(self):
+        return "stub", self.model, None
+
+
+def _fit_model(features):
+    X = pd.DataFrame(np.random.default_rng(0).normal(size=(40, len(features))), columns=features)
+    y = np.where(X[features[0]] > 0, "WALKING", "SITTING")
+    return RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y)
+
+
+def test_swap_to_other_features_of_the_same_width_is_rejected():
+    old_features, new_features = ['a', 'b', 'c'], ['c', 'b', 'd']
+    handle = StubHandle(_fit_model(new_features))
+    batcher = MicroBatcher(handle, max_latency_ms=1)
+    X = np.zeros((2, 3), dtype=np.float32)
+
+    with pytest.raises(ModelChangedError):
+        batcher.submit(X, feature_digest(old_features)).result(timeout=5)
+    assert len(batcher.submit(X, feature_digest(new_features)).result(timeout=5)) == 2
+    # Without a digest only the width is checked
+    assert len(batcher.submit(X).result(timeout=5)) == 2
+
+
+def test_stale_width_rejects_only_that_request():
+    handle = StubHandle(_fit_model(['a', 'b', 'c']))
+    batcher = MicroBatcher(handle, max_latency_ms=50)
+
+    stale = batcher.submit(np.zeros((1, 2), dtype=np.float32))
+    current = batcher.submit(np.zeros((3, 3), dtype=np.float32))
+    with pytest.raises(ModelChangedError):
+        stale.result(timeout=5)
+    assert len(current.result(timeout=5)) == 3
+
+
+def test_unknown_endpoint_leaves_the_connection_usable(tmp_path):
+    model_path = tmp_path / "activity_model.pkl"
+    joblib.dump(_fit_model(['a', 'b', 'c']), model_path)
+    server, _ = serve(port=0, registry_dir=tmp_path / "registry", models={'activity': str(model_path)})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = InferenceClient(f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        with pytest.raises(RuntimeError):
+            client._request("POST", "/predict/unknown", body=b"x" * 64)
+        # The next request on the same keep-alive connection is parsed cleanly
+        X = pd.DataFrame(np.zeros((2, 3)), columns=['a', 'b', 'c'])
+        assert len(client.predict('activity', X)) == 2
+    finally:
+        client.close()
+        server.shutdown()
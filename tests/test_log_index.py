@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from log_index import LogIndex
+
+
+def _write_log(path, start, rows, mode='w'):
+    timestamps = pd.date_range(start, periods=rows, freq='250ms')
+    frame = pd.DataFrame({
+        'timestamp': timestamps.strftime('%Y-%m-%dT%H:%M:%S.%f'),
+        'predicted_activity': np.where(np.arange(rows) % 3 == 0, 'WALKING', 'SITTING'),
+        'risk_level': 'Low',
+        'fall_detected': np.arange(rows) % 50 == 0,
+    })
+    frame.to_csv(path, mode=mode, header=mode == 'w', index=False)
+    return timestamps
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "activity_tracking_log.csv"
+    _write_log(path, "2024-01-01", 5000)
+    return path
+
+
+@pytest.mark.parametrize("start, end", [
+    (None, None),
+    ("2024-01-01 00:05:00", "2024-01-01 00:06:00"),
+    ("2023-12-31", "2024-01-01 00:00:10.125"),
+    ("2024-01-01 00:20:00", None),
+    ("2025-01-01", None),
+])
+def test_range_matches_a_full_scan(log, start, end):
+    index = LogIndex(str(log), block_rows=64)
+    index.refresh()
+
+    full = pd.read_csv(log, parse_dates=['timestamp'])
+    mask = np.ones(len(full), dtype=bool)
+    if start is not None:
+        mask &= full['timestamp'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= full['timestamp'] < pd.Timestamp(end)
+
+    frame = index.read_range(start, end)
+    assert frame['timestamp'].tolist() == full.loc[mask, 'timestamp'].tolist()
+    assert frame['fall_detected'].sum() == full.loc[mask, 'fall_detected'].sum()
+
+
+def test_refresh_indexes_only_appended_rows(log):
+    index = LogIndex(str(log), block_rows=64)
+    assert index.refresh() == 5000
+    assert index.refresh() == 0
+
+    appended = _write_log(log, "2024-01-01 01:00:00", 300, mode='a')
+    assert index.refresh() == 300
+    assert index.bounds() == (pd.Timestamp("2024-01-01"), appended[-1])
+    assert len(index.read_last('10s')) == 41
+
+    # A new process loads the saved index instead of rescanning
+    reloaded = LogIndex(str(log), block_rows=64)
+    assert reloaded.rows == 5300
+    assert reloaded.refresh() == 0
+
+
+def test_rewritten_log_is_reindexed(log):
+    index = LogIndex(str(log), block_rows=64)
+    index.refresh()
+    _write_log(log, "2024-02-01", 100)
+
+    assert index.refresh() == 100
+    assert len(index.read_range()) == 100
@@ -0,0 +1,36 @@
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from model_registry import HotSwapModel, ModelRegistry
+
+
+def _fit_model():
+    X = np.random.default_rng(0).normal(size=(40, 3))
+    y = np.where(X[:, 0] > 0, "WALKING", "SITTING")
+    return RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y)
+
+
+def test_hotswap_falls_back_to_model_file_without_registry(tmp_path):
+    model_path = tmp_path / "activity_model.pkl"
+    joblib.dump(_fit_model(), model_path)
+
+    # Callers pass plain strings, as the dashboard and inference server do
+    handle = HotSwapModel(ModelRegistry(tmp_path / "registry"), "activity", str(model_path),
+                          {'features': ['a', 'b', 'c']}, poll_interval=60)
+    try:
+        label, model, metadata = handle.get()
+        assert label == str(model_path)
+        assert model.predict(np.zeros((1, 3)))[0] in ("WALKING", "SITTING")
+        assert metadata == {'features': ['a', 'b', 'c']}
+    finally:
+        handle.stop()
+
+
+def test_hotswap_without_registry_or_fallback_file(tmp_path):
+    handle = HotSwapModel(ModelRegistry(tmp_path / "registry"), "activity", str(tmp_path / "missing.pkl"),
+                          poll_interval=60)
+    try:
+        assert handle.get() == (None, None, None)
+    finally:
+        handle.stop()
@@ -0,0 +1,39 @@
+import pytest
+
+from risk_model import RiskModel
+
+
+@pytest.mark.parametrize("capacity", [2, 64])
+def test_new_subject_after_growth_starts_with_its_own_time(capacity):
+    model = RiskModel(capacity=capacity)
+    model.record('a', 1e6, falls=1)
+    model.record('b', 1e6, falls=1)
+    model.record('c', 5e5, falls=1)
+
+    # c's fall is 5e5 s old at 1e6, so it has decayed well below the Medium level
+    score, level = model.score('c', 1e6)
+    assert score == pytest.approx(16.91, abs=0.01)
+    assert level == 'Low'
+    assert model.score('a', 1e6) == (30.0, 'Medium')
+
+
+def test_growth_keeps_existing_counters():
+    model = RiskModel(capacity=1)
+    for i in range(5):
+        model.record(f"s{i}", 1000.0, falls=i)
+
+    assert len(model) == 5
+    assert len(model.updated_at) >= 5
+    assert [model.score(f"s{i}", 1000.0)[0] for i in range(5)] == [0.0, 30.0, 60.0, 90.0, 100.0]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "risk_model.npz"
+    model = RiskModel(capacity=2)
+    for subject in ('a', 'b', 'c'):
+        model.record(subject, 1000.0, near_falls=2)
+    model.save(path)
+
+    loaded = RiskModel.load(path)
+    assert loaded.subjects == ['a', 'b', 'c']
+    assert loaded.score('c', 1000.0) == model.score('c', 1000.0)
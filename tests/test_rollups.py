@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollups import RollupStore
+
+
+def _write_log(path, start, rows, seed, mode='w'):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.Timestamp(start) + pd.to_timedelta(np.sort(rng.uniform(0, rows, rows)), unit='s')
+    frame = pd.DataFrame({
+        'timestamp': timestamps.strftime('%Y-%m-%dT%H:%M:%S.%f'),
+        'predicted_activity': rng.choice(['WALKING', 'SITTING', 'LAYING'], rows),
+        'risk_level': rng.choice(['Low', 'Medium', 'High'], rows),
+        'fall_detected': rng.random(rows) < 0.05,
+    })
+    frame.to_csv(path, mode=mode, header=mode == 'w', index=False)
+
+
+def _expected(path, start, end):
+    frame = pd.read_csv(path, parse_dates=['timestamp'])
+    frame = frame[(frame['timestamp'] >= pd.Timestamp(start)) & (frame['timestamp'] < pd.Timestamp(end))]
+    counts = {'samples': len(frame), 'falls': int(frame['fall_detected'].sum())}
+    counts.update({f"activity:{k}": v for k, v in frame['predicted_activity'].value_counts().items()})
+    counts.update({f"risk:{k}": v for k, v in frame['risk_level'].value_counts().items()})
+    return counts
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2024-01-01 00:00:00", "2024-01-01 03:00:00"),   # hour-aligned
+    ("2024-01-01 00:10:00", "2024-01-01 01:30:00"),   # minute-aligned
+    ("2024-01-01 00:10:07", "2024-01-01 00:10:53"),   # second-aligned
+])
+def test_totals_match_raw_counts(tmp_path, start, end):
+    path = tmp_path / "activity_tracking_log.csv"
+    _write_log(path, "2024-01-01", 10_000, seed=0)
+    store = RollupStore(str(path))
+    assert store.refresh() == 10_000
+
+    totals = store.totals(start, end)
+    for name, count in _expected(path, start, end).items():
+        assert totals[name] == count, name
+
+
+def test_refresh_folds_in_appended_rows(tmp_path):
+    path = tmp_path / "activity_tracking_log.csv"
+    _write_log(path, "2024-01-01", 3000, seed=1)
+    store = RollupStore(str(path))
+    store.refresh()
+
+    _write_log(path, "2024-01-01 02:00:00", 2000, seed=2, mode='a')
+    assert store.refresh() == 2000
+    assert store.refresh() == 0
+
+    expected = _expected(path, "2024-01-01", "2024-01-02")
+    assert store.totals()['samples'] == 5000
+    assert store.totals()['falls'] == expected['falls']
+
+
+def test_series_uses_a_level_within_the_bucket_budget(tmp_path):
+    path = tmp_path / "activity_tracking_log.csv"
+    _write_log(path, "2024-01-01", 10_000, seed=3)
+    store = RollupStore(str(path))
+    store.refresh()
+
+    level, frame = store.series(max_buckets=500)
+    assert level == 'minute'
+    assert len(frame) <= 500
+    assert frame['samples'].sum() == 10_000
+
+    level, frame = store.series("2024-01-01 00:10:00", "2024-01-01 00:15:00", max_buckets=500)
+    assert level == 'second'
+    assert frame['samples'].sum() == _expected(path, "2024-01-01 00:10:00", "2024-01-01 00:15:00")['samples']
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from streaming_stats import StreamingStats
+
+
+def test_values_outside_the_range_land_in_under_and_overflow_bins():
+    stats = StreamingStats(['f'])
+    stats.update(pd.DataFrame({'f': [-1.2, -1.01, 0, 1, 1.5, 3, np.nan]}))
+
+    hist = stats.hist[0]
+    assert stats.count[0] == 6
+    assert hist.sum() == 6
+    assert hist[0] == 2       # -1.2 and -1.01
+    assert hist[-1] == 2      # 1.5 and 3
+    assert hist[stats.bins] == 1  # the top edge belongs to the last regular bin
+
+
+def test_quantiles_account_for_values_below_the_range():
+    stats = StreamingStats(['f'])
+    stats.update(pd.DataFrame({'f': [-5.0] * 60 + [0.5] * 40}))
+
+    # The median lies among the underflow values, between the minimum and the range
+    median = stats.approx_quantiles((0.5,))[0, 0]
+    assert -5.0 <= median <= -1.0
+
+
+def _sample(seed, rows=5000):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'a': rng.normal(0, 0.3, rows), 'b': rng.uniform(-1, 1, rows)})
+
+
+def test_merge_equals_a_single_pass():
+    frame = _sample(0)
+    whole = StreamingStats(['a', 'b'])
+    whole.update(frame)
+    first, second = StreamingStats(['a', 'b']), StreamingStats(['a', 'b'])
+    first.update(frame.iloc[:1234])
+    second.update(frame.iloc[1234:])
+    first.merge(second)
+
+    assert (first.hist == whole.hist).all()
+    assert (first.count == whole.count).all()
+    np.testing.assert_allclose(first.summary().to_numpy(dtype=float), whole.summary().to_numpy(dtype=float))
+    np.testing.assert_allclose(first.correlation(), whole.correlation(), atol=1e-12)
+
+
+def test_quantiles_are_within_a_bin_of_the_exact_ones():
+    frame = _sample(1)
+    stats = StreamingStats(['a', 'b'])
+    stats.update(frame)
+
+    qs = (0.1, 0.25, 0.5, 0.75, 0.9)
+    approx = stats.approx_quantiles(qs)
+    exact = np.quantile(frame.to_numpy(), qs, axis=0).T
+    width = 2.0 / stats.bins
+    assert np.abs(approx - exact).max() <= width
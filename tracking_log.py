@@ -0,0 +1,88 @@
+"""
+Activity Tracking Log Reader
+Incremental access to activity_tracking_log.csv: a tail reader that
+remembers its byte offset and returns only rows appended since the last
+read, so consumers never re-parse the whole log as it grows.
+"""
+
+import io
+import os
+
+import pandas as pd
+
+TRACKING_LOG_PATH = "activity_tracking_log.csv"
+
+# Upper bound on bytes parsed per read, keeps the first pass over a large log bounded
+CHUNK_BYTES = 32 * 1024 * 1024
+
+TRUE_VALUES = {'true', '1', 'yes'}
+
+
+def normalize_log(frame):
+    """Parse timestamps and coerce fall_detected to bool (it may arrive as text)"""
+    if "timestamp" in frame.columns:
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], format="ISO8601")
+    if "fall_detected" in frame.columns and frame["fall_detected"].dtype != bool:
+        frame["fall_detected"] = frame["fall_detected"].astype(str).str.strip().str.lower().isin(TRUE_VALUES)
+    return frame
+
+
+class LogTail:
+    """
+    Reads complete lines appended to a CSV since the previous call
+
+    A partially written last line is left for the next read. If the file
+    is replaced or truncated the reader starts over and reports a reset.
+    """
+
+    def __init__(self, path=TRACKING_LOG_PATH, chunk_bytes=CHUNK_BYTES):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.offset = 0
+        self.header = None
+        self.identity = None
+
+    def _start_over(self):
+        self.offset = 0
+        self.header = None
+        self.identity = None
+
+    def read_new(self):
+        """
+        Returns: (frame, reset) - frame holds the new rows (or None),
+        reset is True when previously read rows are no longer valid
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            reset = self.identity is not None
+            self._start_over()
+            return None, reset
+
+        identity = (stat.st_dev, stat.st_ino)
+        reset = False
+        if self.identity is not None and (identity != self.identity or stat.st_size < self.offset):
+            self._start_over()
+            reset = True
+        if stat.st_size == self.offset:
+            return None, reset
+
+        with open(self.path, 'rb') as f:
+            if self.header is None:
+                self.header = f.readline()
+                if not self.header.endswith(b"\n"):
+                    # Header still being written
+                    self._start_over()
+                    return None, reset
+                self.offset = f.tell()
+                self.identity = identity
+            f.seek(self.offset)
+            data = f.read(self.chunk_bytes)
+
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return None, reset
+        self.offset += end
+
+        frame = pd.read_csv(io.BytesIO(self.header + data[:end]))
+        return normalize_log(frame), reset